@@ -3,9 +3,29 @@
 from importlib.metadata import PackageNotFoundError, version
 
 from pynautobot.core.api import Api as api
-from pynautobot.core.query import AllocationError, ContentError, RequestError
+from pynautobot.core.lazyload import LazyLoadError
+from pynautobot.core.query import AllocationError, ContentError, DeadlineExceeded, MultipleResultsError, RequestError
 
-__all__ = ["RequestError", "AllocationError", "ContentError", "api", "__version__"]
+__all__ = [
+    "RequestError",
+    "AllocationError",
+    "ContentError",
+    "DeadlineExceeded",
+    "MultipleResultsError",
+    "LazyLoadError",
+    "CassetteError",  # pylint: disable=undefined-all-variable
+    "api",
+    "__version__",
+]
+
+
+def __getattr__(name):
+    """Imports `CassetteError` on first access, so that `import pynautobot` doesn't load the cassette module."""
+    if name == "CassetteError":
+        from pynautobot.core.cassette import CassetteError  # pylint: disable=import-outside-toplevel
+
+        return CassetteError
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 try:
@@ -16,13 +16,70 @@
 #
 # This file has been modified by NetworktoCode, LLC.
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3 import Retry
+import contextlib
+import os
 
 from pynautobot.core.app import App, PluginsApp
-from pynautobot.core.graphql import GraphQLQuery
-from pynautobot.core.query import Request
+from pynautobot.core.concurrency import AdaptiveLimiter
+from pynautobot.core.hedging import HedgingPolicy
+from pynautobot.core.hooks import Hooks
+from pynautobot.core.lazyload import LazyLoadPolicy
+from pynautobot.core.metadata import MetadataCache, cached
+from pynautobot.core.query import PAGINATION_MODES, Request
+from pynautobot.core.ratelimit import TokenBucket
+from pynautobot.core.retry import CircuitBreaker, RetryPolicy
+from pynautobot.core.routing import ReplicaRouter
+from pynautobot.core.session import Session
+
+
+def _policy(value, default):
+    """Returns ``default()`` if ``value`` is True, ``value`` if it is a policy, and None if it is falsy."""
+    if value is True:
+        return default()
+    return value or None
+
+
+# pylint: disable=too-few-public-methods
+class _Lazy:
+    """Creates an attribute of `Api` objects on first access, and keeps it on the object."""
+
+    def __init__(self, factory):
+        """Initialize the _Lazy object."""
+        self.factory = factory
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        """Remember the attribute name the descriptor is assigned to."""
+        self.name = name
+
+    def __get__(self, api, owner=None):
+        """Create the attribute of ``api``, unless another thread already did."""
+        if api is None:
+            return self
+        return api.__dict__.setdefault(self.name, self.factory(api))
+
+
+def _graphql(api):
+    """Returns the `GraphQLQuery` of ``api``."""
+    from pynautobot.core.graphql import GraphQLQuery  # pylint: disable=import-outside-toplevel
+
+    return GraphQLQuery(api)
+
+
+def _resolver(api):
+    """Returns the `Resolver` of ``api``."""
+    from pynautobot.core.resolver import Resolver  # pylint: disable=import-outside-toplevel
+
+    return Resolver(api)
+
+
+def _projection(value):
+    """Returns the `ProjectionStore` for the ``projection`` option of `Api`, or None if it is falsy."""
+    if not value:
+        return None
+    from pynautobot.core.projection import ProjectionStore  # pylint: disable=import-outside-toplevel
+
+    return ProjectionStore(value) if isinstance(value, (str, os.PathLike)) else _policy(value, ProjectionStore)
 
 
 # pylint: disable=too-many-instance-attributes, too-many-instance-attributes, too-many-arguments, too-many-positional-arguments
@@ -38,8 +95,11 @@ class Api:
             for `.all()` and `.filter()` requests. Defaults to the number of CPU cores.
         api_version (str, optional): Override the default Nautobot REST API version
             used for all requests.
-        retries (int, optional): The number of retries for HTTP status codes
-            429, 500, 502, 503, and 504. Defaults to 0 (no retries).
+        retries (Union[int, RetryPolicy], optional): The number of retries for connection
+            errors, timeouts and HTTP status codes 429, 500, 502, 503, and 504, with
+            jittered exponential backoff. Only idempotent requests are retried; pass a
+            `RetryPolicy` with `retry_non_idempotent=True` to retry POST and PATCH too.
+            Defaults to 0 (no retries).
         verify (bool, optional): Whether to verify SSL certificates. Defaults to `True`.
         exclude_m2m (bool, optional): (Nautobot 2.4+) Whether to exclude/include
             many-to-many relationships for get/filter/all requests. Defaults to `None`.
@@ -47,6 +107,61 @@ class Api:
             by default for get/filter/all requests. Defaults to `None`.
             For example, `include_default="config_context,computed_fields"` will include
             the `config_context` and `computed_fields` for all get/filter/all responses.
+        adaptive_concurrency (Union[bool, AdaptiveLimiter], optional): Limit the number
+            of in-flight requests with an adaptive (AIMD) limiter shared by all threads.
+            Pass `True` for a limiter that starts at `max_workers` and grows up to four
+            times that, or an `AdaptiveLimiter` to tune it. Pagination then uses up to
+            `max_limit` threads, so the limiter decides the concurrency. Defaults to `False`.
+        rate_limit (Union[float, TokenBucket], optional): Cap the average number of
+            requests per second sent by all threads. Pass a number for an in-process
+            token bucket, or a `SQLiteTokenBucket` to share the budget with other
+            processes. Defaults to `None` (no limit).
+        timeout (Union[float, tuple], optional): Default timeout in seconds for every
+            HTTP request, as a number or a `(connect, read)` tuple. Defaults to `None`
+            (wait forever).
+        hedging (Union[bool, HedgingPolicy], optional): Send a second copy of GET
+            requests that are slower than the observed p95 latency and use whichever
+            response arrives first. Pass `True` for the default policy, or a
+            `HedgingPolicy` to tune it. Defaults to `False`.
+        read_urls (list, optional): Base URLs of read-only Nautobot replicas. Reads,
+            including GraphQL queries, are spread over the replicas in turn, failing
+            over to the next replica and then to `url`. Writes always go to `url`.
+            Defaults to `None`.
+        read_your_writes (float, optional): Seconds to send reads to `url` after a
+            write, so that replication lag can't hide the write. Defaults to 0.
+        circuit_breaker (Union[bool, CircuitBreaker], optional): Fail requests at once
+            while Nautobot is down instead of waiting for each one to time out. Pass
+            `True` for a breaker that opens after 5 consecutive failures, or a
+            `CircuitBreaker` to tune it. Defaults to `False`.
+        pagination (str, optional): How `.all()` and `.filter()` walk pages of results.
+            `"offset"` uses limit/offset pages. `"keyset"` sorts by creation time and
+            pages with a range filter, which stays fast for deep pages and can't skip
+            rows that shift while paging. `"auto"` uses keyset pagination for more
+            than 100,000 results. Defaults to `"offset"`.
+        keyset_fields (dict, optional): Field to sort and page by with keyset
+            pagination, keyed by dotted endpoint path (e.g. `"dcim.interfaces"`).
+            It must be unique enough that no page of results shares a single value,
+            never change, and support the `__gte` lookup. Endpoints that aren't
+            listed use `created`, which every model has but isn't indexed.
+        metadata_cache (Union[bool, str, MetadataCache], optional): Cache choices, custom
+            fields, endpoint listings and the OpenAPI schema per server and
+            API version, instead of requesting them for each new `App` or `Endpoint`.
+            Pass `True` to cache them in memory, a directory path to also keep them on
+            disk for later processes, or a `MetadataCache` to share it with other `Api`
+            objects. Defaults to `None` (no cache).
+        lazy_loads (Union[str, LazyLoadPolicy], optional): What reading an attribute
+            missing from a record does. `"allow"` requests the full details of the
+            record, `"warn"` also logs the endpoint, attribute and call site when the
+            records of one query are loaded more than 10 times, `"raise"` raises
+            `LazyLoadError` instead, and `"batch"` loads the records of the same
+            query together. Pass a `LazyLoadPolicy` to set the warning threshold.
+            Defaults to `"allow"`.
+        projection (Union[bool, str, ProjectionStore], optional): Learn which fields
+            each line of code querying an endpoint reads, and once `projection.save()`
+            is called, narrow later queries from that line with `depth`, `exclude_m2m`
+            and `include`. Reading a field left out falls back to `full_details()`.
+            Pass `True` to learn in memory, the path of a JSON file to keep the
+            projections for later runs, or a `ProjectionStore`. Defaults to `None`.
 
     Attributes:
         circuits: An instance of the `App` class providing access to Circuits endpoints.
@@ -61,6 +176,32 @@ class Api:
         virtualization: An instance of the `App` class providing access to Virtualization endpoints.
         vpn: An instance of the `App` class providing access to VPN endpoints.
         wireless: An instance of the `App` class providing access to Wireless endpoints.
+        circuit_breaker (CircuitBreaker): The circuit breaker, or `None` if
+            `circuit_breaker` is not enabled.
+        concurrency (AdaptiveLimiter): The adaptive concurrency limiter, or `None`
+            if `adaptive_concurrency` is not enabled. Use `concurrency.stats()` and
+            `concurrency.history` to inspect how the limit changes.
+        hedging (HedgingPolicy): The hedging policy, or `None` if `hedging` is not
+            enabled. Use `hedging.stats()` to see how often hedges are sent and win.
+        hooks (Hooks): Calls the functions registered for `before_request`,
+            `after_response`, `on_retry` and `on_page` events. Attach a
+            `MetricsCollector` for per-endpoint counters and latency histograms.
+        lazy_loads (LazyLoadPolicy): The lazy-load policy. `lazy_loads.stats` counts
+            the requests sent to load missing attributes, and `lazy_loads.track()`
+            counts those of a block of code.
+        profiler (PayloadProfiler): The payload profiler while `profile()` runs,
+            otherwise `None`.
+        projection (ProjectionStore): The learned projections, or `None` if
+            `projection` is not set.
+        rate_limiter (TokenBucket): The rate limiter, or `None` if `rate_limit`
+            is not set.
+        retry (RetryPolicy): The retry policy, or `None` if `retries` is not set.
+        router (ReplicaRouter): Routes reads to `read_urls`, or `None` if no read
+            replicas are configured. `router.reads` counts the reads sent to each URL.
+        metadata (MetadataCache): The metadata cache, or `None` if `metadata_cache`
+            is not set. Use `metadata.refresh()` to drop stale entries.
+        resolver (Resolver): Resolves natural keys such as names to object IDs in bulk,
+            with a TTL cache. See `pynautobot.core.resolver.Resolver`.
         http_session (requests.Session): The underlying HTTP session object used for
             making requests to Nautobot. You can override the default session with your
             own to control HTTP behavior such as SSL verification, custom headers,
@@ -79,7 +220,24 @@ class Api:
         >>> nb.dcim.devices.all()
     """
 
-    def __init__(
+    # Apps and helpers are created on first access, so that creating an Api stays cheap.
+    circuits = _Lazy(lambda api: App(api, "circuits"))
+    cloud = _Lazy(lambda api: App(api, "cloud"))
+    data_validation = _Lazy(lambda api: App(api, "data-validation"))
+    dcim = _Lazy(lambda api: App(api, "dcim"))
+    extras = _Lazy(lambda api: App(api, "extras"))
+    ipam = _Lazy(lambda api: App(api, "ipam"))
+    load_balancers = _Lazy(lambda api: App(api, "load-balancers"))
+    tenancy = _Lazy(lambda api: App(api, "tenancy"))
+    users = _Lazy(lambda api: App(api, "users"))
+    virtualization = _Lazy(lambda api: App(api, "virtualization"))
+    vpn = _Lazy(lambda api: App(api, "vpn"))
+    wireless = _Lazy(lambda api: App(api, "wireless"))
+    plugins = _Lazy(PluginsApp)
+    graphql = _Lazy(_graphql)
+    resolver = _Lazy(_resolver)
+
+    def __init__(  # pylint: disable=too-many-locals
         self,
         url,
         token=None,
@@ -90,6 +248,18 @@ class Api:
         verify=True,
         exclude_m2m=None,
         include_default=None,
+        adaptive_concurrency=False,
+        rate_limit=None,
+        timeout=None,
+        hedging=False,
+        read_urls=None,
+        read_your_writes=0,
+        circuit_breaker=False,
+        pagination="offset",
+        keyset_fields=None,
+        metadata_cache=None,
+        lazy_loads="allow",
+        projection=None,
     ):
         """Initialize the Api object."""
         from pynautobot import __version__  # pylint: disable=import-outside-toplevel
@@ -98,22 +268,41 @@ class Api:
         self.token = token
         self.headers = {"Authorization": f"Token {self.token}"}
         self.base_url = base_url
-        self.http_session = requests.Session()
+        self.http_session = Session()
         self.http_session.verify = verify
+        self.http_session.timeout = timeout
         self.http_session.headers.update({"User-Agent": f"python-pynautobot/{__version__}"})
-        if retries:
-            _adapter = HTTPAdapter(
-                max_retries=Retry(
-                    total=retries,
-                    backoff_factor=1,
-                    allowed_methods=None,
-                    status_forcelist=[429, 500, 502, 503, 504],
-                )
-            )
-            self.http_session.mount("http://", _adapter)
-            self.http_session.mount("https://", _adapter)
+        if retries and not isinstance(retries, RetryPolicy):
+            retries = RetryPolicy(retries=retries)
+        self.retry = retries or None
+        self.circuit_breaker = _policy(circuit_breaker, CircuitBreaker)
         self.threading = threading
+        if pagination not in PAGINATION_MODES:
+            raise ValueError(f"pagination must be one of {PAGINATION_MODES}")
+        self.pagination = pagination
+        self.keyset_fields = dict(keyset_fields or {})
+        self.metadata = (
+            MetadataCache(metadata_cache)
+            if isinstance(metadata_cache, (str, os.PathLike))
+            else _policy(metadata_cache, MetadataCache)
+        )
+        self.lazy_loads = lazy_loads if isinstance(lazy_loads, LazyLoadPolicy) else LazyLoadPolicy(lazy_loads)
         self.max_workers = max_workers
+        self.concurrency = _policy(
+            adaptive_concurrency,
+            lambda: AdaptiveLimiter(initial=max(1, max_workers), max_limit=max(1, 4 * max_workers)),
+        )
+        self.rate_limiter = TokenBucket(rate_limit) if isinstance(rate_limit, (int, float)) else rate_limit
+        self.hedging = _policy(hedging, HedgingPolicy)
+        self.hooks = Hooks()
+        self.profiler = None
+        self.projection = _projection(projection)
+        self.router = None
+        if read_urls:
+            self.router = ReplicaRouter(
+                base_url, [f"{read_url.rstrip('/')}/api" for read_url in read_urls], read_your_writes=read_your_writes
+            )
+        self._attach_policies()
         self.api_version = api_version
         self.default_filters = {}
         if exclude_m2m is not None:
@@ -121,20 +310,30 @@ class Api:
         if include_default is not None:
             self.default_filters["include"] = include_default
 
-        self.circuits = App(self, "circuits")
-        self.cloud = App(self, "cloud")
-        self.data_validation = App(self, "data-validation")
-        self.dcim = App(self, "dcim")
-        self.extras = App(self, "extras")
-        self.ipam = App(self, "ipam")
-        self.load_balancers = App(self, "load-balancers")
-        self.tenancy = App(self, "tenancy")
-        self.users = App(self, "users")
-        self.virtualization = App(self, "virtualization")
-        self.vpn = App(self, "vpn")
-        self.wireless = App(self, "wireless")
-        self.plugins = PluginsApp(self)
-        self.graphql = GraphQLQuery(self)
+    def _attach_policies(self):
+        """Applies the client-side policies of the `Api` to every request of its session."""
+        self.http_session.circuit_breaker = self.circuit_breaker
+        self.http_session.event_hooks = self.hooks
+        self.http_session.hedging = self.hedging
+        self.http_session.limiter = self.concurrency
+        self.http_session.rate_limiter = self.rate_limiter
+        self.http_session.retry = self.retry
+        self.http_session.router = self.router
+
+    @property
+    def pool_size(self):
+        """Number of threads used to paginate a query.
+
+        This is `max_workers`, or the ceiling of the adaptive concurrency
+        limiter when it is higher, so that the limiter rather than the thread
+        pool caps the number of requests in flight.
+
+        Returns:
+            (int): The number of pagination threads.
+        """
+        if self.concurrency is not None:
+            return max(self.max_workers, self.concurrency.max_limit)
+        return self.max_workers
 
     @property
     def version(self):
@@ -190,12 +389,173 @@ class Api:
             >>> nb.openapi()
             {...}
         """
-        return Request(
-            base=self.base_url,
-            http_session=self.http_session,
-            api_version=self.api_version,
-            token=self.token,
-        ).get_openapi()
+        return cached(
+            self,
+            f"openapi {self.api_version}",
+            Request(
+                base=self.base_url,
+                http_session=self.http_session,
+                api_version=self.api_version,
+                token=self.token,
+            ).get_openapi,
+        )
+
+    def fetch_many(self, queries, max_workers=None, per_query_workers=None, stream=False):
+        """Runs several queries across apps and endpoints concurrently.
+
+        The total number of concurrent HTTP requests is capped at ``max_workers``.
+        The budget is shared out between the queries: each query paginates with
+        up to ``per_query_workers`` threads, and as many queries run at once as
+        the budget allows.
+
+        Args:
+            queries (dict): Query names mapped to an `Endpoint` or dotted
+                ``"app.endpoint"`` path, optionally paired with a dict of
+                filters as a ``(endpoint, filters)`` tuple.
+            max_workers (int, optional): Global concurrency budget. Defaults to
+                the `Api`'s ``max_workers``.
+            per_query_workers (int, optional): Pagination threads per query.
+                Defaults to an even share of the budget.
+            stream (bool, optional): Yield each result as soon as its query
+                completes instead of returning them all at the end.
+
+        Returns:
+            (Union[dict, Iterator[FetchResult]]): Query names mapped to
+                `pynautobot.core.fanout.FetchResult` objects, in the order of
+                ``queries``, or an iterator of `FetchResult` in completion order
+                when ``stream`` is set.
+
+        Raises:
+            RequestError: If any of the queries fails.
+
+        Examples:
+            >>> results = nb.fetch_many({
+            ...     "devices": "dcim.devices",
+            ...     "interfaces": ("dcim.interfaces", {"location": "HQ"}),
+            ...     "vlans": nb.ipam.vlans,
+            ... }, max_workers=8)
+            >>> results["interfaces"].records
+            [Gi1/0/1, Gi1/0/2, ...]
+            >>> results["interfaces"].elapsed
+            3.27
+
+            >>> for result in nb.fetch_many(queries, stream=True):
+            ...     print(result.name, len(result.records), result.elapsed)
+        """
+        from pynautobot.core.fanout import fetch_many  # pylint: disable=import-outside-toplevel
+
+        return fetch_many(self, queries, max_workers=max_workers, per_query_workers=per_query_workers, stream=stream)
+
+    @contextlib.contextmanager
+    def profile(self, profiler=None):
+        """Profiles the payloads of the responses of the block and the fields read from them.
+
+        Records returned in the block keep counting the attributes read on
+        them after it, so read the report once the workload is done.
+
+        Args:
+            profiler (PayloadProfiler, optional): A profiler to add the measures
+                to, such as the one of an earlier block. Defaults to a new one.
+
+        Yields:
+            (PayloadProfiler): The profiler. See `PayloadProfiler.recommendations()`.
+
+        Examples:
+            >>> with nb.profile() as profiler:
+            ...     names = [(i.name, i.device.name) for i in nb.dcim.interfaces.filter(device="sw1")]
+            >>> for recommendation in profiler.recommendations():
+            ...     print(recommendation["endpoint"], recommendation["parameter"], recommendation["value"])
+            dcim.interfaces exclude_m2m True
+        """
+        from pynautobot.core.profiling import PayloadProfiler  # pylint: disable=import-outside-toplevel
+
+        profiler = profiler if profiler is not None else PayloadProfiler()
+        self.profiler = profiler
+        self.hooks.attach(profiler)
+        try:
+            yield profiler
+        finally:
+            self.hooks.detach(profiler)
+            self.profiler = None
+
+    @contextlib.contextmanager
+    def _adapters(self, adapter):
+        """Sends the requests of the block with ``adapter(mounted_adapter)`` in place of each mounted adapter."""
+        adapters = self.http_session.adapters
+        mounted = dict(adapters)
+        for prefix, current in mounted.items():
+            adapters[prefix] = adapter(current)
+        try:
+            yield
+        finally:
+            adapters.clear()
+            adapters.update(mounted)
+
+    @contextlib.contextmanager
+    def record(self, path=None, cassette=None):
+        """Records the requests of the block and their responses to a cassette.
+
+        Every request sent to Nautobot is recorded with its latency, including
+        retries and the requests of other threads using this `Api`. The API
+        token and cookies aren't recorded, and request bodies are only kept as
+        a digest. See `pynautobot.core.cassette.Cassette`.
+
+        Args:
+            path (str, optional): File to save the cassette to when the block
+                exits, even if it raises.
+            cassette (Cassette, optional): A cassette to add the requests to,
+                such as the one of an earlier block. Defaults to a new one.
+
+        Yields:
+            (Cassette): The cassette.
+
+        Examples:
+            >>> with nb.record("~/slow-script.cassette"):
+            ...     run_inventory_report(nb)
+        """
+        from pynautobot.core.cassette import Cassette, RecordingAdapter  # pylint: disable=import-outside-toplevel
+
+        cassette = cassette if cassette is not None else Cassette()
+        try:
+            with self._adapters(lambda adapter: RecordingAdapter(cassette, adapter)):
+                yield cassette
+        finally:
+            if path is not None:
+                cassette.save(path)
+
+    @contextlib.contextmanager
+    def replay(self, cassette, latency=1.0):
+        """Answers the requests of the block with the responses of a cassette, without Nautobot.
+
+        Requests get the response recorded for the same method, path, query
+        and body, in the order they were recorded, whatever URL the `Api` was
+        created with. Replaying without latency leaves only the time spent in
+        pynautobot and the script, to measure changes to them offline.
+
+        Args:
+            cassette (Union[str, Cassette]): The cassette, or the file it was saved to.
+            latency (float, optional): Fraction of the recorded latency of each
+                request to wait for: 1 for the original latency, 0 for none.
+
+        Yields:
+            (Cassette): The cassette.
+
+        Raises:
+            CassetteError: When a request of the block wasn't recorded.
+
+        Examples:
+            >>> with nb.replay("~/slow-script.cassette", latency=0):
+            ...     start = time.perf_counter()
+            ...     run_inventory_report(nb)
+            ...     print(time.perf_counter() - start)
+        """
+        from pynautobot.core.cassette import Cassette, ReplayAdapter  # pylint: disable=import-outside-toplevel
+
+        cassette = cassette if isinstance(cassette, Cassette) else Cassette.load(cassette)
+        cassette.rewind()
+        replay = ReplayAdapter(cassette, latency=latency)
+        with self._adapters(lambda _: replay):
+            yield cassette
 
     def status(self):
         """Retrieves status information about the connected Nautobot instance.
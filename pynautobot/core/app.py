@@ -16,11 +16,13 @@
 
 """This module defines the `App` and `PluginsApp` classes for interacting with Nautobot applications and plugins."""
 
+import importlib
+import json
 import logging
 
 from pynautobot.core.endpoint import Endpoint, GraphqlEndpoint, JobsEndpoint
+from pynautobot.core.metadata import cached
 from pynautobot.core.query import Request
-from pynautobot.models import circuits, cloud, dcim, extras, ipam, users, virtualization
 
 logger = logging.getLogger(__name__)
 
@@ -37,14 +39,15 @@ class App:
         RequestError: If requested endpoint doesn't exist.
     """
 
+    # Model modules are imported on first use, as most scripts only use a few apps.
     models = {
-        "dcim": dcim,
-        "cloud": cloud,
-        "ipam": ipam,
-        "circuits": circuits,
-        "virtualization": virtualization,
-        "extras": extras,
-        "users": users,
+        "dcim": "pynautobot.models.dcim",
+        "cloud": "pynautobot.models.cloud",
+        "ipam": "pynautobot.models.ipam",
+        "circuits": "pynautobot.models.circuits",
+        "virtualization": "pynautobot.models.virtualization",
+        "extras": "pynautobot.models.extras",
+        "users": "pynautobot.models.users",
     }
 
     def __init__(self, api, name):
@@ -52,10 +55,14 @@ class App:
         self.api = api
         self.name = name
         self._choices = None
-        self._setmodel()
+        self._model = None
 
-    def _setmodel(self):
-        self.model = App.models[self.name] if self.name in App.models else None
+    @property
+    def model(self):
+        """Module of the `Record` classes of the app, or None if it has none."""
+        if self._model is None and self.name in App.models:
+            self._model = importlib.import_module(App.models[self.name])
+        return self._model
 
     def __getstate__(self):
         """Get the state of the App object."""
@@ -64,7 +71,7 @@ class App:
     def __setstate__(self, d):
         """Set the state of the App object."""
         self.__dict__.update(d)
-        self._setmodel()
+        self._model = None
 
     def __getattr__(self, name):
         """Get an attribute from the App object."""
@@ -90,11 +97,15 @@ class App:
         if self._choices:
             return self._choices
 
-        self._choices = Request(
-            base=f"{self.api.base_url}/{self.name}/_choices/",
-            token=self.api.token,
-            http_session=self.api.http_session,
-        ).get()
+        self._choices = cached(
+            self.api,
+            f"choices {self.name}",
+            Request(
+                base=f"{self.api.base_url}/{self.name}/_choices/",
+                token=self.api.token,
+                http_session=self.api.http_session,
+            ).get,
+        )
 
         return self._choices
 
@@ -146,12 +157,16 @@ class App:
         default_filters = self.api.default_filters.copy()
         if filters:
             default_filters.update(filters)
-        return Request(
-            base=f"{self.api.base_url}/{self.name}/custom-fields/",
-            token=self.api.token,
-            http_session=self.api.http_session,
-            filters=default_filters,
-        ).get()
+        return cached(
+            self.api,
+            f"custom_fields {self.name} {json.dumps(default_filters, sort_keys=True, default=str)}",
+            Request(
+                base=f"{self.api.base_url}/{self.name}/custom-fields/",
+                token=self.api.token,
+                http_session=self.api.http_session,
+                filters=default_filters,
+            ).get,
+        )
 
     def get_custom_field_choices(self, filters=None):
         """Returns custom-field-choices response from app.
@@ -195,12 +210,16 @@ class App:
         default_filters = self.api.default_filters.copy()
         if filters:
             default_filters.update(filters)
-        return Request(
-            base=f"{self.api.base_url}/{self.name}/custom-field-choices/",
-            token=self.api.token,
-            http_session=self.api.http_session,
-            filters=default_filters,
-        ).get()
+        return cached(
+            self.api,
+            f"custom_field_choices {self.name} {json.dumps(default_filters, sort_keys=True, default=str)}",
+            Request(
+                base=f"{self.api.base_url}/{self.name}/custom-field-choices/",
+                token=self.api.token,
+                http_session=self.api.http_session,
+                filters=default_filters,
+            ).get,
+        )
 
     def config(self):
         """Returns config response from app.
@@ -230,11 +249,15 @@ class App:
 
     def _get_api_endpoints(self):
         """Returns the API endpoints available for the app."""
-        return Request(
-            base=f"{self.api.base_url}/{self.name}/",
-            token=self.api.token,
-            http_session=self.api.http_session,
-        ).get()
+        return cached(
+            self.api,
+            f"endpoints {self.name}",
+            Request(
+                base=f"{self.api.base_url}/{self.name}/",
+                token=self.api.token,
+                http_session=self.api.http_session,
+            ).get,
+        )
 
 
 class PluginsApp:
@@ -287,8 +310,12 @@ class PluginsApp:
 
     def _get_api_endpoints(self):
         """Returns any plugin API endpoints available."""
-        return Request(
-            base=f"{self.api.base_url}/plugins/",
-            token=self.api.token,
-            http_session=self.api.http_session,
-        ).get()
+        return cached(
+            self.api,
+            "endpoints plugins",
+            Request(
+                base=f"{self.api.base_url}/plugins/",
+                token=self.api.token,
+                http_session=self.api.http_session,
+            ).get,
+        )
@@ -0,0 +1,293 @@
+"""Recording of the HTTP traffic of an `Api`, and replaying it without Nautobot.
+
+A `Cassette` holds the requests sent by an `Api` and the responses received,
+with their latency. `Api.record()` fills one and `Api.replay()` answers the
+requests of a block from one, so that a slow script can be run again offline,
+with the original latency or none, to measure the cost of pynautobot alone.
+"""
+
+import base64
+import collections
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_FORMAT = 1
+
+# Headers holding credentials, which are never written to a cassette.
+REDACTED_HEADERS = frozenset(("authorization", "cookie", "proxy-authorization", "set-cookie", "x-csrftoken"))
+# Headers describing the encoding of the body on the wire, which a cassette stores decoded.
+_WIRE_HEADERS = frozenset(("content-encoding", "content-length", "transfer-encoding"))
+
+
+class CassetteError(Exception):
+    """Cassette Exception.
+
+    Raised when replaying a request that the cassette has no response for.
+
+    Examples:
+        >>> with nb.replay("slow-script.cassette"):
+        ...     nb.dcim.devices.get(name="not-recorded")
+        pynautobot.core.cassette.CassetteError: No response recorded for GET /api/dcim/devices/?name=not-recorded
+    """
+
+
+def request_key(method, url, body):
+    """Returns what tells a request apart in a cassette.
+
+    The scheme and host of ``url`` and the order of its query parameters
+    don't count, so that a cassette replays against any URL of the same
+    Nautobot. The body counts by its digest, so that it isn't stored.
+
+    Returns:
+        (tuple): The method, the path and sorted query, and the digest of the body.
+    """
+    parts = urlsplit(url)
+    target = parts.path + (
+        "?" + urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True))) if parts.query else ""
+    )
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:16] if body else None
+    return method.upper(), target, digest
+
+
+class Cassette:
+    """The HTTP requests of an `Api` and the responses received.
+
+    Request bodies are kept as a digest only, and the headers in
+    `REDACTED_HEADERS`, such as the API token, are left out. Cassettes are
+    saved as gzipped JSON lines, storing each distinct response body once.
+
+    Replaying a request returns the response recorded for the next request
+    with the same method, path, query and body. A request made more times
+    than it was recorded gets the last response recorded for it.
+
+    Args:
+        interactions (list, optional): The interactions of the cassette.
+
+    Attributes:
+        interactions (list): The interactions recorded, in the order they
+            were sent: dicts with the ``method``, ``url`` path and query,
+            ``body`` digest, ``start`` and ``elapsed`` seconds of the request,
+            and either the ``status``, ``reason``, ``headers`` and ``content``
+            of its response or the ``error`` and ``message`` raised.
+    """
+
+    def __init__(self, interactions=None):
+        """Initialize the Cassette object."""
+        self.interactions = list(interactions or [])
+        self._queues = None
+        self._started = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the picklable state of the Cassette object."""
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        """Restore the Cassette object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of interactions."""
+        return len(self.interactions)
+
+    def add(self, request, start, elapsed, response=None, error=None):
+        """Records a request and its response, or the error raised instead.
+
+        Args:
+            request (requests.PreparedRequest): The request sent.
+            start (float): `time.monotonic()` when it was sent.
+            elapsed (float): Seconds until its response was read.
+            response (requests.Response, optional): The response, with its content read.
+            error (Exception, optional): The error raised instead of a response.
+        """
+        method, target, digest = request_key(request.method, request.url, request.body)
+        interaction = {"method": method, "url": target, "body": digest, "elapsed": round(elapsed, 6)}
+        if response is not None:
+            interaction.update(
+                status=response.status_code,
+                reason=response.reason,
+                headers={
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() not in REDACTED_HEADERS | _WIRE_HEADERS
+                },
+                content=response.content,
+            )
+        else:
+            interaction.update(error=type(error).__name__, message=str(error))
+        with self._lock:
+            if self._started is None:
+                self._started = start
+            interaction["start"] = round(start - self._started, 6)
+            self.interactions.append(interaction)
+
+    def next(self, request):
+        """Returns the interaction recorded for ``request``.
+
+        Raises:
+            CassetteError: If no interaction was recorded for the request.
+        """
+        key = request_key(request.method, request.url, request.body)
+        with self._lock:
+            if self._queues is None:
+                self._queues = collections.defaultdict(collections.deque)
+                for interaction in self.interactions:
+                    self._queues[(interaction["method"], interaction["url"], interaction["body"])].append(interaction)
+            queue = self._queues.get(key)
+            if not queue:
+                raise CassetteError(f"No response recorded for {key[0]} {key[1]}")
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def rewind(self):
+        """Replays the interactions from the start again."""
+        with self._lock:
+            self._queues = None
+
+    @classmethod
+    def load(cls, path):
+        """Loads a cassette saved with `save()`.
+
+        Raises:
+            ValueError: If the file isn't a cassette of a supported format.
+        """
+        interactions, bodies = [], []
+        with gzip.open(os.path.expanduser(os.fspath(path)), "rt", encoding="utf-8") as cassette_file:
+            header = json.loads(next(cassette_file, "{}"))
+            if header.get("format") != CASSETTE_FORMAT:
+                raise ValueError(f"{path} isn't a cassette of format {CASSETTE_FORMAT}")
+            for line in cassette_file:
+                entry = json.loads(line)
+                if "blob" in entry:
+                    blob = entry["blob"]
+                    bodies.append(base64.b64decode(blob["base64"]) if "base64" in blob else blob["text"].encode())
+                    continue
+                if "content" in entry:
+                    entry["content"] = bodies[entry["content"]]
+                interactions.append(entry)
+        return cls(interactions)
+
+    def save(self, path):
+        """Writes the cassette to ``path``, replacing it atomically."""
+        path = os.path.expanduser(os.fspath(path))
+        with self._lock:
+            interactions = list(self.interactions)
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as temporary:
+            with gzip.open(temporary, "wt", encoding="utf-8") as cassette_file:
+                header = {
+                    "format": CASSETTE_FORMAT,
+                    "recorded": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+                    "interactions": len(interactions),
+                }
+                cassette_file.write(json.dumps(header) + "\n")
+                bodies = {}
+                for interaction in interactions:
+                    entry = dict(interaction)
+                    if "content" in entry:
+                        content = entry["content"]
+                        if content not in bodies:
+                            bodies[content] = len(bodies)
+                            cassette_file.write(json.dumps({"blob": _encode(content)}, separators=(",", ":")) + "\n")
+                        entry["content"] = bodies[content]
+                    cassette_file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        os.replace(temporary.name, path)
+
+
+def _encode(content):
+    """Returns ``content`` as text if it is UTF-8, else as base64."""
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+class RecordingAdapter(BaseAdapter):
+    """Sends requests with another transport adapter, recording them in a `Cassette`.
+
+    It sits below the policies of the `Session`, so every attempt, retry and
+    hedge sent is recorded. The content of responses is read as they arrive.
+
+    Args:
+        cassette (Cassette): The cassette to record to.
+        adapter (BaseAdapter): The adapter sending the requests.
+    """
+
+    def __init__(self, cassette, adapter):
+        """Initialize the RecordingAdapter object."""
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Sends ``request`` and records it with its response."""
+        start = time.monotonic()
+        try:
+            response = self.adapter.send(request, **kwargs)
+            response.content  # pylint: disable=pointless-statement
+        except requests.exceptions.RequestException as error:
+            self.cassette.add(request, start, time.monotonic() - start, error=error)
+            raise
+        self.cassette.add(request, start, time.monotonic() - start, response=response)
+        return response
+
+    def close(self):
+        """Closes the adapter sending the requests."""
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests with the responses recorded in a `Cassette`.
+
+    Args:
+        cassette (Cassette): The cassette to replay.
+        latency (float, optional): Fraction of the recorded latency to wait
+            before answering each request: 1 for the original latency, 0 to
+            answer at once.
+    """
+
+    def __init__(self, cassette, latency=1.0):
+        """Initialize the ReplayAdapter object."""
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+
+    def send(self, request, **_kwargs):  # pylint: disable=arguments-differ
+        """Returns the response recorded for ``request``, or raises the error recorded for it."""
+        interaction = self.cassette.next(request)
+        delay = interaction["elapsed"] * self.latency
+        if delay > 0:
+            time.sleep(delay)
+        if "error" in interaction:
+            error = getattr(requests.exceptions, interaction["error"], None)
+            if not (isinstance(error, type) and issubclass(error, requests.exceptions.RequestException)):
+                error = requests.exceptions.ConnectionError
+            raise error(interaction["message"], request=request)
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction.get("reason")
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response._content = interaction["content"]  # pylint: disable=protected-access
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = datetime.timedelta(seconds=max(delay, 0))
+        return response
+
+    def close(self):
+        """Nothing to close."""
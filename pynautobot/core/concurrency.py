@@ -0,0 +1,171 @@
+"""Adaptive (AIMD) concurrency control for requests sent to Nautobot."""
+
+import collections
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Status codes that mean Nautobot (or a proxy in front of it) is overloaded.
+OVERLOAD_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(value):
+    """Returns the number of seconds a ``Retry-After`` header asks to wait.
+
+    Args:
+        value (str): The header value, either delta-seconds or an HTTP date.
+
+    Returns:
+        (float): Seconds to wait, or 0 if the value can't be parsed.
+    """
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# pylint: disable=too-many-instance-attributes
+class AdaptiveLimiter:
+    """Limits in-flight requests with additive-increase/multiplicative-decrease.
+
+    Every request made through the `Api` takes a slot from the limiter. While
+    responses are healthy and latency stays close to the best latency seen so
+    far, the limit grows by roughly one slot per round of requests. A 429/5xx
+    response, a connection error or latency rising beyond
+    ``latency_tolerance`` times the baseline cuts the limit by
+    ``decrease_factor``. A ``Retry-After`` header on an overload response
+    pauses every new request until the requested time has passed.
+
+    The limiter is shared by every thread using the same `Api`.
+
+    Args:
+        initial (int, optional): Starting concurrency limit.
+        min_limit (int, optional): The limit never drops below this.
+        max_limit (int, optional): The limit never grows above this.
+        decrease_factor (float, optional): Multiplier applied to the limit on overload.
+        latency_tolerance (float, optional): Ratio of smoothed latency to baseline
+            latency that is treated as overload.
+        history_size (int, optional): Number of limit changes kept in `history`.
+
+    Attributes:
+        history (collections.deque): The most recent limit changes as
+            ``(timestamp, new_limit, reason)`` tuples.
+
+    Examples:
+        >>> nb = pynautobot.api(url, token=token, threading=True, adaptive_concurrency=True)
+        >>> nb.dcim.interfaces.all()
+        >>> nb.concurrency.stats()
+        {'limit': 7, 'in_flight': 0, 'baseline_latency': 0.081, ...}
+    """
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        initial=2,
+        min_limit=1,
+        max_limit=16,
+        decrease_factor=0.5,
+        latency_tolerance=2.0,
+        history_size=100,
+    ):
+        """Initialize the AdaptiveLimiter object."""
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("AdaptiveLimiter requires 1 <= min_limit <= initial <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.history = collections.deque(maxlen=history_size)
+        self.baseline_latency = None
+        self.smoothed_latency = None
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._limit = float(initial)
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self):
+        """The current concurrency limit."""
+        return int(self._limit)
+
+    def stats(self):
+        """Returns a snapshot of the limiter state.
+
+        Returns:
+            (dict): Current limit, in-flight requests, latency estimates in
+                seconds and the number of increases and decreases so far.
+        """
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "baseline_latency": self.baseline_latency,
+                "smoothed_latency": self.smoothed_latency,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "paused_for": max(0.0, self._paused_until - time.monotonic()),
+            }
+
+    def acquire(self):
+        """Blocks until a slot is free and takes it."""
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                self._cond.wait(wait if wait > 0 else None)
+
+    def release(self, latency=None, status_code=None, retry_after=None, error=False):
+        """Returns a slot and adjusts the limit from the outcome of the request.
+
+        Args:
+            latency (float, optional): Seconds the request took.
+            status_code (int, optional): HTTP status code of the response.
+            retry_after (float, optional): Seconds requested by a ``Retry-After`` header.
+            error (bool, optional): Whether the request failed without a response.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if error or status_code in OVERLOAD_STATUS_CODES:
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+                self._decrease(now, "error" if error else f"status {status_code}")
+            elif latency is not None:
+                self._observe_latency(now, latency)
+            self._cond.notify_all()
+
+    def _observe_latency(self, now, latency):
+        if self.baseline_latency is None:
+            self.baseline_latency = self.smoothed_latency = latency
+        else:
+            # The baseline follows new lows immediately and drifts up slowly.
+            self.baseline_latency = min(latency, self.baseline_latency + (latency - self.baseline_latency) * 0.01)
+            self.smoothed_latency += (latency - self.smoothed_latency) * 0.2
+        if self.smoothed_latency > self.baseline_latency * self.latency_tolerance:
+            self._decrease(now, "latency")
+        elif self._limit < self.max_limit:
+            previous = self.limit
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            if self.limit != previous:
+                self.increases += 1
+                self.history.append((time.time(), self.limit, "increase"))
+
+    def _decrease(self, now, reason):
+        # Responses to requests sent before the last cut reflect the old limit; skip them.
+        if now - self._last_decrease < (self.smoothed_latency or 0.0):
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self.decreases += 1
+        self.history.append((time.time(), self.limit, reason))
@@ -19,8 +19,11 @@ from time import sleep
 from typing import Any, Dict, List, Union, overload
 from uuid import UUID
 
-from pynautobot.core.query import Request, RequestError
+from pynautobot.core.lazyload import LazyLoadPolicy
+from pynautobot.core.metadata import cached
+from pynautobot.core.query import PAGINATION_MODES, MultipleResultsError, Request, RequestError, make_deadline
 from pynautobot.core.response import Record
+from pynautobot.core.tracing import span, traced
 
 RESERVED_KWARGS = ("pk",)
 
@@ -28,8 +31,55 @@ RESERVED_KWARGS = ("pk",)
 def response_loader(req, return_obj, endpoint):
     """Loads the response from the API into an object."""
     if isinstance(req, list):
-        return [return_obj(i, endpoint.api, endpoint) for i in req]
-    return return_obj(req, endpoint.api, endpoint)
+        with span("pynautobot.hydrate", url=endpoint.url, records=len(req)):
+            records = [return_obj(i, endpoint.api, endpoint) for i in req]
+    else:
+        records = return_obj(req, endpoint.api, endpoint)
+    policy = getattr(endpoint.api, "lazy_loads", None)
+    if isinstance(policy, LazyLoadPolicy):
+        policy.group(records)
+    profiler = getattr(endpoint.api, "profiler", None)
+    if profiler is not None:
+        # `Api.profiler` is only set while `Api.profile()` runs.
+        from pynautobot.core.profiling import PayloadProfiler  # pylint: disable=import-outside-toplevel
+
+        if isinstance(profiler, PayloadProfiler):
+            profiler.observe(endpoint, req, records)
+    return records
+
+
+def parse_choices(url, options):
+    """Returns the choices of each field from the OPTIONS response of an endpoint.
+
+    Args:
+        url (str): URL of the endpoint.
+        options (dict): OPTIONS response of the endpoint.
+
+    Returns:
+        (dict): Dict containing the available choices.
+
+    Raises:
+        ValueError: If the OPTIONS response has an unexpected format.
+    """
+    if options.get("schema", {}).get("properties") is not None:
+        # Nautobot 2.3 and below
+        post_data = options["schema"]["properties"]
+        return {
+            prop: [{"value": x, "display": y} for x, y in zip(post_data[prop]["enum"], post_data[prop]["enumNames"])]
+            for prop in post_data
+            if "enum" in post_data[prop]
+        }
+    if options.get("actions", {}).get("POST") is not None:
+        # Nautobot 2.4+
+        post_data = options["actions"]["POST"]
+        choices = {}
+        for prop in post_data:
+            if "choices" in post_data[prop]:
+                choices[prop] = post_data[prop]["choices"]
+            elif post_data[prop]["type"] == "list" and "choices" in post_data[prop].get("child", {}):
+                choices[prop] = post_data[prop]["child"]["choices"]
+        return choices
+    raise ValueError(f"Unexpected format in the OPTIONS response at {url}")
 
 
 class Endpoint:
@@ -95,6 +145,10 @@ class Endpoint:
                 be returned with each query to the Netbox server.  The queries
                 will be made as you iterate through the result set.
             offset (int, optional): Overrides the offset on paginated returns.
+            deadline (float, optional): Seconds within which every page must be
+                fetched. `DeadlineExceeded` is raised otherwise.
+            pagination (str, optional): Overrides the pagination strategy of the
+                `Api`: ``"offset"``, ``"keyset"`` or ``"auto"``.
 
         Returns:
             (list): List of :py:class:`.Record` objects.
@@ -105,6 +159,7 @@ class Endpoint:
         """
         return self.filter(*args, **kwargs)
 
+    @traced("pynautobot.get")
     def get(self, *args, **kwargs):
         """Queries the DetailsView of a given endpoint.
 
@@ -114,12 +169,14 @@ class Endpoint:
                 Any search argument the endpoint accepts can be added as a keyword arg.
             api_version (str, optional): Override default or globally-set Nautobot REST API
                 version for this single request.
+            deadline (float, optional): Seconds within which the request must complete.
 
         Returns:
             (Union[Record, None]): A single :py:class:`.Record` object or None.
 
         Raises:
-            ValueError: If kwarg search returns more than one value.
+            MultipleResultsError: If kwarg search returns more than one value.
+            DeadlineExceeded: If the request did not complete within ``deadline``.
 
         Examples:
             Referencing with a kwarg that only returns one value.
@@ -139,12 +196,16 @@ class Endpoint:
 
         is_api_version = filters.pop("api_version", None)
         api_version = is_api_version or self.api.api_version
+        deadline = filters.pop("deadline", None)
 
         if not key:
-            filter_lookup = self.filter(**filters)
+            # Two rows are enough to tell "exactly one" from "more than one".
+            filters.pop("limit", None)
+            filters.pop("offset", None)
+            filter_lookup = self.filter(api_version=api_version, deadline=deadline, limit=2, offset=0, **filters)
             if filter_lookup:
                 if len(filter_lookup) > 1:
-                    raise ValueError(
+                    raise MultipleResultsError(
                         "get() returned more than one result. "
                         "Check that the kwarg(s) passed are valid for this "
                         "endpoint or use filter() or all() instead."
@@ -152,13 +213,16 @@ class Endpoint:
                 return filter_lookup[0]
             return None
 
+        projection = self._projection()
+        site = projection.site(self) if projection is not None else None
         req = Request(
             key=key,
             base=self.url,
             token=self.token,
             http_session=self.api.http_session,
             api_version=api_version,
-            filters=filters,
+            filters=projection.project(site, filters) if projection is not None else filters,
+            deadline=make_deadline(deadline),
         )
 
         try:
@@ -168,9 +232,82 @@ class Endpoint:
                 return None
             raise e
 
-        return response_loader(resp, self.return_obj, self)
+        record = response_loader(resp, self.return_obj, self)
+        if projection is not None:
+            projection.observe(site, resp, record)
+        return record
+
+    def get_or_none(self, *args, **kwargs):
+        """Queries the DetailsView of a given endpoint without raising on ambiguous lookups.
+
+        Behaves like `get()`, but returns None instead of raising when a
+        kwarg search matches more than one object.
+
+        Optional Args:
+            key (int, optional): ID for the item to be retrieved.
+            **kwargs (str, optional): Accepts the same keyword args as filter().
+
+        Returns:
+            (Union[Record, None]): A single :py:class:`.Record` object or None.
+
+        Examples:
+            >>> nb.dcim.devices.get_or_none(role='leaf-switch')
+            >>>
+        """
+        try:
+            return self.get(*args, **kwargs)
+        except MultipleResultsError:
+            return None
+
+    def first(self, *args, **kwargs):
+        """Returns the first object matching a query.
+
+        Only a single row is requested from Nautobot, so this is a cheap way
+        to pick any match from a large result set. Pass ``sort`` if a
+        specific ordering is required.
+
+        Args:
+            *args (str, optional): Freeform search string that's
+                accepted on given endpoint.
+            **kwargs (str, optional): Any search argument the
+                endpoint accepts can be added as a keyword arg.
+
+        Returns:
+            (Union[Record, None]): The first matching :py:class:`.Record` or None.
+
+        Examples:
+            >>> nb.dcim.devices.first(role='leaf-switch', sort='name')
+            test1-a3-tor1b
+        """
+        kwargs.update({"limit": 1, "offset": 0})
+        ret = self.filter(*args, **kwargs)
+        return ret[0] if ret else None
+
+    def exists(self, *args, api_version=None, **kwargs):
+        """Returns whether any object matches a query.
+
+        Only the count of a single-row, ``depth=0`` page is requested.
+
+        Args:
+            *args (str, optional): Freeform search string that's
+                accepted on given endpoint.
+            **kwargs (str, optional): Any search argument the
+                endpoint accepts can be added as a keyword arg.
+            api_version (str, optional): Override default or globally-set
+                Nautobot REST API version for this single request.
+
+        Returns:
+            (bool): True if at least one object matches.
 
-    def filter(self, *args, api_version=None, **kwargs):
+        Examples:
+            >>> nb.dcim.devices.exists(name='test1-a3-tor1b')
+            True
+        """
+        kwargs["depth"] = 0
+        return self.count(*args, api_version=api_version, **kwargs) > 0
+
+    @traced("pynautobot.filter")
+    def filter(self, *args, api_version=None, deadline=None, **kwargs):
         """Queries the 'ListView' of a given endpoint.
 
         Takes named arguments that match the usable filters on a
@@ -184,10 +321,17 @@ class Endpoint:
                 endpoint accepts can be added as a keyword arg.
             api_version (str, optional): Override default or globally-set
                 Nautobot REST API version for this single request.
+            deadline (float, optional): Seconds within which every page must be
+                fetched. Outstanding pages are cancelled once it passes.
+            pagination (str, optional): Overrides the pagination strategy of the
+                `Api`: ``"offset"``, ``"keyset"`` or ``"auto"``.
 
         Returns:
             (list): A list of :py:class:`.Record` objects.
 
+        Raises:
+            DeadlineExceeded: If the pages could not be fetched within ``deadline``.
+
         Examples:
             To return a list of objects matching a named argument filter.
             >>> nb.dcim.devices.filter(role='leaf-switch')
@@ -206,10 +350,32 @@ class Endpoint:
             >>> nb.dcim.devices.filter(role=['leaf-switch', 'spine-switch'])
             [test1-a3-spine1, test1-a3-spine2, test1-a3-leaf1]
         """
+        projection = self._projection()
+        site = projection.site(self) if projection is not None else None
+        req = self._filter_request(*args, api_version=api_version, deadline=deadline, _site=site, **kwargs)
+        rows = req.get()
+        records = response_loader(rows, self.return_obj, self)
+        if projection is not None:
+            projection.observe(site, rows, records)
+        return records
+
+    def _projection(self):
+        """Returns the `ProjectionStore` of the `Api`, or None if it has none."""
+        projection = getattr(self.api, "projection", None)
+        if projection is None:
+            return None
+        from pynautobot.core.projection import ProjectionStore  # pylint: disable=import-outside-toplevel
+
+        return projection if isinstance(projection, ProjectionStore) else None
+
+    def _filter_request(self, *args, api_version=None, deadline=None, _site=None, **kwargs):
+        """Builds the `Request` used by `filter()`, projected for the call site ``_site`` if given."""
         filters = self.api.default_filters.copy()
         filters.update(kwargs)
         if args:
             filters.update({"q": args[0]})
+        if _site is not None:
+            filters = self.api.projection.project(_site, filters)
 
         if any(i in RESERVED_KWARGS for i in filters):
             raise ValueError(f"A reserved {RESERVED_KWARGS} kwarg was passed. Please remove it and try again.")
@@ -217,21 +383,31 @@ class Endpoint:
         offset = filters.pop("offset", None)
         if not limit and offset is not None:
             raise ValueError("offset requires a positive limit value")
+        pagination = filters.pop("pagination", None)
+        if pagination is None:
+            pagination = self.api.pagination
+        elif pagination not in PAGINATION_MODES:
+            raise ValueError(f"pagination must be one of {PAGINATION_MODES}")
         api_version = api_version or self.api.api_version
-        req = Request(
+        # The dotted path of the endpoint, e.g. "ipam.ip_addresses".
+        path = self.url[len(self.base_url) + 1 :].replace("/", ".").replace("-", "_")
+        return Request(
             filters=filters,
             base=self.url,
             token=self.token,
             http_session=self.api.http_session,
             threading=self.api.threading,
+            max_workers=self.api.pool_size,
             api_version=api_version,
             limit=limit,
             offset=offset,
+            deadline=make_deadline(deadline),
+            pagination=pagination,
+            keyset_field=self.api.keyset_fields.get(path),
         )
 
-        return response_loader(req.get(), self.return_obj, self)
-
-    def create(self, *args, api_version=None, **kwargs):
+    @traced("pynautobot.create")
+    def create(self, *args, api_version=None, deadline=None, **kwargs):
         """Creates an object on an endpoint.
 
         Allows for the creation of new objects on an endpoint. Named
@@ -249,6 +425,7 @@ class Endpoint:
                 properties on a JSON object.
             api_version (str, optional): Override default or globally-set
                 Nautobot REST API version for this single request.
+            deadline (float, optional): Seconds within which the request must complete.
 
         Returns:
             (Union[Record, List[Record]]): A list or single :py:class:`.Record` object depending
@@ -288,17 +465,18 @@ class Endpoint:
             http_session=self.api.http_session,
             api_version=api_version,
             filters=self.api.default_filters,
+            deadline=make_deadline(deadline),
         ).post(args[0] if args else kwargs)
 
         return response_loader(req, self.return_obj, self)
 
     @overload
-    def update(self, id: str, data: dict) -> bool: ...
+    def update(self, id: str, data: dict, deadline: float = None) -> bool: ...
 
     @overload
-    def update(self, id: list[Union[Record, dict]]) -> list[Record]: ...
+    def update(self, id: list[Union[Record, dict]], deadline: float = None) -> list[Record]: ...
 
-    def update(self, id, data=None):
+    def update(self, id, data=None, deadline=None):
         """Update a single resource with a dictionary or bulk update a list of objects.
 
         Allows for bulk updating of existing objects on an endpoint.
@@ -312,6 +490,7 @@ class Endpoint:
                 of JSON/dicts or Record objects containing updates to apply.
             data (dict): Key/value pairs to update the record object with, ignored
                 in the case of a list to id.
+            deadline (float, optional): Seconds within which the request must complete.
 
         Returns:
             (Union[bool, List[Record]]): A list of :py:class:`.Record` objects
@@ -348,7 +527,7 @@ class Endpoint:
             [Device1-test, Device2-test, Device3-test]
         """
         if isinstance(id, list):
-            return self.bulk_update(id)
+            return self.bulk_update(id, deadline=deadline)
 
         if data is None or not id:
             raise ValueError("You must provide either a UUID and data dict or a list of objects to update")
@@ -359,12 +538,13 @@ class Endpoint:
             token=self.api.token,
             http_session=self.api.http_session,
             api_version=self.api.api_version,
+            deadline=make_deadline(deadline),
         )
         if req.patch(data):
             return True
         return False
 
-    def bulk_update(self, objects: List[Dict[str, Any]]):
+    def bulk_update(self, objects: List[Dict[str, Any]], deadline: float = None):
         """This method is called from the update() method if a bulk update is detected.
 
         Allows for bulk updating of existing objects on an endpoint.
@@ -375,6 +555,7 @@ class Endpoint:
 
         Args:
             objects (list): A list of dicts or a list of Record.
+            deadline (float, optional): Seconds within which the request must complete.
         """
         if not isinstance(objects, list):
             raise ValueError("objects must be a list[dict()|Record] not " + str(type(objects)))
@@ -402,10 +583,11 @@ class Endpoint:
             http_session=self.api.http_session,
             api_version=self.api.api_version,
             filters=self.api.default_filters,
+            deadline=make_deadline(deadline),
         ).patch(bulk_data)
         return response_loader(req, self.return_obj, self)
 
-    def delete(self, objects):
+    def delete(self, objects, deadline=None):
         """Bulk deletes objects on an endpoint.
 
         Allows for batch deletion of multiple objects from
@@ -413,6 +595,7 @@ class Endpoint:
 
         Args:
             objects (list): A list of either IDs or Records to delete.
+            deadline (float, optional): Seconds within which the request must complete.
 
         Returns:
             (bool): True if bulk DELETE operation was successful.
@@ -456,6 +639,7 @@ class Endpoint:
             token=self.token,
             http_session=self.api.http_session,
             api_version=self.api.api_version,
+            deadline=make_deadline(deadline),
         )
 
         return req.delete(data=[{"id": id} for id in ids])
@@ -467,7 +651,9 @@ class Endpoint:
         ``_choices`` attribute) so that later calls will return the same data
         without recurring requests to Nautobot. When using ``.choices()`` in
         long-running applications, consider restarting them whenever Nautobot is
-        upgraded, to prevent using stale choices data.
+        upgraded, to prevent using stale choices data. With the
+        ``metadata_cache`` of the `Api`, choices are shared by every endpoint
+        object of the server, and can be kept on disk.
 
         Args:
             api_version (str, optional): Override default or globally-set
@@ -497,36 +683,21 @@ class Endpoint:
 
         api_version = api_version or self.api.api_version
 
-        req = Request(
-            base=self.url,
-            token=self.api.token,
-            http_session=self.api.http_session,
-            api_version=api_version,
-        ).options()
-        if req.get("schema", {}).get("properties") is not None:
-            # Nautobot 2.3 and below
-            post_data = req["schema"]["properties"]
-            self._choices = {
-                prop: [
-                    {"value": x, "display": y} for x, y in zip(post_data[prop]["enum"], post_data[prop]["enumNames"])
-                ]
-                for prop in post_data
-                if "enum" in post_data[prop]
-            }
-        elif req.get("actions", {}).get("POST") is not None:
-            # Nautobot 2.4+
-            post_data = req["actions"]["POST"]
-            self._choices = {}
-            for prop in post_data:
-                if "choices" in post_data[prop]:
-                    self._choices[prop] = post_data[prop]["choices"]
-                elif post_data[prop]["type"] == "list" and "choices" in post_data[prop].get("child", {}):
-                    self._choices[prop] = post_data[prop]["child"]["choices"]
-        else:
-            raise ValueError(f"Unexpected format in the OPTIONS response at {self.url}")
+        def fetch():
+            return parse_choices(
+                self.url,
+                Request(
+                    base=self.url,
+                    token=self.api.token,
+                    http_session=self.api.http_session,
+                    api_version=api_version,
+                ).options(),
+            )
+
+        self._choices = cached(self.api, f"choices {self.url} {api_version}", fetch)
         return self._choices
 
-    def count(self, *args, api_version=None, **kwargs):
+    def count(self, *args, api_version=None, deadline=None, **kwargs):
         """Returns the count of objects in a query.
 
         Takes named arguments that match the usable filters on a
@@ -542,6 +713,7 @@ class Endpoint:
                 endpoint accepts can be added as a keyword arg.
             api_version (str, optional): Override default or globally-set
                 Nautobot REST API version for this single request.
+            deadline (float, optional): Seconds within which the count must complete.
 
         Returns:
             (int): Integer with count of objects returned by query.
@@ -564,7 +736,14 @@ class Endpoint:
         api_version = api_version or self.api.api_version
 
         ret = Request(
-            filters=kwargs, base=self.url, token=self.token, http_session=self.api.http_session, api_version=api_version
+            filters=kwargs,
+            base=self.url,
+            token=self.token,
+            http_session=self.api.http_session,
+            threading=self.api.threading,
+            max_workers=self.api.pool_size,
+            api_version=api_version,
+            deadline=make_deadline(deadline),
         )
 
         return ret.get_count()
@@ -0,0 +1,70 @@
+"""Runs several queries across apps and endpoints concurrently."""
+
+import concurrent.futures as cf
+import time
+
+from pynautobot.core.endpoint import response_loader
+from pynautobot.core.tracing import propagate
+from pynautobot.core.util import endpoint_from_path
+
+
+# pylint: disable=too-few-public-methods
+class FetchResult:
+    """The outcome of a single query run by `Api.fetch_many()`.
+
+    Attributes:
+        name (str): The name the query was given.
+        records (list): The :py:class:`.Record` objects returned by the query.
+        elapsed (float): Wall-clock seconds spent running the query.
+    """
+
+    def __init__(self, name, records, elapsed):
+        """Initialize the FetchResult object."""
+        self.name = name
+        self.records = records
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        """Return the representation of the FetchResult object."""
+        return f"FetchResult(name={self.name!r}, records={len(self.records)}, elapsed={self.elapsed:.3f})"
+
+
+def _normalize_query(api, query):
+    endpoint, filters = query if isinstance(query, tuple) else (query, None)
+    if isinstance(endpoint, str):
+        endpoint = endpoint_from_path(api, endpoint)
+    return endpoint, dict(filters or {})
+
+
+def fetch_many(api, queries, max_workers=None, per_query_workers=None, stream=False):
+    """Runs several ``filter()`` queries concurrently under one concurrency budget.
+
+    See `Api.fetch_many()` for details.
+    """
+    budget = max_workers or api.max_workers
+    prepared = {name: _normalize_query(api, query) for name, query in queries.items()}
+    per_query = min(per_query_workers or max(1, budget // max(1, len(prepared))), budget)
+    concurrent_queries = max(1, budget // per_query)
+
+    def run(name, endpoint, filters):
+        start = time.monotonic()
+        req = endpoint._filter_request(**filters)  # pylint: disable=protected-access
+        req.threading = per_query > 1
+        req.max_workers = per_query
+        records = response_loader(req.get(), endpoint.return_obj, endpoint)
+        return FetchResult(name, records, time.monotonic() - start)
+
+    def results():
+        with cf.ThreadPoolExecutor(max_workers=concurrent_queries) as pool:
+            futures = [pool.submit(propagate(run), name, *query) for name, query in prepared.items()]
+            try:
+                for future in cf.as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    if stream:
+        return results()
+    completed = {result.name: result for result in results()}
+    return {name: completed[name] for name in prepared}
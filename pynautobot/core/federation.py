@@ -0,0 +1,183 @@
+"""Runs the same query against several Nautobot instances."""
+
+import concurrent.futures as cf
+import time
+
+from pynautobot.core.query import DeadlineExceeded
+from pynautobot.core.tracing import propagate
+from pynautobot.core.util import endpoint_from_path
+
+
+# pylint: disable=too-few-public-methods
+class InstanceResult:
+    """The outcome of a query on one instance of a `Federation`.
+
+    Attributes:
+        source (str): The name of the instance.
+        value: What the query returned, or None if it failed.
+        elapsed (float): Wall-clock seconds spent on the query.
+        error (Exception): Why the query failed, or None.
+    """
+
+    def __init__(self, source, value=None, elapsed=0.0, error=None):
+        """Initialize the InstanceResult object."""
+        self.source = source
+        self.value = value
+        self.elapsed = elapsed
+        self.error = error
+
+    def __repr__(self):
+        """Return the representation of the InstanceResult object."""
+        outcome = f"error={self.error!r}" if self.error else "ok"
+        return f"InstanceResult(source={self.source!r}, {outcome}, elapsed={self.elapsed:.3f})"
+
+
+class Federation:
+    """Queries several Nautobot instances concurrently and merges the results.
+
+    Every query runs against all instances at once. An instance that fails or
+    doesn't answer within ``deadline`` is left out of the results, and the
+    reason is kept in `errors`, so one slow or unreachable region doesn't
+    block the others.
+
+    Args:
+        apis (dict): `Api` objects keyed by instance name.
+        deadline (float, optional): Seconds each instance has to answer a query.
+            Defaults to `None` (no limit).
+        max_workers (int, optional): Number of instances queried at once.
+            Defaults to all of them.
+
+    Attributes:
+        errors (dict): Exceptions raised by the instances that failed the last
+            query, keyed by instance name.
+
+    Examples:
+        >>> from pynautobot.core.federation import Federation
+        >>> regions = Federation({"us": nb_us, "eu": nb_eu, "apac": nb_apac}, deadline=60)
+        >>> for source, device in regions.filter("dcim.devices", platform="cisco_ios"):
+        ...     print(source, device.name)
+        us us-edge-01
+        eu eu-edge-01
+        >>> regions.count("dcim.devices", platform="cisco_ios")
+        {'us': 120, 'eu': 95}
+        >>> regions.errors
+        {'apac': DeadlineExceeded('Instance apac did not answer within 60 seconds')}
+    """
+
+    def __init__(self, apis, deadline=None, max_workers=None):
+        """Initialize the Federation object."""
+        self.apis = dict(apis)
+        self.deadline = deadline
+        self.max_workers = max_workers or max(1, len(self.apis))
+        self.errors = {}
+
+    def run(self, func):
+        """Calls ``func(api)`` for every instance concurrently.
+
+        The ``deadline`` of each instance runs from the moment its query
+        starts, so instances waiting for a free worker keep their full budget.
+
+        Args:
+            func (callable): Runs the query on the `Api` it is given. It should
+                pass `deadline` on to the query so that it stops by itself.
+
+        Yields:
+            (InstanceResult): One result per instance, in order of completion.
+                Instances still running when their deadline passes are reported
+                with a `DeadlineExceeded` error.
+        """
+        self.errors = {}
+        started = {}
+
+        def timed(name, api):
+            started[name] = time.monotonic()
+            value = func(api)
+            return value, time.monotonic() - started[name]
+
+        pool = cf.ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {pool.submit(propagate(timed), name, api): name for name, api in self.apis.items()}
+        try:
+            pending = set(futures)
+            while pending:
+                done, _ = cf.wait(
+                    pending, timeout=self._next_expiry(started, pending, futures), return_when="FIRST_COMPLETED"
+                )
+                for future in done:
+                    pending.discard(future)
+                    yield self._result(futures[future], future, started)
+                now = time.monotonic()
+                for future in [f for f in pending if self._expired(started.get(futures[f]), now)]:
+                    pending.discard(future)
+                    name = futures[future]
+                    error = DeadlineExceeded(f"Instance {name} did not answer within {self.deadline} seconds")
+                    self.errors[name] = error
+                    yield InstanceResult(name, elapsed=now - started[name], error=error)
+        finally:
+            # Queries past their deadline are left to stop at their own deadline.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _expired(self, start, now):
+        return self.deadline is not None and start is not None and now - start >= self.deadline
+
+    def _next_expiry(self, started, pending, futures):
+        """Returns the seconds until the next running query passes its deadline, or None."""
+        if self.deadline is None:
+            return None
+        starts = [started[futures[f]] for f in pending if futures[f] in started]
+        if not starts:
+            # Check again shortly, once the queued queries have started.
+            return min(self.deadline, 0.05)
+        return max(0.0, min(starts) + self.deadline - time.monotonic())
+
+    def _result(self, source, future, started):
+        try:
+            value, elapsed = future.result()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            self.errors[source] = error
+            return InstanceResult(source, elapsed=time.monotonic() - started.get(source, time.monotonic()), error=error)
+        return InstanceResult(source, value=value, elapsed=elapsed)
+
+    def filter(self, endpoint, *args, **kwargs):
+        """Runs ``filter()`` on every instance and streams the merged records.
+
+        Args:
+            endpoint (str): Dotted path of the endpoint, e.g. ``"dcim.devices"``.
+            *args (str, optional): Freeform search string.
+            **kwargs (str, optional): Filters, as accepted by `Endpoint.filter()`.
+
+        Yields:
+            (tuple): ``(source, record)`` pairs, one instance at a time as each
+                instance completes.
+        """
+        kwargs.setdefault("deadline", self.deadline)
+        for result in self.run(lambda api: endpoint_from_path(api, endpoint).filter(*args, **kwargs)):
+            for record in result.value or []:
+                yield result.source, record
+
+    def count(self, endpoint, *args, **kwargs):
+        """Runs ``count()`` on every instance.
+
+        Args:
+            endpoint (str): Dotted path of the endpoint, e.g. ``"dcim.devices"``.
+            *args (str, optional): Freeform search string.
+            **kwargs (str, optional): Filters, as accepted by `Endpoint.count()`.
+
+        Returns:
+            (dict): The count of each instance that answered, keyed by instance name.
+        """
+        kwargs.setdefault("deadline", self.deadline)
+        results = self.run(lambda api: endpoint_from_path(api, endpoint).count(*args, **kwargs))
+        return {result.source: result.value for result in results if result.error is None}
+
+    def graphql(self, query, variables=None):
+        """Runs a GraphQL query on every instance.
+
+        Args:
+            query (str): The GraphQL query.
+            variables (dict, optional): Variables for the query.
+
+        Returns:
+            (dict): The `GraphQLRecord` of each instance that answered, keyed by instance name.
+        """
+        results = self.run(lambda api: api.graphql.query(query=query, variables=variables, deadline=self.deadline))
+        return {result.source: result.value for result in results if result.error is None}
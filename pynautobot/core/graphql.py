@@ -1,7 +1,11 @@
 """GraphQL endpoint for making queries to the Nautobot GraphQL endpoint."""
 
+import time
 from typing import Any, Dict, Optional
 
+from pynautobot.core.query import make_deadline
+from pynautobot.core.session import Session, cap_timeout
+
 
 class GraphQLException(Exception):
     """GraphQL Exception class for handling errors from the GraphQL endpoint."""
@@ -60,12 +64,16 @@ class GraphQLQuery:
         # Add on top of the base_url the endpoint /graphql/ which will be the url used
         self.url = f"{self.api.base_url}/graphql/"
 
-    def query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> GraphQLRecord:
+    def query(
+        self, query: str, variables: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None
+    ) -> GraphQLRecord:
         """Runs query against Nautobot Graphql endpoint.
 
         Args:
             query (str): Query string to send to the API
             variables (dict): Dictionary of variables to use with the query string, defaults to None
+            deadline (float): Seconds within which the query, retries included, must complete,
+                defaults to None
 
         Raises:
             GraphQLException:
@@ -133,7 +141,16 @@ class GraphQLQuery:
 
         payload = {"query": query, "variables": variables}
 
-        response = self.api.http_session.post(self.url, json=payload, headers=self.api.headers)
+        kwargs = {}
+        if deadline is not None:
+            deadline = make_deadline(deadline)
+            kwargs["timeout"] = cap_timeout(
+                getattr(self.api.http_session, "timeout", None), deadline - time.monotonic()
+            )
+            if isinstance(self.api.http_session, Session):
+                kwargs["deadline"] = deadline
+
+        response = self.api.http_session.post(self.url, json=payload, headers=self.api.headers, **kwargs)
 
         # Don't create an object with an error, raise an exception
         try:
@@ -0,0 +1,166 @@
+"""Hedged GET requests to cut tail latency."""
+
+import collections
+import concurrent.futures as cf
+import threading
+
+from pynautobot.core.tracing import propagate
+
+# Only requests that can safely be sent twice are hedged.
+HEDGED_METHODS = ("GET", "HEAD")
+
+
+# pylint: disable=too-many-instance-attributes
+class HedgingPolicy:
+    """Sends a duplicate of slow GET requests and uses whichever response arrives first.
+
+    Once ``min_samples`` latencies have been observed, a GET that hasn't been
+    answered after the ``quantile`` latency (the p95 by default) is sent again.
+    The first successful response wins and the other one is discarded. At most
+    ``max_extra`` extra requests are sent per request, so a struggling server
+    sees at most ``1 + max_extra`` times the load.
+
+    Args:
+        quantile (float, optional): Latency quantile after which a request is hedged.
+        max_extra (float, optional): Maximum ratio of hedge requests to requests.
+        min_samples (int, optional): Latencies observed before hedging starts.
+        window (int, optional): Number of recent latencies the quantile is computed over.
+        max_workers (int, optional): Threads used to send hedged requests.
+
+    Examples:
+        >>> nb = pynautobot.api(url, token=token, hedging=True)
+        >>> nb.dcim.devices.get(name="hq-access-01")
+        >>> nb.hedging.stats()
+        {'requests': 1200, 'hedged': 58, 'hedge_wins': 41, 'delay': 0.42}
+    """
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(self, quantile=0.95, max_extra=0.05, min_samples=20, window=1000, max_workers=32):
+        """Initialize the HedgingPolicy object."""
+        if not 0 < quantile < 1:
+            raise ValueError("quantile must be between 0 and 1")
+        self.quantile = quantile
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def stats(self):
+        """Returns the hedging counters.
+
+        Returns:
+            (dict): Number of hedgeable requests, of hedges sent and of hedges
+                that answered first, and the current hedging delay in seconds.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "delay": self._delay(),
+            }
+
+    def observe(self, latency):
+        """Records the latency of a successful request."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _delay(self):
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.quantile))]
+
+    def _start(self):
+        """Counts a request and returns the hedging delay, or None if it can't be hedged."""
+        with self._lock:
+            self.requests += 1
+            delay = self._delay()
+            if delay is None or self.hedged + 1 > self.requests * self.max_extra:
+                return None
+            if self._pool is None:
+                self._pool = cf.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pynautobot-hedge")
+            return delay
+
+    def _take_hedge(self):
+        with self._lock:
+            if self.hedged + 1 > self.requests * self.max_extra:
+                return False
+            self.hedged += 1
+            return True
+
+    def send(self, send, *args, **kwargs):
+        """Calls ``send(*args, **kwargs)``, hedging it if it is slow.
+
+        Requests that can't be hedged (before ``min_samples`` latencies are
+        known, or with the hedge budget used up) are sent on the calling
+        thread. Otherwise the request is sent from the pool and the hedging
+        delay runs from the moment it starts, so time spent queued behind a
+        busy pool doesn't cause hedges; if it doesn't even start within the
+        delay, no hedge is sent.
+
+        Args:
+            send (callable): Sends the request and returns a `requests.Response`.
+            *args (list): Positional arguments for ``send``.
+            **kwargs (dict): Keyword arguments for ``send``.
+
+        Returns:
+            (requests.Response): The first successful response.
+        """
+        delay = self._start()
+        if delay is None:
+            return send(*args, **kwargs)
+
+        started = threading.Event()
+
+        def send_started():
+            started.set()
+            return send(*args, **kwargs)
+
+        primary = self._pool.submit(propagate(send_started))
+        if not started.wait(timeout=delay):
+            return primary.result()
+        try:
+            return primary.result(timeout=delay)
+        except cf.TimeoutError:
+            pass
+        if not self._take_hedge():
+            return primary.result()
+
+        hedge = self._pool.submit(propagate(send), *args, **kwargs)
+        futures = [primary, hedge]
+        error = None
+        for future in cf.as_completed(futures):
+            if future.exception() is None:
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                for other in futures:
+                    if other is not future:
+                        other.add_done_callback(_close_response)
+                return future.result()
+            error = error or future.exception()
+        raise error
+
+    def __getstate__(self):
+        """Return the picklable state of the HedgingPolicy object."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_pool"] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore the HedgingPolicy object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def _close_response(future):
+    """Releases the connection of a response that lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
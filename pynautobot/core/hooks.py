@@ -0,0 +1,277 @@
+"""Hooks to observe the requests an `Api` sends, and collectors of their metrics."""
+
+import bisect
+import logging
+import re
+import threading
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+HOOK_EVENTS = ("before_request", "after_response", "on_retry", "on_page")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$", re.IGNORECASE)
+
+
+def url_template(url):
+    """Returns the path of ``url`` with object IDs replaced by ``{id}``.
+
+    Examples:
+        >>> url_template("http://nautobot/api/dcim/devices/5b39ba88-e5ab-4be2-89f5-5a016473b53c/?depth=1")
+        '/api/dcim/devices/{id}/'
+    """
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in urlsplit(url).path.split("/"))
+
+
+def endpoint_name(url):
+    """Returns the dotted path of the endpoint ``url`` belongs to, such as ``"dcim.devices"``.
+
+    Examples:
+        >>> endpoint_name("http://nautobot/api/dcim/devices/5b39ba88-e5ab-4be2-89f5-5a016473b53c/")
+        'dcim.devices'
+    """
+    segments = urlsplit(url).path.split("/api/", 1)[-1].strip("/").split("/")
+    names = []
+    for segment in segments:
+        if _ID_SEGMENT.match(segment):
+            break
+        names.append(segment.replace("-", "_"))
+    return ".".join(names)
+
+
+# pylint: disable=too-few-public-methods, too-many-instance-attributes
+class RequestEvent:
+    """What is known about a request when a hook is called.
+
+    Attributes:
+        event (str): The hook being called, one of `HOOK_EVENTS`.
+        method (str): HTTP method of the request.
+        url (str): URL of the request, including its query string.
+        url_template (str): Path of the URL with object IDs replaced by ``{id}``.
+        endpoint (str): Dotted path of the endpoint, such as ``"dcim.devices"``.
+        status (int): HTTP status code, or None before the response or when
+            the request failed.
+        bytes_out (int): Size of the request body.
+        bytes_in (int): Size of the response body, or None before the response.
+        latency (float): Seconds until the response, or None before it.
+        page (int): Index of the page in the order pages arrived, for `on_page`.
+        attempt (int): Number of the failed attempt, from 0, for `on_retry`.
+        delay (float): Seconds to wait before retrying, for `on_retry`.
+        error (Exception): The exception raised by the request, if any.
+    """
+
+    def __init__(self, method, url, bytes_out=0):
+        """Initialize the RequestEvent object."""
+        self.event = None
+        self.method = method.upper()
+        self.url = url
+        self.url_template = url_template(url)
+        self.endpoint = endpoint_name(url)
+        self.status = None
+        self.bytes_out = bytes_out
+        self.bytes_in = None
+        self.latency = None
+        self.page = None
+        self.attempt = None
+        self.delay = None
+        self.error = None
+
+    def __repr__(self):
+        """Return the representation of the RequestEvent object."""
+        return f"RequestEvent({self.event}, {self.method} {self.url_template}, status={self.status})"
+
+
+class Hooks:
+    """Calls the functions registered for the events of the requests of an `Api`.
+
+    Handlers are called with a `RequestEvent`, from the thread sending the
+    request. An exception raised by a handler is logged, not raised. With no
+    handler registered, which is the default, requests skip the hooks.
+
+    ``before_request`` and ``after_response`` are called for every request
+    sent on the wire, including retries, hedges and redirects; ``after_response``
+    is also called with the `error` of a request that failed. ``on_retry`` is
+    called before waiting to retry a failed attempt, and ``on_page`` for every
+    page of results of a query.
+
+    Examples:
+        >>> nb = pynautobot.api(url, token=token)
+        >>> nb.hooks.register("after_response", lambda event: print(event.endpoint, event.latency))
+        >>> metrics = nb.hooks.attach(MetricsCollector())
+        >>> nb.dcim.devices.all()
+        >>> metrics.stats()["GET dcim.devices"]["requests"]
+        1
+    """
+
+    def __init__(self):
+        """Initialize the Hooks object."""
+        self._handlers = {event: () for event in HOOK_EVENTS}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the picklable state of the Hooks object."""
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        """Restore the Hooks object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        """Whether any handler is registered."""
+        return any(self._handlers.values())
+
+    def register(self, event, handler):
+        """Calls ``handler`` with a `RequestEvent` for every ``event``.
+
+        Args:
+            event (str): One of `HOOK_EVENTS`.
+            handler (callable): Called with the `RequestEvent`.
+
+        Returns:
+            (callable): The handler.
+
+        Raises:
+            ValueError: If ``event`` is unknown.
+        """
+        if event not in HOOK_EVENTS:
+            raise ValueError(f"event must be one of {HOOK_EVENTS}")
+        with self._lock:
+            # Handlers are replaced rather than appended to, so emit() never needs the lock.
+            self._handlers = {**self._handlers, event: (*self._handlers[event], handler)}
+        return handler
+
+    def unregister(self, event, handler):
+        """Stops calling ``handler`` for ``event``."""
+        with self._lock:
+            self._handlers = {**self._handlers, event: tuple(h for h in self._handlers[event] if h != handler)}
+
+    def attach(self, collector):
+        """Registers the methods of ``collector`` named after an event.
+
+        Args:
+            collector (object): An object such as a `MetricsCollector`.
+
+        Returns:
+            (object): The collector.
+        """
+        for event in HOOK_EVENTS:
+            handler = getattr(collector, event, None)
+            if callable(handler):
+                self.register(event, handler)
+        return collector
+
+    def detach(self, collector):
+        """Unregisters the methods of ``collector`` registered by `attach`."""
+        for event in HOOK_EVENTS:
+            handler = getattr(collector, event, None)
+            if handler is not None:
+                self.unregister(event, handler)
+
+    def emit(self, event, request_event):
+        """Calls the handlers of ``event`` with ``request_event``."""
+        request_event.event = event
+        for handler in self._handlers[event]:
+            try:
+                handler(request_event)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Hook %r failed on %s", handler, event)
+
+
+class MetricsCollector:
+    """Counts requests and keeps latency histograms per method and endpoint.
+
+    Attach it to `Api.hooks`. Keys are the method and the dotted endpoint path,
+    such as ``"GET dcim.devices"``.
+
+    Args:
+        buckets (tuple, optional): Upper bounds in seconds of the latency
+            histogram buckets. Defaults to `LATENCY_BUCKETS`.
+
+    Examples:
+        >>> metrics = nb.hooks.attach(MetricsCollector())
+        >>> nb.dcim.devices.all()
+        >>> metrics.stats()
+        {'GET dcim.devices': {'requests': 3, 'errors': 0, 'retries': 0, 'pages': 3, ...}}
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """Initialize the MetricsCollector object."""
+        self.buckets = tuple(sorted(buckets))
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the picklable state of the MetricsCollector object."""
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        """Restore the MetricsCollector object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _metric(self, event):
+        """Returns the metrics of the method and endpoint of ``event``. Must be called with the lock held."""
+        key = f"{event.method} {event.endpoint}"
+        if key not in self._metrics:
+            self._metrics[key] = {
+                "requests": 0,
+                "errors": 0,
+                "retries": 0,
+                "pages": 0,
+                "bytes_in": 0,
+                "bytes_out": 0,
+                "latency": {"count": 0, "sum": 0.0, "buckets": [0] * (len(self.buckets) + 1)},
+            }
+        return self._metrics[key]
+
+    def after_response(self, event):
+        """Counts a response and adds its latency to the histogram."""
+        with self._lock:
+            metric = self._metric(event)
+            metric["requests"] += 1
+            if event.error is not None or event.status >= 400:
+                metric["errors"] += 1
+            metric["bytes_in"] += event.bytes_in or 0
+            metric["bytes_out"] += event.bytes_out or 0
+            latency = metric["latency"]
+            latency["count"] += 1
+            latency["sum"] += event.latency
+            latency["buckets"][bisect.bisect_left(self.buckets, event.latency)] += 1
+
+    def on_retry(self, event):
+        """Counts a retry."""
+        with self._lock:
+            self._metric(event)["retries"] += 1
+
+    def on_page(self, event):
+        """Counts a page of results."""
+        with self._lock:
+            self._metric(event)["pages"] += 1
+
+    def reset(self):
+        """Drops every metric."""
+        with self._lock:
+            self._metrics.clear()
+
+    def stats(self):
+        """Returns a snapshot of the metrics.
+
+        Returns:
+            (dict): Counters and latency histogram keyed by method and endpoint.
+                Histogram buckets map their upper bound in seconds (``"+Inf"``
+                for the last one) to the number of responses, not cumulative.
+        """
+        with self._lock:
+            return {
+                key: {
+                    **metric,
+                    "latency": {
+                        "count": metric["latency"]["count"],
+                        "sum": metric["latency"]["sum"],
+                        "buckets": dict(zip((*self.buckets, "+Inf"), metric["latency"]["buckets"])),
+                    },
+                }
+                for key, metric in self._metrics.items()
+            }
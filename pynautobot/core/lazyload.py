@@ -0,0 +1,242 @@
+"""Policies for the requests `Record` objects send to load attributes they don't have."""
+
+import contextlib
+import contextvars
+import logging
+import threading
+
+from pynautobot.core.hooks import endpoint_name
+from pynautobot.core.query import Request
+from pynautobot.core.util import call_site, walk_records
+
+logger = logging.getLogger(__name__)
+
+LAZY_LOAD_MODES = ("allow", "warn", "raise", "batch")
+
+_TRACKED = contextvars.ContextVar("pynautobot_lazy_load_stats", default=())
+
+
+class LazyLoadError(AttributeError):
+    """Lazy Load Exception.
+
+    Raised with the ``"raise"`` lazy-load policy when reading an attribute
+    of a `Record` would send a request to load it. It is an `AttributeError`,
+    so `hasattr()` and `getattr()` with a default don't raise it.
+
+    Examples:
+        >>> nb = pynautobot.api(url, token=token, lazy_loads="raise")
+        >>> interface = nb.dcim.interfaces.get(name="eth0", device="sw1")
+        >>> interface.device.serial
+        pynautobot.core.lazyload.LazyLoadError: Reading "serial" of a dcim.devices record would send a request
+    """
+
+
+class LazyLoadStats:
+    """Counts the lazy loads of a block of code.
+
+    Attributes:
+        requests (int): Number of requests sent to load attributes.
+        loads (dict): Number of loads keyed by endpoint and attribute, such
+            as ``"dcim.devices.serial"``.
+        batched (int): Number of records loaded by the requests of the
+            ``"batch"`` policy.
+    """
+
+    def __init__(self):
+        """Initialize the LazyLoadStats object."""
+        self.requests = 0
+        self.loads = {}
+        self.batched = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the picklable state of the LazyLoadStats object."""
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        """Restore the LazyLoadStats object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Return the representation of the LazyLoadStats object."""
+        return f"LazyLoadStats(requests={self.requests}, loads={self.loads}, batched={self.batched})"
+
+    def add(self, key, requests=1, batched=0):
+        """Counts a load of ``key``."""
+        with self._lock:
+            self.requests += requests
+            self.loads[key] = self.loads.get(key, 0) + 1
+            self.batched += batched
+
+
+class QueryRecords:
+    """The records returned by one query, including their nested records.
+
+    The ``"warn"`` policy counts lazy loads per query, and the ``"batch"``
+    policy loads the records of the query that share an endpoint together.
+    """
+
+    def __init__(self):
+        """Initialize the QueryRecords object."""
+        self.records = {}
+        self.loads = {}
+        self.warned = set()
+
+    def add(self, record):
+        """Adds ``record`` and its nested records, recursively."""
+        for _, current in walk_records(record):
+            if current.__dict__.get("_query") is self:
+                continue
+            current._query = self  # pylint: disable=protected-access
+            if current.__dict__.get("url"):
+                self.records.setdefault(current.endpoint.url, []).append(current)
+
+    def count(self, key):
+        """Counts a lazy load of ``key`` and returns the number of loads of it so far."""
+        self.loads[key] = self.loads.get(key, 0) + 1
+        return self.loads[key]
+
+
+class LazyLoadPolicy:
+    """Decides what happens when a `Record` is asked for an attribute it doesn't have.
+
+    Reading such an attribute sends a request for the full details of the
+    record. In a loop over the results of a query, this sends one request
+    per record: the N+1 query problem.
+
+    * ``"allow"``: load the record, as pynautobot always did.
+    * ``"warn"``: load the record, and log a warning with the endpoint,
+      attribute and call site once the records of one query were loaded
+      ``threshold`` times for the same attribute.
+    * ``"raise"``: raise `LazyLoadError` instead of sending the request.
+    * ``"batch"``: load every record of the same query and endpoint that
+      doesn't have its details yet, with one ``filter(id=[...])`` query.
+
+    Loads are counted with every mode, see `stats` and `track`.
+
+    Args:
+        mode (str, optional): One of `LAZY_LOAD_MODES`. Defaults to ``"allow"``.
+        threshold (int, optional): Number of loads per query and attribute
+            after which ``"warn"`` logs a warning. Defaults to 10.
+
+    Examples:
+        >>> nb = pynautobot.api(url, token=token, lazy_loads="batch")
+        >>> with nb.lazy_loads.track() as stats:
+        ...     serials = [interface.device.serial for interface in nb.dcim.interfaces.all()]
+        >>> stats.requests
+        1
+    """
+
+    def __init__(self, mode="allow", threshold=10):
+        """Initialize the LazyLoadPolicy object."""
+        if mode not in LAZY_LOAD_MODES:
+            raise ValueError(f"lazy_loads must be one of {LAZY_LOAD_MODES}")
+        self.mode = mode
+        self.threshold = threshold
+        self.stats = LazyLoadStats()
+
+    def __repr__(self):
+        """Return the representation of the LazyLoadPolicy object."""
+        return f"<{self.__class__.__module__}.{self.__class__.__name__} ({self.mode}) at {hex(id(self))}>"
+
+    def group(self, records):
+        """Groups the records returned by one query, if the mode needs it.
+
+        Args:
+            records (Union[Record, list]): The records returned by the query.
+        """
+        if self.mode not in ("warn", "batch"):
+            return
+        query = QueryRecords()
+        for record in records if isinstance(records, list) else [records]:
+            query.add(record)
+
+    @contextlib.contextmanager
+    def track(self):
+        """Counts the lazy loads of the block, from any thread running in its context.
+
+        Yields:
+            (LazyLoadStats): The loads of the block so far.
+        """
+        stats = LazyLoadStats()
+        token = _TRACKED.set((*_TRACKED.get(), stats))
+        try:
+            yield stats
+        finally:
+            _TRACKED.reset(token)
+
+    def _count(self, key, requests=1, batched=0):
+        for stats in (self.stats, *_TRACKED.get()):
+            stats.add(key, requests=requests, batched=batched)
+
+    def load(self, record, attribute):
+        """Loads the full details of ``record``, which was asked for ``attribute``.
+
+        Args:
+            record (Record): The record missing ``attribute``.
+            attribute (str): The attribute being read.
+
+        Returns:
+            (bool): Whether the record was loaded.
+
+        Raises:
+            LazyLoadError: With the ``"raise"`` mode.
+        """
+        endpoint = endpoint_name(record.endpoint.url)
+        key = f"{endpoint}.{attribute}"
+        if self.mode == "raise":
+            raise LazyLoadError(
+                f'Reading "{attribute}" of a {endpoint} record would send a request (lazy_loads="raise"). '
+                "Request it with the query, e.g. with depth or include, or call full_details()."
+            )
+        query = record.__dict__.get("_query")
+        if self.mode == "batch" and query is not None:
+            loaded = self._load_batch(record, query)
+            if loaded:
+                self._count(key, batched=loaded)
+                return True
+        if self.mode == "warn" and query is not None:
+            count = query.count(key)
+            if count >= self.threshold and key not in query.warned:
+                query.warned.add(key)
+                logger.warning(
+                    "Reading %r of %s records sent %s requests for records of the same query, at %s. "
+                    "Request it with the query, e.g. with depth or include, or use lazy_loads='batch'.",
+                    attribute,
+                    endpoint,
+                    count,
+                    call_site(),
+                )
+        self._count(key)
+        return record.full_details()
+
+    def _load_batch(self, record, query):
+        """Loads the records of ``query`` sharing the endpoint of ``record`` with one query.
+
+        Returns:
+            (int): Number of records loaded, 0 if ``record`` wasn't among them.
+        """
+        pending = {
+            str(other.id): other
+            for other in query.records.get(record.endpoint.url, [])
+            if not other.has_details and other.__dict__.get("id") is not None
+        }
+        if str(record.__dict__.get("id")) not in pending:
+            return 0
+        api = record.api
+        results = Request(
+            base=record.endpoint.url,
+            token=api.token,
+            http_session=api.http_session,
+            api_version=api.api_version,
+            filters={**api.default_filters, "id": list(pending)},
+            threading=api.threading,
+            max_workers=api.max_workers,
+        ).get()
+        for values in results:
+            other = pending.get(str(values.get("id")))
+            if other is not None:
+                other._parse_values(values)  # pylint: disable=protected-access
+                other.has_details = True
+        return len(results) if record.has_details else 0
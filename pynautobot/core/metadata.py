@@ -0,0 +1,167 @@
+"""Cache for the metadata of Nautobot servers, such as choices and the OpenAPI schema."""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(value):
+    """Returns a short, filename-safe digest of a JSON-serializable ``value``."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:32]
+
+
+class MetadataCache:
+    """Caches the metadata of Nautobot servers.
+
+    Choices, custom fields, endpoint listings and the OpenAPI schema only
+    change when Nautobot is upgraded or reconfigured. Once cached,
+    they are shared by every `App` and `Endpoint` of the `Api` objects using
+    the cache, instead of being requested again by each new object.
+
+    Entries are keyed by the server URL and its REST API version, which is
+    requested once per server and process, so an upgrade of Nautobot
+    invalidates them. Call `refresh` after other changes, such as a new
+    custom field or choice.
+
+    Args:
+        path (str, optional): Directory to also keep the entries in, so that
+            later processes start without requesting them again. It is created
+            if missing. Defaults to keeping them in memory only.
+
+    Examples:
+        >>> nb = pynautobot.api(url, token=token, metadata_cache="~/.cache/pynautobot")
+        >>> nb.dcim.devices.choices()  # Requested from Nautobot
+        >>> nb.dcim.devices.choices()  # Cached
+        >>> nb.metadata.refresh(nb)
+    """
+
+    def __init__(self, path=None):
+        """Initialize the MetadataCache object."""
+        self.path = os.path.expanduser(os.fspath(path)) if path is not None else None
+        self._entries = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the picklable state of the MetadataCache object."""
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        """Restore the MetadataCache object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _version(self, api):
+        """Returns the REST API version of the server of ``api``, requesting it once."""
+        with self._lock:
+            version = self._versions.get(api.base_url)
+        if version is None:
+            version = api.version
+            with self._lock:
+                self._versions[api.base_url] = version
+        return version
+
+    def _server_dir(self, server):
+        return os.path.join(self.path, _digest(server))
+
+    def _file(self, server, version, key):
+        return os.path.join(self._server_dir(server), f"{_digest([version, key])}.json")
+
+    def _load(self, filename):
+        """Returns the entry stored in ``filename``, or None if it is missing or unreadable."""
+        try:
+            with open(filename, encoding="utf-8") as entry_file:
+                return json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, filename, value):
+        """Writes ``value`` to ``filename`` atomically, logging rather than raising on failure."""
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=os.path.dirname(filename), suffix=".tmp", delete=False
+            ) as entry_file:
+                json.dump(value, entry_file)
+            os.replace(entry_file.name, filename)
+        except (OSError, TypeError, ValueError) as error:
+            logger.debug("Could not write the metadata cache entry %s: %s", filename, error)
+
+    def get(self, api, key, fetch):
+        """Returns the cached entry ``key`` of the server of ``api``.
+
+        Args:
+            api (Api): The `Api` of the server.
+            key (str): Name of the entry, unique for the server.
+            fetch (callable): Called without arguments to request the entry
+                from Nautobot on a cache miss.
+
+        Returns:
+            (Any): The cached or fetched entry.
+        """
+        version = self._version(api)
+        entry = (api.base_url, version, key)
+        with self._lock:
+            if entry in self._entries:
+                return self._entries[entry]
+        value = None
+        if self.path is not None:
+            value = self._load(self._file(*entry))
+        if value is None:
+            value = fetch()
+            if self.path is not None:
+                self._store(self._file(*entry), value)
+        with self._lock:
+            self._entries[entry] = value
+        return value
+
+    def refresh(self, api=None):
+        """Drops the cached entries, so that they are requested again.
+
+        The server versions are requested again as well.
+
+        Args:
+            api (Api, optional): Only drop the entries of the server of this
+                `Api`. Defaults to dropping every entry.
+        """
+        with self._lock:
+            if api is None:
+                self._entries.clear()
+                self._versions.clear()
+            else:
+                self._entries = {entry: value for entry, value in self._entries.items() if entry[0] != api.base_url}
+                self._versions.pop(api.base_url, None)
+        if self.path is None:
+            return
+        if api is not None:
+            shutil.rmtree(self._server_dir(api.base_url), ignore_errors=True)
+            return
+        # Only remove the server directories, the path may be shared with other files.
+        with contextlib.suppress(OSError), os.scandir(self.path) as entries:
+            for server_dir in entries:
+                if server_dir.is_dir() and len(server_dir.name) == 32:
+                    shutil.rmtree(server_dir.path, ignore_errors=True)
+
+
+def cached(api, key, fetch):
+    """Returns ``fetch()``, through the metadata cache of ``api`` when it has one.
+
+    Args:
+        api (Api): The `Api` the metadata belongs to.
+        key (str): Name of the entry, unique for the server.
+        fetch (callable): Called without arguments to request the entry.
+
+    Returns:
+        (Any): The cached or fetched entry.
+    """
+    cache = getattr(api, "metadata", None)
+    if isinstance(cache, MetadataCache):
+        return cache.get(api, key, fetch)
+    return fetch()
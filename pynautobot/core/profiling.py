@@ -0,0 +1,334 @@
+"""Profiling of response payloads against the fields of records that are read.
+
+A `PayloadProfiler` measures, per endpoint, how many bytes each top-level
+field of the responses takes, and counts which attributes of the resulting
+records are read. From both it recommends `exclude_m2m`, `depth` and
+`include` settings, with the bytes and time they would save.
+"""
+
+import json
+import threading
+
+from pynautobot.core.hooks import endpoint_name
+from pynautobot.core.util import walk_records
+
+BRIEF_FIELDS = frozenset(("id", "object_type", "url"))
+INCLUDE_FIELDS = ("computed_fields", "config_context", "relationships")
+
+# Attributes of records that aren't fields of the response.
+_INTERNAL_ATTRIBUTES = frozenset(("api", "endpoint", "default_ret", "has_details"))
+_PROFILED_CLASSES = {}
+
+
+def _size(value):
+    """Returns the size of ``value`` serialized as compact JSON, like Nautobot does."""
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+def _is_related(value):
+    return isinstance(value, dict) and "url" in value
+
+
+def _depth(value):
+    """Returns the depth of the related objects serialized in ``value``."""
+    if isinstance(value, list):
+        return max((_depth(item) for item in value), default=0)
+    if _is_related(value) and set(value) - BRIEF_FIELDS:
+        return 1 + max((_depth(item) for item in value.values()), default=0)
+    return 0
+
+
+def _trim(value, depth):
+    """Returns ``value`` as it would be serialized with ``depth``."""
+    if isinstance(value, list):
+        return [_trim(item, depth) for item in value]
+    if not _is_related(value):
+        return value
+    if depth <= 0:
+        return {key: item for key, item in value.items() if key in BRIEF_FIELDS}
+    return {key: _trim(item, depth - 1) for key, item in value.items()}
+
+
+def _measure(row, fields, depth_saved):
+    """Adds the size of each field of ``row``, and the bytes saved at each lower depth, to the tallies."""
+    for field, value in row.items():
+        fields[field] = fields.get(field, 0) + _size(field) + _size(value) + 2
+    full = _size(row)
+    for depth in range(_depth(list(row.values()))):
+        saved = full - _size({field: _trim(value, depth) for field, value in row.items()})
+        depth_saved[depth] = depth_saved.get(depth, 0) + saved
+
+
+def required_depth(path):
+    """Returns the depth needed to read ``path``, such as ``"device.location.name"``, without a lazy load.
+
+    Examples:
+        >>> required_depth("device.location.name")
+        2
+        >>> required_depth("device.id")
+        0
+    """
+    *related, field = path.split(".")
+    return len(related) if field not in BRIEF_FIELDS else max(len(related) - 1, 0)
+
+
+def list_fields(record_class, row):
+    """Returns the fields of ``row`` holding lists, which ``exclude_m2m`` leaves out.
+
+    Args:
+        record_class (type): The `Record` class made from ``row``, to tell
+            JSON fields holding lists apart.
+        row (dict): An object of a response.
+
+    Returns:
+        (set): The names of the fields.
+    """
+    lookup_map = record_class._lookup_map  # pylint: disable=protected-access
+    return {
+        field
+        for field, value in row.items()
+        if isinstance(value, list)
+        and not hasattr(lookup_map.get(field) or getattr(record_class, field, None), "_json_field")
+    }
+
+
+def track_reads(record, tracker, key):
+    """Counts the fields read on ``record`` and its nested records.
+
+    The classes of the records are swapped for subclasses calling
+    ``tracker.read(key, path)`` for every field read, where ``path`` is
+    dotted from ``record``, such as ``"device.name"``. Records that aren't
+    tracked don't pay for it.
+
+    Args:
+        record (Record): The record to track.
+        tracker (object): An object with a ``read(key, path)`` method, such
+            as a `PayloadProfiler`.
+        key (str): Passed on to ``tracker.read()``.
+    """
+    for path, current in walk_records(record):
+        if not getattr(type(current), "_profiled", False):
+            current.__class__ = _profiled(type(current))
+        # pylint: disable=protected-access
+        current._profile = (*current.__dict__.get("_profile", ()), (tracker, key, path))
+
+
+def _unprofiled(cls, state):
+    """Restores a profiled record as an instance of its original class."""
+    record = cls.__new__(cls)
+    record.__setstate__(state)
+    return record
+
+
+def _profiled(cls):
+    """Returns the subclass of the record class ``cls`` that counts the fields read."""
+    profiled = _PROFILED_CLASSES.get(cls)
+    if profiled is not None:
+        return profiled
+    # Class attributes are methods and such, except for the classes marking JSON fields.
+    internal = frozenset(name for name in dir(cls) if not isinstance(getattr(cls, name), type)) | _INTERNAL_ATTRIBUTES
+
+    def __getattribute__(self, name):
+        if not name.startswith("_") and name not in internal:
+            for tracker, key, path in object.__getattribute__(self, "__dict__").get("_profile", ()):
+                tracker.read(key, path + name)
+        return cls.__getattribute__(self, name)
+
+    def __reduce_ex__(self, _protocol):
+        # Pickle and copy profiled records as records of the original class.
+        return _unprofiled, (cls, self.__getstate__())
+
+    profiled = type(
+        cls.__name__,
+        (cls,),
+        {
+            "__getattribute__": __getattribute__,
+            "__reduce_ex__": __reduce_ex__,
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "_profiled": True,
+        },
+    )
+    return _PROFILED_CLASSES.setdefault(cls, profiled)
+
+
+class PayloadProfiler:
+    """Measures response payloads and the fields of records that are read.
+
+    Use it with `Api.profile()`, which also attaches it to `Api.hooks` to
+    measure the latency of each endpoint. Records returned while profiling
+    count the attributes read on them for as long as they live, including on
+    their nested records, such as ``"device.name"`` for the device of an
+    interface.
+
+    Estimates of the time saved assume that the latency of an endpoint grows
+    with the size of its responses, and each recommendation assumes that the
+    other settings don't change.
+
+    Examples:
+        >>> with nb.profile() as profiler:
+        ...     for interface in nb.dcim.interfaces.filter(device="sw1", depth=1):
+        ...         print(interface.name, interface.device.name)
+        >>> profiler.recommendations()
+        [{'endpoint': 'dcim.interfaces', 'parameter': 'exclude_m2m', 'value': True, ...}]
+    """
+
+    def __init__(self):
+        """Initialize the PayloadProfiler object."""
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the picklable state of the PayloadProfiler object."""
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        """Restore the PayloadProfiler object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _endpoint(self, key):
+        """Returns the measures of endpoint ``key``. Must be called with the lock held."""
+        if key not in self._endpoints:
+            self._endpoints[key] = {
+                "responses": 0,
+                "records": 0,
+                "bytes": 0,
+                "fields": {},
+                "m2m": set(),
+                "depth_saved": {},
+                "reads": {},
+                "requests": 0,
+                "bytes_in": 0,
+                "seconds": 0.0,
+            }
+        return self._endpoints[key]
+
+    def observe(self, endpoint, rows, records):
+        """Measures the rows of a response and profiles the records made from them.
+
+        Args:
+            endpoint (Endpoint): The endpoint queried.
+            rows (Union[dict, list]): The objects of the response.
+            records (Union[Record, list]): The records made from ``rows``.
+        """
+        rows = rows if isinstance(rows, list) else [rows]
+        records = records if isinstance(records, list) else [records]
+        key = endpoint_name(endpoint.url)
+        fields, m2m, depth_saved = {}, set(), {}
+        for row, record in zip(rows, records):
+            _measure(row, fields, depth_saved)
+            m2m |= list_fields(type(record), row)
+        with self._lock:
+            measures = self._endpoint(key)
+            measures["responses"] += 1
+            measures["records"] += len(rows)
+            measures["bytes"] += sum(fields.values())
+            measures["m2m"] |= m2m
+            for field, size in fields.items():
+                measures["fields"][field] = measures["fields"].get(field, 0) + size
+            for depth, saved in depth_saved.items():
+                measures["depth_saved"][depth] = measures["depth_saved"].get(depth, 0) + saved
+        for record in records:
+            track_reads(record, self, key)
+
+    def read(self, key, path):
+        """Counts a read of the field ``path`` of a record from endpoint ``key``."""
+        with self._lock:
+            reads = self._endpoint(key)["reads"]
+            reads[path] = reads.get(path, 0) + 1
+
+    def after_response(self, event):
+        """Measures the latency of a GET request."""
+        if event.method != "GET" or event.latency is None:
+            return
+        with self._lock:
+            measures = self._endpoint(event.endpoint)
+            measures["requests"] += 1
+            measures["bytes_in"] += event.bytes_in or 0
+            measures["seconds"] += event.latency
+
+    def reset(self):
+        """Drops every measure."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def report(self):
+        """Returns a snapshot of the measures.
+
+        Returns:
+            (dict): Keyed by dotted endpoint path, the number of `responses`
+                and `records`, their estimated `bytes`, the `bytes` and
+                `reads` of each top-level field sorted by size, the `depth`
+                of the responses, the number of `reads` of every field path,
+                and the number of GET `requests`, their `bytes_in` and
+                `seconds` of latency.
+        """
+        with self._lock:
+            return {
+                key: {
+                    "responses": measures["responses"],
+                    "records": measures["records"],
+                    "bytes": measures["bytes"],
+                    "fields": {
+                        field: {"bytes": size, "reads": measures["reads"].get(field, 0)}
+                        for field, size in sorted(measures["fields"].items(), key=lambda item: -item[1])
+                    },
+                    "depth": len(measures["depth_saved"]),
+                    "reads": dict(measures["reads"]),
+                    "requests": measures["requests"],
+                    "bytes_in": measures["bytes_in"],
+                    "seconds": measures["seconds"],
+                }
+                for key, measures in self._endpoints.items()
+            }
+
+    def recommendations(self):
+        """Recommends `exclude_m2m`, `depth` and `include` settings per endpoint.
+
+        * ``exclude_m2m=True`` when no list field of the responses is read.
+        * The lowest ``depth`` that serves every nested field read without a
+          lazy load, when it is lower than the depth of the responses.
+        * ``include`` without the included fields, such as `config_context`,
+          that aren't read.
+
+        Returns:
+            (list): Dicts with the `endpoint`, the `parameter` and its
+                recommended `value`, the `fields` it drops, and the estimated
+                `bytes_saved` and `seconds_saved` over the profiled workload,
+                sorted by bytes saved.
+        """
+        with self._lock:
+            endpoints = {
+                key: {**measures, "fields": dict(measures["fields"]), "reads": dict(measures["reads"])}
+                for key, measures in self._endpoints.items()
+                if measures["responses"]
+            }
+        recommendations = []
+        for key, measures in endpoints.items():
+            seconds_per_byte = measures["seconds"] / measures["bytes_in"] if measures["bytes_in"] else 0.0
+            read = {path.split(".", 1)[0] for path in measures["reads"]}
+            found = []
+            if measures["m2m"] and not measures["m2m"] & read:
+                m2m = measures["m2m"]
+                found.append(("exclude_m2m", True, m2m, sum(measures["fields"][field] for field in m2m)))
+            required = max((required_depth(path) for path in measures["reads"]), default=0)
+            if required < len(measures["depth_saved"]):
+                found.append(("depth", required, (), measures["depth_saved"][required]))
+            included = [field for field in INCLUDE_FIELDS if field in measures["fields"]]
+            unread = [field for field in included if field not in read]
+            if unread:
+                value = ",".join(field for field in included if field in read) or None
+                found.append(("include", value, unread, sum(measures["fields"][field] for field in unread)))
+            recommendations.extend(
+                {
+                    "endpoint": key,
+                    "parameter": parameter,
+                    "value": value,
+                    "fields": sorted(fields),
+                    "bytes_saved": saved,
+                    "seconds_saved": saved * seconds_per_byte,
+                }
+                for parameter, value, fields, saved in found
+            )
+        return sorted(recommendations, key=lambda item: -item["bytes_saved"])
@@ -0,0 +1,189 @@
+"""Learned projections: request only what each call site reads.
+
+A `ProjectionStore` remembers, for every line of code querying an endpoint,
+which fields of the records returned were read. Once saved, later queries
+from that line request a leaner representation of the objects.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from pynautobot.core.hooks import endpoint_name
+from pynautobot.core.profiling import list_fields, required_depth, track_reads
+from pynautobot.core.util import call_site
+
+logger = logging.getLogger(__name__)
+
+PROJECTION_FORMAT = 1
+
+
+class ProjectionStore:
+    """Learns the fields each call site reads, and narrows its later queries.
+
+    Queries are told apart by their endpoint and the line of code outside of
+    pynautobot that sent them, their call site. Records returned by `filter()`,
+    `all()` and `get()` count the fields read on them and on their nested
+    records. `save()` turns what was observed into the projections used by
+    later queries from the same call sites:
+
+    * ``exclude_m2m=True`` when no list field was read.
+    * A lower ``depth`` than requested when it serves every nested field read.
+    * ``include`` without the included fields, such as `config_context`,
+      that weren't read.
+
+    Reading a field left out by a projection falls back to loading the full
+    details of the record, as for any missing attribute, and the read widens
+    the projection once saved again. Projections never shrink: call `clear()`
+    after a script stops reading a field. Editing a script moves its call
+    sites, which are then learned again.
+
+    Args:
+        path (str, optional): JSON file to load the projections from and to
+            save them to, so that later runs of a script use them. Defaults to
+            keeping them in memory, for later queries of the same process.
+
+    Examples:
+        >>> nb = pynautobot.api(url, token=token, projection="~/.cache/pynautobot/inventory.json")
+        >>> for device in nb.dcim.devices.filter(role="access", depth=1):
+        ...     print(device.name, device.location.id)
+        >>> nb.projection.save()  # The next run requests depth=0 and exclude_m2m=True
+    """
+
+    def __init__(self, path=None):
+        """Initialize the ProjectionStore object."""
+        self.path = os.path.expanduser(os.fspath(path)) if path is not None else None
+        self._learned = self._load() if self.path is not None else {}
+        self._observed = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the picklable state of the ProjectionStore object."""
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        """Restore the ProjectionStore object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Returns the projections saved in `path`, or none if it is missing or unreadable."""
+        try:
+            with open(self.path, encoding="utf-8") as projection_file:
+                saved = json.load(projection_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(saved, dict) or saved.get("format") != PROJECTION_FORMAT:
+            return {}
+        return {
+            site: {"reads": set(learned.get("reads", ())), "lists": set(learned.get("lists", ()))}
+            for site, learned in saved.get("sites", {}).items()
+        }
+
+    def site(self, endpoint):
+        """Returns the call site of a query on ``endpoint``, such as ``"dcim.devices /srv/inventory.py:12"``."""
+        return f"{endpoint_name(endpoint.url)} {call_site()}"
+
+    def project(self, site, filters):
+        """Returns ``filters`` narrowed to what ``site`` was seen reading.
+
+        Args:
+            site (str): The call site, from `site()`.
+            filters (dict): The filters of the query, including the default
+                filters of the `Api`.
+
+        Returns:
+            (dict): The filters to send, ``filters`` itself if nothing was learned.
+        """
+        with self._lock:
+            learned = self._learned.get(site)
+        if learned is None:
+            return filters
+        read = {path.split(".", 1)[0] for path in learned["reads"]}
+        projected = dict(filters)
+        if not read & learned["lists"]:
+            projected["exclude_m2m"] = True
+        depth = filters.get("depth")
+        required = max((required_depth(path) for path in learned["reads"]), default=0)
+        if depth is not None and int(depth) > required:
+            projected["depth"] = required
+        if "include" in filters:
+            include = filters["include"]
+            include = include.split(",") if isinstance(include, str) else list(include)
+            include = [field for field in include if field.strip() in read]
+            if include:
+                projected["include"] = ",".join(include)
+            else:
+                del projected["include"]
+        if projected != filters:
+            logger.debug("Projected the query of %s from %s to %s", site, filters, projected)
+        return projected
+
+    def observe(self, site, rows, records):
+        """Learns the list fields of a response, and tracks the fields read on its records.
+
+        Args:
+            site (str): The call site, from `site()`.
+            rows (Union[dict, list]): The objects of the response.
+            records (Union[Record, list]): The records made from ``rows``.
+        """
+        rows = rows if isinstance(rows, list) else [rows]
+        records = records if isinstance(records, list) else [records]
+        lists = set()
+        for row, record in zip(rows, records):
+            lists |= list_fields(type(record), row)
+        with self._lock:
+            observed = self._observed.setdefault(site, {"reads": set(), "lists": set()})
+            observed["lists"] |= lists
+        for record in records:
+            track_reads(record, self, site)
+
+    def read(self, key, path):
+        """Learns a read of the field ``path`` of a record returned at call site ``key``."""
+        with self._lock:
+            self._observed.setdefault(key, {"reads": set(), "lists": set()})["reads"].add(path)
+
+    def learned(self):
+        """Returns the saved projections.
+
+        Returns:
+            (dict): The sorted field paths read and list fields seen, keyed by call site.
+        """
+        with self._lock:
+            return {
+                site: {"reads": sorted(learned["reads"]), "lists": sorted(learned["lists"])}
+                for site, learned in self._learned.items()
+            }
+
+    def save(self):
+        """Adds what was observed to the projections used by later queries, and writes them to `path`."""
+        with self._lock:
+            for site, observed in self._observed.items():
+                learned = self._learned.setdefault(site, {"reads": set(), "lists": set()})
+                learned["reads"] |= observed["reads"]
+                learned["lists"] |= observed["lists"]
+            self._observed.clear()
+        if self.path is None:
+            return
+        saved = {"format": PROJECTION_FORMAT, "sites": self.learned()}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=os.path.dirname(self.path) or ".", suffix=".tmp", delete=False
+            ) as projection_file:
+                json.dump(saved, projection_file, indent=1, sort_keys=True)
+            os.replace(projection_file.name, self.path)
+        except OSError as error:
+            logger.warning("Could not save the projections to %s: %s", self.path, error)
+
+    def clear(self):
+        """Forgets every projection and observation, including those saved in `path`."""
+        with self._lock:
+            self._learned.clear()
+            self._observed.clear()
+        if self.path is not None:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.path)
@@ -20,14 +20,122 @@ try:
     import concurrent.futures as cf
 except ImportError:
     pass
+import copy
+import itertools
 import json
+import logging
+import time
+from urllib.parse import urlencode
 
 import requests
 
+from pynautobot.core.hooks import RequestEvent
+from pynautobot.core.session import Session, cap_timeout
+from pynautobot.core.tracing import propagate, span
+
+# Conservative default that stays under the limits of common proxies and servers.
+MAX_URL_LENGTH = 4000
+# Room left in the URL for the limit/offset parameters added while paginating.
+PAGINATION_PARAMS_LENGTH = 48
+# Negated lookup expressions exclude every listed value, so they can't be split.
+NEGATED_LOOKUPS = ("n", "nic", "nie", "niew", "nisw", "nre", "nire")
+# Filters that match objects having every listed value, so they can't be split either.
+CONJOINED_FILTERS = ("tag", "tags")
+# Pagination strategies accepted by `Request`.
+PAGINATION_MODES = ("offset", "keyset", "auto")
+
+logger = logging.getLogger(__name__)
+
 
 def calc_pages(limit, count):
-    """Calculate number of pages required for full results set."""
-    return int(count / limit) + (limit % count > 0)
+    """Calculate number of pages required for full results set.
+
+    Args:
+        limit (int): Number of results per page.
+        count (int): Number of results of the query.
+
+    Returns:
+        (int): ``ceil(count / limit)``, so 0 for an empty results set.
+    """
+    return -(-count // limit)
+
+
+def make_deadline(timeout):
+    """Converts a time budget in seconds to a deadline for `Request`.
+
+    Args:
+        timeout (float): Seconds from now, or None for no deadline.
+
+    Returns:
+        (float): The deadline as a `time.monotonic()` value, or None.
+    """
+    return None if timeout is None else time.monotonic() + timeout
+
+
+def split_filters(url, filters, max_length=MAX_URL_LENGTH):
+    """Split multi-value filters so that every resulting URL fits in ``max_length``.
+
+    The multi-value filter with the longest encoding is split into chunks; if
+    the URLs are still too long the next one is split as well. Querying every
+    returned set of filters and merging the results is equivalent to the
+    original query. Negated lookups (e.g. ``location__n``) and filters that
+    require every value to match (`CONJOINED_FILTERS`, e.g. ``tag``) are never
+    split.
+
+    Args:
+        url (str): The URL the filters will be appended to.
+        filters (dict): The filters as passed to `Request`.
+        max_length (int, optional): Maximum length of the resulting URLs.
+
+    Returns:
+        (List[dict]): One filter dict per request that has to be made. This is
+            ``[filters]`` when no splitting is required.
+    """
+    if not filters or len(url) + len(urlencode(filters, doseq=True)) + PAGINATION_PARAMS_LENGTH <= max_length:
+        return [filters]
+    multi = {
+        k: v
+        for k, v in filters.items()
+        if isinstance(v, (list, tuple))
+        and len(v) > 1
+        and k.rpartition("__")[2] not in NEGATED_LOOKUPS
+        and k.partition("__")[0] not in CONJOINED_FILTERS
+    }
+    if not multi:
+        return [filters]
+
+    key = max(multi, key=lambda k: len(urlencode({k: multi[k]}, doseq=True)))
+    rest = {k: v for k, v in filters.items() if k != key}
+    budget = max_length - PAGINATION_PARAMS_LENGTH - len(url) - len(urlencode(rest, doseq=True)) - 1
+    chunks, current, size = [], [], 0
+    for value in multi[key]:
+        item_size = len(urlencode({key: value})) + 1
+        if current and size + item_size > budget:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(value)
+        size += item_size
+    chunks.append(current)
+
+    ret = []
+    for chunk in chunks:
+        ret.extend(split_filters(url, {**rest, key: chunk}, max_length))
+    return ret
+
+
+def dedupe_results(results):
+    """Merge lists of results, dropping repeated objects by ``id``."""
+    seen = set()
+    ret = []
+    for result in results:
+        for item in result:
+            item_id = item.get("id") if isinstance(item, dict) else None
+            if item_id is not None:
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+            ret.append(item)
+    return ret
 
 
 class RequestError(Exception):
@@ -72,6 +180,34 @@ class RequestErrorFromException(Exception):
     """RequestErrorFromException is raised from exception."""
 
 
+class MultipleResultsError(ValueError):
+    """Multiple Results Exception.
+
+    Raised by `Endpoint.get()` when a kwarg search matches more than one
+    object. It is a `ValueError`, as raised by earlier versions.
+
+    Examples:
+        >>> try:
+        ...     nb.dcim.devices.get(role="leaf-switch")
+        ... except pynautobot.MultipleResultsError:
+        ...     print("Use filter() to get every leaf switch")
+    """
+
+
+class DeadlineExceeded(Exception):
+    """Deadline Exception.
+
+    Raised when a call (including every page of a paginated query) did not
+    complete before its ``deadline``. Outstanding page requests are cancelled.
+
+    Examples:
+        >>> try:
+        ...     nb.dcim.interfaces.all(deadline=30)
+        ... except pynautobot.DeadlineExceeded:
+        ...     print("Nautobot is too slow right now")
+    """
+
+
 class AllocationError(Exception):
     """Allocation Exception.
 
@@ -128,8 +264,32 @@ class Request:
             would be in the filters dict.
         max_workers (int, optional): Set the maximum workers for threading in ``.all()``
             and ``.filter()`` requests.
+        deadline (float, optional): `time.monotonic()` value by which every call made
+            by this request must complete. See `make_deadline()`.
+        pagination (str, optional): How ``get()`` walks the pages of results:
+            ``"offset"`` (the default) uses limit/offset pages, ``"keyset"`` sorts
+            by `keyset_field` and pages with a range filter on it, and ``"auto"``
+            switches to keyset pagination for more than `keyset_threshold` results.
+
+    Attributes:
+        max_url_length (int): Multi-value filters that would make the URL longer
+            than this are split across several requests. See `split_filters()`.
+        keyset_field (str): Field results are sorted and paged by with keyset
+            pagination. It must never change once set and support the ``__gte`` lookup.
+            ``created`` is the only such field on every Nautobot model, but it isn't
+            indexed, so the database sorts the matching rows for every page. Use an
+            indexed field where the endpoint has one (see ``keyset_fields`` on `Api`).
+        keyset_threshold (int): Number of results from which ``"auto"`` pagination
+            uses keyset pagination.
+        page_plan (dict): The ``count``, ``page_size`` and number of ``pages`` of
+            the last threaded ``get()`` planned from a known server page size,
+            or None.
     """
 
+    max_url_length = MAX_URL_LENGTH
+    keyset_field = "created"
+    keyset_threshold = 100_000
+
     # pylint: disable=too-many-positional-arguments, too-many-arguments
     def __init__(
         self,
@@ -143,6 +303,9 @@ class Request:
         threading=False,
         max_workers=4,
         api_version=None,
+        deadline=None,
+        pagination=None,
+        keyset_field=None,
     ):
         """Instantiates a new Request object.
 
@@ -160,6 +323,10 @@ class Request:
             threading (bool, optional): Whether to use threading for the request.
             max_workers (int, optional): The maximum number of workers for the request.
             api_version (str, optional): Set to override the default Nautobot REST API Version.
+            deadline (float, optional): `time.monotonic()` value by which every call
+                must complete.
+            pagination (str, optional): ``"offset"``, ``"keyset"`` or ``"auto"``.
+            keyset_field (str, optional): Overrides `keyset_field`.
         """
         self.base = self.normalize_url(base)
         self.filters = filters
@@ -172,6 +339,12 @@ class Request:
         self.api_version = api_version
         self.limit = limit
         self.offset = offset
+        self.deadline = deadline
+        self.pagination = pagination or "offset"
+        if keyset_field:
+            self.keyset_field = keyset_field
+        self.page_plan = None
+        self._pages = itertools.count()
 
     def get_openapi(self):
         """Gets the OpenAPI Specification."""
@@ -264,8 +437,34 @@ class Request:
 
         return url
 
-    # pylint: disable=too-many-branches
+    def _remaining(self):
+        """Returns the seconds left before the deadline, or None without a deadline."""
+        if self.deadline is None:
+            return None
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before calling {self.url}")
+        return remaining
+
+    def _call_timeout(self):
+        """Returns the ``timeout`` for the next call, capped by the remaining budget.
+
+        None means the call uses the session's default timeout.
+        """
+        remaining = self._remaining()
+        if remaining is None:
+            return None
+        return cap_timeout(getattr(self.http_session, "timeout", None), remaining)
+
     def _make_call(self, verb="get", url_override=None, add_params=None, data=None):
+        with span("pynautobot.request", url=url_override or self.url, method=verb.upper()) as request_span:
+            ret = self._call(verb, url_override, add_params, data)
+            if isinstance(ret, dict) and isinstance(ret.get("results"), list):
+                request_span.set_attribute("pynautobot.results", len(ret["results"]))
+            return ret
+
+    # pylint: disable=too-many-branches
+    def _call(self, verb, url_override, add_params, data):
         if verb in ("post", "put") or (verb in ("delete") and data):
             headers = {"Content-Type": "application/json;"}
         else:
@@ -284,10 +483,24 @@ class Request:
             if add_params:
                 params.update(add_params)
 
+        kwargs = {}
+        timeout = self._call_timeout()
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+            if isinstance(self.http_session, Session):
+                # Lets the session stop retrying before the deadline.
+                kwargs["deadline"] = self.deadline
+
         try:
-            req = getattr(self.http_session, verb)(url_override or self.url, headers=headers, params=params, json=data)
+            req = getattr(self.http_session, verb)(
+                url_override or self.url, headers=headers, params=params, json=data, **kwargs
+            )
         except requests.exceptions.RetryError as error:
             raise RequestErrorFromException from error
+        except requests.exceptions.Timeout as error:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                raise DeadlineExceeded(f"Deadline exceeded while calling {url_override or self.url}") from error
+            raise
 
         if req.status_code == 204 and verb == "post":
             raise AllocationError(req)
@@ -297,76 +510,275 @@ class Request:
             raise RequestError(req)
         if req.ok:
             try:
-                return req.json()
+                with span("pynautobot.parse"):
+                    ret = req.json()
             except json.JSONDecodeError as exc:
                 raise ContentError(req) from exc
-        else:
-            raise RequestError(req)
+            if isinstance(self.http_session, Session) and self.http_session.event_hooks:
+                self._emit_page(req, ret)
+            return ret
+        raise RequestError(req)
+
+    def _emit_page(self, resp, ret):
+        """Calls the ``on_page`` hooks if ``ret`` is a page of results."""
+        if not isinstance(ret, dict) or ret.get("results") is None:
+            return
+        event = RequestEvent(resp.request.method, resp.url)
+        event.status = resp.status_code
+        event.bytes_in = len(resp.content)
+        event.latency = resp.elapsed.total_seconds()
+        event.page = next(self._pages)
+        self.http_session.event_hooks.emit("on_page", event)
+
+    def _map_filter_chunks(self, func, chunks):
+        """Call ``func`` with a copy of this request for each set of filters.
+
+        With threading, the chunks run concurrently and each chunk paginates
+        serially, so no more than ``max_workers`` requests are in flight.
+        """
+
+        def run(filters):
+            req = copy.copy(self)
+            req.filters = filters
+            req.threading = False
+            return func(req)
+
+        if self.threading:
+            with cf.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [pool.submit(propagate(run), filters) for filters in chunks]
+                return [future.result() for future in futures]
+        return [run(filters) for filters in chunks]
 
     def concurrent_get(self, ret, page_size, page_offsets):
-        """Concurrently get paginated results."""
+        """Concurrently get paginated results.
+
+        Pages that haven't started are cancelled as soon as one page fails or
+        the deadline passes.
+
+        Returns:
+            (int): The highest ``count`` reported by the fetched pages, or 0 when
+                no page was fetched.
+        """
         futures_to_results = []
+        count = 0
         with cf.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
             for offset in page_offsets:
                 new_params = {"offset": offset, "limit": page_size}
-                futures_to_results.append(pool.submit(self._make_call, add_params=new_params))
+                futures_to_results.append(pool.submit(propagate(self._make_call), add_params=new_params))
+
+            try:
+                for future in cf.as_completed(futures_to_results, timeout=self._remaining()):
+                    result = future.result()
+                    ret.extend(result["results"])
+                    count = max(count, result["count"])
+            except cf.TimeoutError as error:
+                raise DeadlineExceeded(f"Deadline exceeded while paginating {self.url}") from error
+            finally:
+                for future in futures_to_results:
+                    future.cancel()
+        return count
+
+    def _max_page_size(self):
+        """Returns the server page size cached on the session, or None if it isn't known yet."""
+        if isinstance(self.http_session, Session):
+            return self.http_session.max_page_size
+        return None
+
+    def _remember_page_size(self, page_size):
+        """Caches the server page size on the session for the next requests of the `Api`."""
+        if isinstance(self.http_session, Session) and page_size:
+            self.http_session.max_page_size = page_size
+
+    def _planned_page_size(self, add_params):
+        """Returns the page size to plan a threaded ``get()`` with, or None to discover it."""
+        max_page_size = self._max_page_size()
+        if not max_page_size or self.offset is not None:
+            return None
+        if add_params is None:
+            return max_page_size
+        if add_params == {"limit": self.limit}:
+            # The server clamps larger limits to its page size.
+            return min(self.limit, max_page_size)
+        return None
+
+    def get_planned(self, count, page_size, first_page=None):
+        """Gets every page of ``count`` results concurrently.
+
+        The pages are planned up front from the known page size, so the first
+        page is fetched in parallel with the others unless it is given. The
+        plan is kept in `page_plan` and logged at debug level.
+
+        When a page reports a higher count than planned, objects were created
+        during the walk and the missing pages are fetched as well. Rows that
+        shift between pages are de-duplicated by ``id``, but rows deleted
+        during the walk can make others shift to an already fetched page;
+        keyset pagination doesn't have this issue.
+
+        Args:
+            count (int): Number of results of the query.
+            page_size (int): Number of results per page.
+            first_page (dict, optional): Already fetched first page of
+                results.
+
+        Returns:
+            (List[Response]): List of `Response` objects returned from the
+                endpoint.
+        """
+        ret = list(first_page["results"]) if first_page else []
+        fetched = 1 if first_page else 0
+        while True:
+            pages = calc_pages(page_size, count)
+            self.page_plan = {"count": count, "page_size": page_size, "pages": pages}
+            logger.debug("Fetching %s results from %s in %s pages of %s", count, self.url, pages, page_size)
+            if fetched >= pages:
+                break
+            latest = self.concurrent_get(ret, page_size, [page * page_size for page in range(fetched, pages)])
+            fetched = pages
+            if latest <= count:
+                if latest < count:
+                    logger.debug("The results of %s shrank from %s to %s during the walk", self.url, count, latest)
+                break
+            count = latest
+        return dedupe_results([ret])
+
+    def get_keyset(self, first_page=None):
+        """Gets every page of results with keyset pagination.
+
+        Results are sorted by `keyset_field`, and each page is requested with
+        a ``<keyset_field>__gte`` filter on the last value of the previous
+        page. Unlike deep offsets, this keeps every page as cheap as the first
+        one for the database, and rows created or deleted during the walk
+        can't shift other rows between pages. Rows sharing the boundary value
+        are fetched twice and de-duplicated by ``id``.
+
+        Args:
+            first_page (dict, optional): A response already sorted by
+                `keyset_field` to continue from instead of requesting the first page.
 
-            for future in cf.as_completed(futures_to_results):
-                result = future.result()
-                ret.extend(result["results"])
+        Raises:
+            ValueError: If the results are sorted by another field, or a whole
+                page shares the same `keyset_field` value.
+
+        Returns:
+            (List[Response]): List of `Response` objects returned from the
+                endpoint.
+        """
+        field = self.keyset_field
+        if (self.filters or {}).get("sort", field) != field:
+            raise ValueError("keyset pagination sorts results itself; remove the sort filter")
+        # A limit of 0 requests the largest page size the server allows.
+        params = {"sort": field, "limit": self.limit or 0}
+        ret, seen = [], set()
+        req = first_page
+        while True:
+            if req is None:
+                req = self._make_call(add_params=params)
+            rows = req["results"]
+            new = [row for row in rows if row.get("id") not in seen]
+            ret.extend(new)
+            seen.update(row.get("id") for row in new)
+            if not req.get("next"):
+                return ret
+            if not new:
+                raise ValueError(
+                    f"More than {len(rows)} objects share the same {field}; use a larger limit or offset pagination"
+                )
+            if field not in rows[-1]:
+                raise ValueError(f"Results don't include the {field} field needed for keyset pagination")
+            params[f"{field}__gte"] = rows[-1][field]
+            req = None
 
     def get(self, add_params=None):
         """Makes a GET request.
 
         Makes a GET request to Nautobot's API, and automatically recurses
-        any paginated results.
+        any paginated results. Multi-value filters too long for a single URL
+        are split across several requests, which run concurrently when
+        threading is enabled, and the merged results are de-duplicated by ``id``.
+        Results of several pages are de-duplicated by ``id`` as well, as rows
+        can shift between pages when objects are created during the walk.
 
         Raises:
             RequestError: If req.ok returns false.
             ContentError: If response is not JSON.
+            DeadlineExceeded: If the pages could not be fetched before the deadline.
 
         Returns:
             (List[Response]): List of `Response` objects returned from the
                 endpoint.
         """
+        if self.offset is None and not self.key:
+            chunks = split_filters(self.url, self.filters, self.max_url_length)
+            if len(chunks) > 1:
+                return dedupe_results(self._map_filter_chunks(lambda req: req.get(add_params), chunks))
+            if self.pagination == "keyset" and not add_params:
+                return self.get_keyset()
+
         if not add_params and self.limit is not None:
             add_params = {"limit": self.limit}
             if self.limit and self.offset is not None:
                 add_params["offset"] = self.offset
 
+        def use_keyset(req):
+            return (
+                self.pagination == "auto"
+                and self.offset is None
+                and req["count"] >= self.keyset_threshold
+                and (self.filters or {}).get("sort", self.keyset_field) == self.keyset_field
+            )
+
+        def get_keyset(first_page):
+            # The first page is only kept when it is already sorted like keyset pages,
+            # otherwise it is requested again sorted.
+            sorted_page = (self.filters or {}).get("sort") == self.keyset_field
+            return self.get_keyset(first_page if sorted_page else None)
+
         def req_all(add_params):
             req = self._make_call(add_params=add_params)
             if isinstance(req, dict) and req.get("results") is not None:
+                if req["next"] and use_keyset(req):
+                    return get_keyset(req)
                 ret = req["results"]
                 first_run = True
                 while req["next"] and self.offset is None:
                     if not add_params and first_run:
-                        req = self._make_call(add_params={"limit": req["count"], "offset": len(req["results"])})
+                        limit = self._max_page_size() or req["count"]
+                        req = self._make_call(add_params={"limit": limit, "offset": len(req["results"])})
                     else:
                         req = self._make_call(url_override=req["next"])
                     first_run = False
                     ret.extend(req["results"])
-                return ret
+                return dedupe_results([ret]) if not first_run else ret
+            return req
+
+        def req_planned(page_size):
+            # Only the count is needed to plan the pages.
+            req = self._make_call(add_params={"limit": 1})
+            if isinstance(req, dict) and req.get("results") is not None:
+                if not req.get("next"):
+                    return req["results"]
+                if use_keyset(req):
+                    return get_keyset(req)
+                return self.get_planned(req["count"], page_size)
             return req
 
         def req_all_threaded(add_params):
+            page_size = self._planned_page_size(add_params)
+            if page_size:
+                return req_planned(page_size)
             if add_params is None:
                 # Limit must be 0 to discover the max page size
                 add_params = {"limit": 0}
             req = self._make_call(add_params=add_params)
             if isinstance(req, dict) and req.get("results") is not None:
-                ret = req["results"]
-                if req.get("next") and self.offset is None:
+                if req.get("next") and use_keyset(req):
+                    return get_keyset(req)
+                if req.get("next") and self.offset is None and req["results"]:
                     page_size = len(req["results"])
-                    pages = calc_pages(page_size, req["count"])
-                    page_offsets = [increment * page_size for increment in range(1, pages)]
-                    if pages == 1:
-                        req = self._make_call(url_override=req.get("next"))
-                        ret.extend(req["results"])
-                    else:
-                        self.concurrent_get(ret, page_size, page_offsets)
-
-                return ret
+                    if add_params.get("limit") == 0:
+                        self._remember_page_size(page_size)
+                    return self.get_planned(req["count"], page_size, first_page=req)
+                return req["results"]
             return req
 
         if self.threading:
@@ -475,7 +887,16 @@ class Request:
             RequestError: If the request fails (i.e., req.ok returns False).
             ContentError: If the response cannot be deserialized from JSON.
 
+        Note:
+            When multi-value filters have to be split across several requests,
+            the counts of each request are summed. Objects matching values in
+            more than one chunk (e.g. a device in a child location when both the
+            parent and the child are in ``location``) are then counted more than once.
+
         Returns:
             (int): The total number of objects that would match the provided query.
         """
+        chunks = split_filters(self.url, self.filters, self.max_url_length)
+        if len(chunks) > 1:
+            return sum(self._map_filter_chunks(lambda req: req.get_count(), chunks))
         return self._make_call(add_params={"limit": 1})["count"]
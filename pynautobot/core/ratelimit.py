@@ -0,0 +1,136 @@
+"""Client-side token-bucket rate limiting for requests sent to Nautobot."""
+
+import contextlib
+import os
+import threading
+import time
+
+
+def _take(tokens, updated, now, rate, burst):
+    """Refills a bucket up to ``now`` and takes one token from it.
+
+    The bucket may go into debt, in which case the caller has to wait until
+    the debt has been paid back by the refill before sending its request.
+
+    Returns:
+        (tuple): The remaining tokens and the number of seconds to wait.
+    """
+    tokens = min(burst, tokens + max(0.0, now - updated) * rate) - 1
+    return tokens, max(0.0, -tokens / rate)
+
+
+class TokenBucket:
+    """Limits the rate of requests made by the threads of one process.
+
+    Args:
+        rate (float): Requests per second allowed on average.
+        burst (int, optional): Number of requests that may be sent back to back
+            after a quiet period. Defaults to ``rate`` (at least 1).
+
+    Examples:
+        >>> nb = pynautobot.api(url, token=token, threading=True, rate_limit=20)
+        >>> nb.rate_limiter
+        <pynautobot.core.ratelimit.TokenBucket (20.0/s) at ...>
+    """
+
+    def __init__(self, rate, burst=None):
+        """Initialize the TokenBucket object."""
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, self.rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Return the representation of the TokenBucket object."""
+        return f"<{self.__class__.__module__}.{self.__class__.__name__} ({self.rate}/s) at {hex(id(self))}>"
+
+    def acquire(self):
+        """Blocks until the next request may be sent.
+
+        Returns:
+            (float): Seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = _take(self._tokens, self._updated, now, self.rate, self.burst)
+            self._updated = now
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def __getstate__(self):
+        """Return the picklable state of the TokenBucket object."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore the TokenBucket object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+# pylint: disable=too-few-public-methods
+class SQLiteTokenBucket(TokenBucket):
+    """Limits the rate of requests made by every process sharing a SQLite file.
+
+    The bucket state lives in ``path``, so any number of worker processes on
+    the same host (each with its own `Api`) collectively stay under ``rate``.
+    Every process must use the same ``rate`` and ``burst``. Several buckets,
+    e.g. one per Nautobot instance, can share a file under different names.
+
+    Args:
+        path (str): Path of the SQLite database file. It is created if missing.
+        rate (float): Requests per second allowed on average, across all processes.
+        burst (int, optional): Number of requests that may be sent back to back
+            after a quiet period. Defaults to ``rate`` (at least 1).
+        name (str, optional): Name of the bucket within the file.
+        timeout (float, optional): Seconds to wait for the database lock.
+
+    Examples:
+        >>> from pynautobot.core.ratelimit import SQLiteTokenBucket
+        >>> bucket = SQLiteTokenBucket("/var/tmp/nautobot-rate.db", rate=50)
+        >>> nb = pynautobot.api(url, token=token, rate_limit=bucket)
+    """
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(self, path, rate, burst=None, name="default", timeout=30.0):
+        """Initialize the SQLiteTokenBucket object."""
+        super().__init__(rate, burst=burst)
+        self.path = os.fspath(path)
+        self.name = name
+        self.timeout = timeout
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+
+    def _connect(self):
+        import sqlite3  # pylint: disable=import-outside-toplevel
+
+        # Connections can't be shared between threads, and opening one is cheap
+        # compared to an HTTP request. Closing one with an open transaction rolls it back.
+        return contextlib.closing(sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None))
+
+    def acquire(self):
+        """Blocks until the next request may be sent by any process sharing the file.
+
+        Returns:
+            (float): Seconds spent waiting.
+        """
+        with self._connect() as conn:
+            # BEGIN IMMEDIATE takes the write lock up front so that concurrent
+            # processes serialize on the read-modify-write below.
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)).fetchone()
+            tokens, updated = row if row else (self.burst, now)
+            tokens, wait = _take(tokens, updated, now, self.rate, self.burst)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)", (self.name, tokens, now)
+            )
+            conn.execute("COMMIT")
+        if wait:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,273 @@
+"""Resolves natural keys (names, slugs, ...) to object IDs in bulk."""
+
+import threading
+import time
+
+from pynautobot.core.response import Record
+from pynautobot.core.util import endpoint_from_path
+
+
+class Lookup:
+    """Placeholder for the ID of an object identified by a natural key.
+
+    Lookups can be dropped into payloads wherever an ID is expected and are
+    replaced with the real IDs by `Resolver.prepare()`.
+
+    Args:
+        endpoint (Union[str, Endpoint]): The endpoint the object lives on, either
+            as an `Endpoint` or as a dotted ``"app.endpoint"`` path.
+        **key (str): Filter/value pairs that identify exactly one object.
+
+    Examples:
+        >>> Lookup("extras.statuses", name="Active")
+        Lookup('extras.statuses', name='Active')
+        >>> Lookup("dcim.interfaces", device="hq-access-01", name="Gi1/0/1")
+        Lookup('dcim.interfaces', device='hq-access-01', name='Gi1/0/1')
+    """
+
+    __slots__ = ("endpoint", "key")
+
+    def __init__(self, endpoint, **key):
+        """Initialize the Lookup object."""
+        if not key:
+            raise ValueError("A Lookup requires at least one key field")
+        self.endpoint = endpoint
+        self.key = key
+
+    def __repr__(self):
+        """Return the representation of the Lookup object."""
+        endpoint = self.endpoint if isinstance(self.endpoint, str) else self.endpoint.url
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.key.items())
+        return f"Lookup({endpoint!r}, {fields})"
+
+    def __eq__(self, other):
+        """Check if the Lookup object is equal to another object."""
+        if isinstance(other, Lookup):
+            return (self.endpoint, self.key) == (other.endpoint, other.key)
+        return NotImplemented
+
+    def __hash__(self):
+        """Hash the Lookup object."""
+        return hash((str(self.endpoint), tuple(sorted(self.key.items()))))
+
+
+def _candidates(value):
+    """Returns the string forms a natural key value may take on a Record."""
+    if isinstance(value, Record):
+        attrs = vars(value)
+        return {str(attrs[i]) for i in ("id", "name", "display") if attrs.get(i) is not None}
+    return {str(value)}
+
+
+def _is_stub(value):
+    """Returns whether ``value`` is a related object returned without its natural keys (``depth=0``)."""
+    return isinstance(value, Record) and not {"name", "display"} & set(vars(value))
+
+
+def find_lookups(value):
+    """Returns every `Lookup` contained anywhere in a payload.
+
+    Args:
+        value (Union[dict, list]): The payload to search.
+
+    Returns:
+        (list): The lookups found, in traversal order.
+    """
+    if isinstance(value, Lookup):
+        return [value]
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return []
+    return [lookup for item in value for lookup in find_lookups(item)]
+
+
+class Resolver:
+    """Maps ``(endpoint, natural key)`` pairs to object IDs.
+
+    Unresolved keys are grouped per endpoint and resolved with multi-value
+    filters, so resolving a hundred device names costs a single request instead
+    of a hundred ``get()`` calls. Results are cached for ``ttl`` seconds.
+
+    An instance is available on every `Api` as ``nb.resolver``.
+
+    Args:
+        api (Api): The `Api` object used to query Nautobot.
+        ttl (int, optional): Number of seconds a resolved ID stays cached.
+        batch_size (int, optional): Maximum number of values per multi-value filter.
+
+    Examples:
+        >>> nb.resolver.resolve("dcim.locations", name="HQ")
+        '2302f2a1-2ed4-4ac9-a43a-285c95190071'
+        >>> from pynautobot.core.resolver import Lookup
+        >>> nb.dcim.devices.create(nb.resolver.prepare([
+        ...     {
+        ...         "name": "hq-access-05",
+        ...         "location": Lookup("dcim.locations", name="HQ"),
+        ...         "role": Lookup("extras.roles", name="access"),
+        ...         "status": Lookup("extras.statuses", name="Active"),
+        ...         "device_type": Lookup("dcim.device_types", model="c9300-48"),
+        ...     },
+        ... ]))
+    """
+
+    def __init__(self, api, ttl=300, batch_size=100):
+        """Initialize the Resolver object."""
+        self.api = api
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self._cache = {}
+        self._nested = set()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """Get the state of the Resolver object."""
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, d):
+        """Set the state of the Resolver object."""
+        self.__dict__.update(d)
+        self._lock = threading.Lock()
+
+    def _endpoint(self, lookup):
+        if isinstance(lookup.endpoint, str):
+            return endpoint_from_path(self.api, lookup.endpoint)
+        return lookup.endpoint
+
+    def clear(self):
+        """Drops every cached ID."""
+        with self._lock:
+            self._cache.clear()
+
+    def resolve(self, endpoint, **key):
+        """Returns the ID of the single object matching ``key``.
+
+        Args:
+            endpoint (Union[str, Endpoint]): The endpoint or dotted endpoint path.
+            **key (str): Filter/value pairs that identify the object.
+
+        Returns:
+            (str): The ID of the object.
+
+        Raises:
+            ValueError: If no object or more than one object matches.
+        """
+        lookup = Lookup(endpoint, **key)
+        return self.resolve_many([lookup])[lookup]
+
+    def resolve_many(self, lookups):
+        """Resolves many lookups with as few requests as possible.
+
+        Args:
+            lookups (list): A list of `Lookup` objects.
+
+        Returns:
+            (dict): Each `Lookup` mapped to the ID of its object.
+
+        Raises:
+            ValueError: If any lookup matches no object or more than one object.
+        """
+        ids = {}
+        pending = {}
+        now = time.monotonic()
+        with self._lock:
+            for lookup in set(lookups):
+                endpoint = self._endpoint(lookup)
+                cache_key = (endpoint.url, tuple(sorted(lookup.key.items())))
+                cached = self._cache.get(cache_key)
+                if cached and cached[1] > now:
+                    ids[lookup] = cached[0]
+                    continue
+                fields = tuple(sorted(lookup.key))
+                pending.setdefault((endpoint.url, fields), (endpoint, []))[1].append((lookup, cache_key))
+
+        for (_, fields), (endpoint, group) in pending.items():
+            resolved = self._fetch(endpoint, fields, group)
+            expires = time.monotonic() + self.ttl
+            with self._lock:
+                for (lookup, cache_key), object_id in resolved.items():
+                    ids[lookup] = object_id
+                    self._cache[cache_key] = (object_id, expires)
+
+        missing = [lookup for lookup in lookups if lookup not in ids]
+        if missing:
+            raise ValueError(f"Unable to resolve {len(missing)} lookup(s): {missing[:10]}")
+        return ids
+
+    def _fetch(self, endpoint, fields, group):
+        """Resolves a group of lookups sharing the same endpoint and key fields.
+
+        The field with the most distinct values is sent as a multi-value filter,
+        the remaining fields are sent as-is. Ties go to fields not known to be
+        related objects, whose values match without a ``depth=1`` query.
+        """
+        batch_field = max(
+            fields,
+            key=lambda f: (len({str(lookup.key[f]) for lookup, _ in group}), (endpoint.url, f) not in self._nested),
+        )
+        by_fixed = {}
+        for lookup, cache_key in group:
+            fixed = tuple((f, lookup.key[f]) for f in fields if f != batch_field)
+            by_fixed.setdefault(fixed, {}).setdefault(str(lookup.key[batch_field]), []).append((lookup, cache_key))
+
+        resolved = {}
+        for fixed, by_value in by_fixed.items():
+            values = sorted(by_value)
+            for i in range(0, len(values), self.batch_size):
+                matched = self._match(
+                    endpoint, batch_field, {**dict(fixed), batch_field: values[i : i + self.batch_size]}
+                )
+                resolved.update({entry: object_id for value, object_id in matched.items() for entry in by_value[value]})
+        return resolved
+
+    def _match(self, endpoint, batch_field, filters):
+        """Returns the values of ``filters[batch_field]`` mapped to the ID of their object.
+
+        Related objects come back as bare references by default, so when the
+        batch field is a related object the query is sent again with
+        ``depth=1`` to get its name. The endpoint then always gets ``depth=1``
+        for that field.
+        """
+        nested = (endpoint.url, batch_field) in self._nested
+        records = endpoint.filter(**filters, **({"depth": 1} if nested else {}))
+        if not nested and any(_is_stub(vars(record).get(batch_field)) for record in records):
+            self._nested.add((endpoint.url, batch_field))
+            records = endpoint.filter(**filters, depth=1)
+
+        wanted = set(filters[batch_field])
+        matches = {}
+        for record in records:
+            for candidate in _candidates(vars(record).get(batch_field)) & wanted:
+                matches.setdefault(candidate, set()).add(record.id)
+        for value, record_ids in matches.items():
+            if len(record_ids) > 1:
+                fixed = {k: v for k, v in filters.items() if k != batch_field}
+                raise ValueError(
+                    f"{endpoint.url} has {len(record_ids)} objects matching {batch_field}={value!r} {fixed}"
+                )
+        return {value: next(iter(record_ids)) for value, record_ids in matches.items()}
+
+    def _substitute(self, value, ids):
+        if isinstance(value, Lookup):
+            return ids[value]
+        if isinstance(value, dict):
+            return {k: self._substitute(v, ids) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._substitute(v, ids) for v in value]
+        return value
+
+    def prepare(self, payload):
+        """Returns a copy of ``payload`` with every `Lookup` replaced by its ID.
+
+        All lookups found anywhere in the payload are resolved together before
+        any substitution happens.
+
+        Args:
+            payload (Union[dict, list]): A payload for ``create()``/``update()``.
+
+        Returns:
+            (Union[dict, list]): The payload with IDs in place of lookups.
+        """
+        found = find_lookups(payload)
+        ids = self.resolve_many(found) if found else {}
+        return self._substitute(payload, ids)
@@ -22,7 +22,9 @@ from urllib.parse import urlparse
 
 import pynautobot.core.app
 import pynautobot.core.endpoint
+from pynautobot.core.lazyload import LazyLoadPolicy
 from pynautobot.core.query import Request
+from pynautobot.core.tracing import span
 from pynautobot.core.util import Hashabledict
 
 # List of fields that are lists but should be treated as sets.
@@ -145,6 +147,7 @@ class Record:
 
     url = None
     _lookup_map = {}
+    _query = None
 
     def __init__(self, values, api, endpoint):
         """Initialize the Record object."""
@@ -202,7 +205,8 @@ class Record:
         """
         if self.url:
             if self.has_details is False and k != "keys":
-                if self.full_details():
+                policy = getattr(self.api, "lazy_loads", None)
+                if policy.load(self, k) if isinstance(policy, LazyLoadPolicy) else self.full_details():
                     ret = getattr(self, k, None)
                     if ret or hasattr(self, k):
                         return ret
@@ -234,7 +238,8 @@ class Record:
 
     def __getstate__(self):
         """Get the state of the Record object."""
-        return self.__dict__
+        # The query the record belongs to and its profiler aren't part of its state.
+        return {k: v for k, v in self.__dict__.items() if k not in ("_query", "_profile")}
 
     def __setstate__(self, d):
         """Set the state of the Record object."""
@@ -335,14 +340,15 @@ class Record:
         Returns: (bool)
         """
         if self.url:
-            req = Request(
-                base=self.url,
-                token=self.api.token,
-                http_session=self.api.http_session,
-                api_version=self.api.api_version,
-                filters=self.api.default_filters,
-            )
-            self._parse_values(req.get())
+            with span("pynautobot.full_details", url=self.url):
+                req = Request(
+                    base=self.url,
+                    token=self.api.token,
+                    http_session=self.api.http_session,
+                    api_version=self.api.api_version,
+                    filters=self.api.default_filters,
+                )
+                self._parse_values(req.get())
             self.has_details = True
             return True
         return False
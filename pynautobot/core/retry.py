@@ -0,0 +1,157 @@
+"""Retry policy and circuit breaker for requests sent to Nautobot."""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from pynautobot.core.routing import is_read
+
+# Methods that can be sent again without changing the outcome.
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+# Responses that mean the request may succeed if it is sent again.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Circuit Open Exception.
+
+    Raised without sending the request when the circuit breaker of the
+    instance is open, i.e. the instance failed repeatedly and is given time
+    to recover. It is a `requests.exceptions.ConnectionError`, so reads fail
+    over to another instance when read replicas are configured.
+    """
+
+
+class RetryPolicy:
+    """Retries failed requests with jittered exponential backoff.
+
+    Connection errors, timeouts and ``status_forcelist`` responses are
+    retried for idempotent methods (GET, HEAD, OPTIONS, PUT and DELETE) and
+    GraphQL queries. Other POST and PATCH requests may create or change
+    objects twice when retried, so they are only retried with
+    ``retry_non_idempotent``.
+
+    The delay before retry ``n`` is picked at random between 0 and
+    ``backoff_factor * 2 ** n`` seconds (capped at ``max_backoff``), so that
+    many clients failing at once don't retry in lockstep. A longer
+    ``Retry-After`` header is honored.
+
+    Args:
+        retries (int, optional): Number of retries after the first attempt.
+        backoff_factor (float, optional): Base delay in seconds.
+        max_backoff (float, optional): Maximum delay in seconds.
+        status_forcelist (tuple, optional): Status codes that are retried.
+        retry_non_idempotent (bool, optional): Also retry POST and PATCH requests.
+
+    Examples:
+        >>> from pynautobot.core.retry import RetryPolicy
+        >>> nb = pynautobot.api(url, token=token, retries=RetryPolicy(retries=5, backoff_factor=1))
+    """
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        retries=3,
+        backoff_factor=0.5,
+        max_backoff=30.0,
+        status_forcelist=RETRY_STATUS_CODES,
+        retry_non_idempotent=False,
+    ):
+        """Initialize the RetryPolicy object."""
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_forcelist = status_forcelist
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def allows(self, method, url="", json=None):
+        """Returns whether a request may be retried.
+
+        Args:
+            method (str): HTTP method of the request.
+            url (str, optional): URL of the request.
+            json (dict, optional): JSON body of the request.
+        """
+        return self.retry_non_idempotent or method.upper() in IDEMPOTENT_METHODS or is_read(method, url, json)
+
+    def backoff(self, attempt, retry_after=0.0):
+        """Returns the seconds to wait before retry number ``attempt`` (starting at 0)."""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**attempt))  # noqa: S311
+        return max(delay, retry_after)
+
+
+class CircuitBreaker:
+    """Fails fast while a Nautobot instance is down.
+
+    Each host has its own circuit. After ``failure_threshold`` consecutive
+    failures (connection errors, timeouts or 5xx responses) the circuit opens
+    and requests to that host raise `CircuitOpenError` at once instead of
+    tying up worker threads. After ``reset_timeout`` seconds one trial request
+    is let through: if it succeeds the circuit closes, otherwise it opens again.
+
+    Args:
+        failure_threshold (int, optional): Consecutive failures that open the circuit.
+        reset_timeout (float, optional): Seconds before a trial request is allowed.
+
+    Examples:
+        >>> nb = pynautobot.api(url, token=token, circuit_breaker=True)
+        >>> nb.circuit_breaker.state("nautobot.example.com")
+        'closed'
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """Initialize the CircuitBreaker object."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = {}
+        self._opened_at = {}
+        self._trial = set()
+        self._lock = threading.Lock()
+
+    def state(self, host):
+        """Returns the state of the circuit of ``host``: closed, open or half-open."""
+        with self._lock:
+            if host not in self._opened_at:
+                return "closed"
+            if host in self._trial or time.monotonic() - self._opened_at[host] >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def before(self, url):
+        """Raises `CircuitOpenError` unless a request to ``url`` may be sent."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            if host not in self._trial and time.monotonic() - opened_at >= self.reset_timeout:
+                self._trial.add(host)
+                return
+        raise CircuitOpenError(f"Circuit breaker for {host} is open after repeated failures")
+
+    def record(self, url, success):
+        """Records the outcome of a request to ``url``."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._trial.discard(host)
+            if success:
+                self._failures.pop(host, None)
+                self._opened_at.pop(host, None)
+                return
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if host in self._opened_at or self._failures[host] >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
+
+    def __getstate__(self):
+        """Return the picklable state of the CircuitBreaker object."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore the CircuitBreaker object from its pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
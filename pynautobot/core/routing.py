@@ -0,0 +1,129 @@
+"""Routes read requests to read-only Nautobot replicas."""
+
+import itertools
+import threading
+import time
+
+# Methods that never modify data in Nautobot.
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+# Responses from a replica that make a read fail over to the next instance.
+FAILOVER_STATUS_CODES = (502, 503, 504)
+
+
+def is_read(method, url, json=None):
+    """Returns whether a request only reads data.
+
+    GraphQL queries are reads, GraphQL mutations are not.
+
+    Args:
+        method (str): HTTP method of the request.
+        url (str): URL of the request.
+        json (dict, optional): JSON body of the request.
+    """
+    method = method.upper()
+    if method in READ_METHODS:
+        return True
+    if method == "POST" and url.rstrip("/").endswith("/graphql") and isinstance(json, dict):
+        return not str(json.get("query", "")).lstrip().startswith("mutation")
+    return False
+
+
+# pylint: disable=too-many-instance-attributes
+class ReplicaRouter:
+    """Sends reads to read replicas in turn and writes to the primary.
+
+    Replicas that refuse connections, time out or answer with a 502/503/504 are
+    skipped for ``cooldown`` seconds and the read fails over to the next replica, then
+    to the primary. With ``read_your_writes`` set, reads go to the primary for
+    that many seconds after a write so that replication lag can't hide it.
+
+    Args:
+        primary_url (str): API URL of the primary, e.g. ``http://nautobot/api``.
+        replica_urls (list): API URLs of the read replicas.
+        read_your_writes (float, optional): Seconds to send reads to the primary
+            after a write. Defaults to 0 (disabled).
+        cooldown (float, optional): Seconds an unhealthy replica is skipped for.
+
+    Attributes:
+        reads (dict): Number of reads sent to each API URL.
+        failovers (int): Number of reads retried on another instance.
+    """
+
+    def __init__(self, primary_url, replica_urls, read_your_writes=0.0, cooldown=30.0):
+        """Initialize the ReplicaRouter object."""
+        self.primary_url = primary_url.rstrip("/")
+        self.replica_urls = [url.rstrip("/") for url in replica_urls]
+        self.read_your_writes = read_your_writes
+        self.cooldown = cooldown
+        self.reads = dict.fromkeys([*self.replica_urls, self.primary_url], 0)
+        self.failovers = 0
+        self._down_until = {}
+        self._last_write = None
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def _split(self, url):
+        """Splits ``url`` into a known API URL and the path below it."""
+        for base in (self.primary_url, *self.replica_urls):
+            if url == base or url.startswith(f"{base}/"):
+                return base, url[len(base) :]
+        return None, url
+
+    def targets(self, method, url, json=None):
+        """Returns the URLs to try in order for a request.
+
+        Args:
+            method (str): HTTP method of the request.
+            url (str): URL of the request, on the primary or any replica.
+            json (dict, optional): JSON body of the request.
+
+        Returns:
+            (list): URLs to send the request to, falling back to the next one
+                when `mark_down()` is called for the previous one.
+        """
+        base, path = self._split(url)
+        if base is None:
+            return [url]
+        if not is_read(method, url, json):
+            return [self.primary_url + path]
+        with self._lock:
+            now = time.monotonic()
+            if self._last_write is not None and now - self._last_write < self.read_your_writes:
+                return [self.primary_url + path]
+            healthy = [replica for replica in self.replica_urls if self._down_until.get(replica, 0) <= now]
+            if healthy:
+                start = next(self._turn) % len(healthy)
+                healthy = healthy[start:] + healthy[:start]
+        return [replica + path for replica in healthy] + [self.primary_url + path]
+
+    def sent(self, url):
+        """Counts a read sent to ``url``."""
+        base, _ = self._split(url)
+        with self._lock:
+            self.reads[base or url] = self.reads.get(base or url, 0) + 1
+
+    def mark_down(self, url):
+        """Skips the replica serving ``url`` for the next ``cooldown`` seconds."""
+        base, _ = self._split(url)
+        with self._lock:
+            self.failovers += 1
+            if base != self.primary_url:
+                self._down_until[base] = time.monotonic() + self.cooldown
+
+    def record_write(self):
+        """Starts the read-your-writes window."""
+        with self._lock:
+            self._last_write = time.monotonic()
+
+    def __getstate__(self):
+        """Return the picklable state of the ReplicaRouter object."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        del state["_turn"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore the ReplicaRouter object from its pickled state."""
+        self.__dict__.update(state)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
@@ -0,0 +1,203 @@
+"""The HTTP session used by `Api` to talk to Nautobot."""
+
+import time
+
+import requests
+
+from pynautobot.core.concurrency import parse_retry_after
+from pynautobot.core.hedging import HEDGED_METHODS
+from pynautobot.core.hooks import RequestEvent
+from pynautobot.core.routing import FAILOVER_STATUS_CODES, is_read
+
+
+def cap_timeout(timeout, remaining):
+    """Caps a ``timeout`` (a number, a ``(connect, read)`` tuple or None) to ``remaining`` seconds."""
+    remaining = max(remaining, 0.001)
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+class Session(requests.Session):
+    """A `requests.Session` that applies pynautobot's client-side traffic policies.
+
+    Every request made through an `Api` goes through its session, so policies
+    attached here apply to all threads using that `Api`, including GraphQL.
+
+    Policies are not pickled with the session.
+
+    Attributes:
+        circuit_breaker (CircuitBreaker): Fails requests to instances that are
+            down without sending them, or None to always send requests.
+        event_hooks (Hooks): Observes the requests sent, or None.
+        hedging (HedgingPolicy): Re-sends slow GET requests, or None to never
+            hedge requests.
+        limiter (AdaptiveLimiter): Caps the number of in-flight requests, or
+            None to send requests without limit.
+        max_page_size (int): Largest page size of the server, learned by the
+            first threaded query and used to plan the pages of the next ones,
+            or None until it is known.
+        rate_limiter (TokenBucket): Caps the rate at which requests are sent,
+            or None to send requests as fast as allowed by `limiter`.
+        retry (RetryPolicy): Retries failed requests, or None to never retry.
+        router (ReplicaRouter): Sends reads to read replicas, or None to send
+            every request to the URL it was made for.
+        timeout (Union[float, tuple]): Default ``timeout`` for requests that
+            don't set one, or None to wait forever.
+    """
+
+    circuit_breaker = None
+    event_hooks = None
+    hedging = None
+    limiter = None
+    max_page_size = None
+    rate_limiter = None
+    retry = None
+    router = None
+    timeout = None
+
+    def request(self, method, url, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Sends a request, applying the policies attached to the session.
+
+        Besides the arguments of `requests.Session.request()`, a ``deadline``
+        (a `time.monotonic()` value) can be passed to cap the timeout of every
+        attempt and stop retrying when it would be exceeded.
+        """
+        if kwargs.get("timeout") is None and self.timeout is not None:
+            kwargs["timeout"] = self.timeout
+        if self.hedging is not None and method.upper() in HEDGED_METHODS and not kwargs.get("stream"):
+            return self.hedging.send(self._send_observed, method, url, *args, **kwargs)
+        return self._send(method, url, *args, **kwargs)
+
+    def _send_observed(self, method, url, *args, **kwargs):
+        """Sends a request and feeds its latency to the hedging policy."""
+        resp = self._send(method, url, *args, **kwargs)
+        if resp.ok:
+            self.hedging.observe(resp.elapsed.total_seconds())
+        return resp
+
+    def _send(self, method, url, *args, **kwargs):
+        """Sends a request to the instance chosen by the router, failing reads over between instances."""
+        if self.router is None:
+            return self._send_one(method, url, *args, **kwargs)
+
+        read = is_read(method, url, kwargs.get("json"))
+        *replicas, last = self.router.targets(method, url, kwargs.get("json"))
+        for target in replicas:
+            try:
+                # Failing over to the next instance is faster than retrying this one.
+                resp = self._send_one(method, target, *args, retry=False, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.router.mark_down(target)
+                continue
+            if resp.status_code in FAILOVER_STATUS_CODES:
+                resp.close()
+                self.router.mark_down(target)
+                continue
+            self.router.sent(target)
+            return resp
+        resp = self._send_one(method, last, *args, **kwargs)
+        if read:
+            self.router.sent(last)
+        else:
+            self.router.record_write()
+        return resp
+
+    def _send_one(self, method, url, *args, retry=True, deadline=None, **kwargs):
+        """Sends a request to one instance, retrying failures allowed by the retry policy."""
+        retry = retry and self.retry is not None and self.retry.allows(method, url, kwargs.get("json"))
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before(url)
+            if deadline is not None:
+                kwargs["timeout"] = cap_timeout(kwargs.get("timeout"), deadline - time.monotonic())
+            try:
+                resp = self._attempt(method, url, *args, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record(url, success=False)
+                delay = self._retry_delay(attempt, deadline) if retry else None
+                if delay is None:
+                    raise
+            except BaseException:
+                self._record(url, success=False)
+                raise
+            else:
+                self._record(url, success=resp.status_code < 500)
+                delay = None
+                if retry and resp.status_code in self.retry.status_forcelist:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    delay = self._retry_delay(attempt, deadline, retry_after)
+                if delay is None:
+                    return resp
+                resp.close()
+            if self.event_hooks:
+                self._emit_retry(method, url, attempt, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _emit_retry(self, method, url, attempt, delay):
+        event = RequestEvent(method, url)
+        event.attempt = attempt
+        event.delay = delay
+        self.event_hooks.emit("on_retry", event)
+
+    def _record(self, url, success):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(url, success)
+
+    def _retry_delay(self, attempt, deadline, retry_after=0.0):
+        """Returns the seconds to wait before retrying, or None to not retry."""
+        if attempt >= self.retry.retries:
+            return None
+        delay = self.retry.backoff(attempt, retry_after)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def send(self, request, **kwargs):
+        """Sends a prepared request, calling the `event_hooks` around it."""
+        hooks = self.event_hooks
+        if not hooks:
+            return super().send(request, **kwargs)
+
+        event = RequestEvent(request.method, request.url, bytes_out=len(request.body or b""))
+        hooks.emit("before_request", event)
+        start = time.monotonic()
+        try:
+            resp = super().send(request, **kwargs)
+        except Exception as error:
+            event.latency = time.monotonic() - start
+            event.error = error
+            hooks.emit("after_response", event)
+            raise
+        event.latency = time.monotonic() - start
+        event.status = resp.status_code
+        # Reading a streamed body would consume it.
+        event.bytes_in = int(resp.headers.get("Content-Length", 0)) if kwargs.get("stream") else len(resp.content)
+        hooks.emit("after_response", event)
+        return resp
+
+    def _attempt(self, method, url, *args, **kwargs):
+        """Sends a request once the rate limiter allows it, holding a limiter slot while it is in flight."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        if self.limiter is None:
+            return super().request(method, url, *args, **kwargs)
+
+        self.limiter.acquire()
+        start = time.monotonic()
+        try:
+            resp = super().request(method, url, *args, **kwargs)
+        except requests.exceptions.RequestException:
+            self.limiter.release(error=True)
+            raise
+        except BaseException:
+            self.limiter.release()
+            raise
+        self.limiter.release(
+            latency=time.monotonic() - start,
+            status_code=resp.status_code,
+            retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+        )
+        return resp
@@ -0,0 +1,91 @@
+"""Optional OpenTelemetry spans around queries, page fetches, hydration and lazy loads.
+
+Spans are created with the OpenTelemetry API when it is installed, and are
+exported by whichever tracer provider the application configures. Without
+it, every helper of this module is a no-op.
+"""
+
+import contextvars
+import functools
+
+from pynautobot.core.hooks import endpoint_name, url_template
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+_tracer = trace.get_tracer("pynautobot") if trace is not None else None
+
+
+class _NoopSpan:
+    """Stands in for a span when OpenTelemetry isn't installed."""
+
+    def __enter__(self):
+        """Enter the span."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Exit the span."""
+        return False
+
+    def set_attribute(self, key, value):
+        """Ignore an attribute."""
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name, url=None, **attributes):
+    """Returns a context manager running its block in a new span.
+
+    Args:
+        name (str): Name of the span, such as ``"pynautobot.request"``.
+        url (str, optional): URL of the request, recorded as its endpoint and
+            URL template.
+        **attributes: Other attributes of the span, prefixed with ``pynautobot.``.
+
+    Returns:
+        (contextlib.AbstractContextManager): The span, whose `set_attribute`
+            can be called inside the block.
+    """
+    if _tracer is None:
+        return _NOOP_SPAN
+    attributes = {f"pynautobot.{key}": value for key, value in attributes.items() if value is not None}
+    if url is not None:
+        attributes["pynautobot.endpoint"] = endpoint_name(url)
+        attributes["url.template"] = url_template(url)
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def traced(name):
+    """Decorates a method of `Endpoint` to run in a span named ``name``."""
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if _tracer is None:
+                return method(self, *args, **kwargs)
+            with span(name, url=self.url):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def propagate(func):
+    """Binds ``func`` to a copy of the current context, to be run by a pool thread.
+
+    Threads of a `concurrent.futures.ThreadPoolExecutor` don't inherit the
+    context of the thread submitting work to them, so spans started by
+    ``func`` would lose their parent. Call it once per submitted call, in the
+    submitting thread.
+
+    Args:
+        func (callable): The function to run in another thread.
+
+    Returns:
+        (callable): ``func`` running in a copy of the current context.
+    """
+    return functools.partial(contextvars.copy_context().run, func)
@@ -1,5 +1,11 @@
 """This file has been modified by NetworktoCode, LLC."""
 
+import os
+import sys
+
+# Directory of the pynautobot package, to tell its frames from those of callers.
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
 
 class Hashabledict(dict):
     """A dictionary subclass that is hashable."""
@@ -7,3 +13,71 @@ class Hashabledict(dict):
     def __hash__(self):
         """Hash the dictionary."""
         return hash(frozenset(self))
+
+
+def endpoint_from_path(api, path):
+    """Returns the Endpoint for a dotted ``app.endpoint`` path.
+
+    Args:
+        api (Api): The `Api` object to look the endpoint up on.
+        path (str): The dotted path to the endpoint, e.g. ``"dcim.devices"``.
+            Plugin endpoints are addressed as ``"plugins.<plugin>.<endpoint>"``.
+
+    Returns:
+        (Endpoint): The matching endpoint.
+
+    Raises:
+        ValueError: If the path doesn't contain both an app and an endpoint.
+
+    Examples:
+        >>> endpoint_from_path(nb, "ipam.ip_addresses")
+        <pynautobot.core.endpoint.Endpoint object at 0x...>
+    """
+    parts = path.split(".")
+    if len(parts) < 2:
+        raise ValueError(f"Endpoint path {path!r} must be in the form 'app.endpoint'.")
+    obj = api
+    for part in parts:
+        obj = getattr(obj, part)
+    return obj
+
+
+def is_record(value):
+    """Whether ``value`` is a `Record`, without importing the response module."""
+    return callable(getattr(type(value), "full_details", None))
+
+
+def walk_records(record):
+    """Yields ``record`` and the records nested in it, with their dotted path.
+
+    Args:
+        record (Record): The record to walk.
+
+    Yields:
+        (tuple): The path of the record from ``record``, such as ``""`` for
+            ``record`` itself or ``"device."`` for the device of an interface,
+            and the record.
+    """
+    stack = [("", record)]
+    seen = set()
+    while stack:
+        path, current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield path, current
+        for key, value in vars(current).items():
+            if isinstance(value, list):
+                stack.extend((f"{path}{key}.", item) for item in value if is_record(item))
+            elif is_record(value):
+                stack.append((f"{path}{key}.", value))
+
+
+def call_site():
+    """Returns the ``file:line`` of the innermost caller outside of pynautobot, or ``"unknown"``."""
+    frame = sys._getframe(1)  # pylint: disable=protected-access
+    while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
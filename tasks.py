@@ -202,6 +202,28 @@ def pytest(context, label="", failfast=False, keepdb=False, stdout=False):
     destroy(context)
 
 
+@task(
+    help={
+        "devices": "Number of devices of the dataset (default: 10000)",
+        "latency": "Seconds the server waits per request (default: 0)",
+        "only": "Comma-separated benchmarks to run (default: all)",
+        "check": "Fail on regressions against the baselines",
+        "save": "Save the results as the baselines",
+    }
+)
+def benchmark(context, devices=10000, latency=0.0, only="", check=False, save=False):  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    """Run the offline benchmarks against the Nautobot stand-in server."""
+    command = [
+        "python -m tests.benchmarks.bench",
+        f"--devices {devices}",
+        f"--latency {latency}",
+        f"--only {only}" if only else "",
+        "--check" if check else "",
+        "--save" if save else "",
+    ]
+    run_command(context, " ".join(command))
+
+
 @task(aliases=("a",))
 def autoformat(context):
     """Run code autoformatting."""
@@ -0,0 +1,218 @@
+"""Offline benchmarks of pynautobot against the `StandInServer`.
+
+Run them from the root of the repository::
+
+    python -m tests.benchmarks.bench --devices 10000 --latency 0.002
+    python -m tests.benchmarks.bench --only filter_serial,filter_threaded --check
+    python -m tests.benchmarks.bench --save
+
+Each benchmark reports the best of ``--repeat`` runs. ``--check`` compares
+them with the baselines saved for the same settings in ``baselines.json`` and
+exits with 1 if one is slower by more than ``--tolerance``. ``--save``
+records them as the new baselines.
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import pynautobot
+from pynautobot.core.endpoint import response_loader
+from pynautobot.models.dcim import Devices
+from tests.benchmarks.inventory import dataset
+from tests.benchmarks.server import StandInServer
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+BENCHMARKS = {}
+
+
+def benchmark(function):
+    """Registers a benchmark.
+
+    The function is called with the `Context` to set the benchmark up, and
+    returns the function to time, which takes no argument.
+    """
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+# pylint: disable=too-few-public-methods
+class Context:
+    """What benchmarks are set up with.
+
+    Attributes:
+        server (StandInServer): The running server.
+        devices (int): Number of devices in the dataset.
+        api (Api): An `Api` of the server, without threading.
+    """
+
+    def __init__(self, server, devices):
+        """Initialize the Context object."""
+        self.server = server
+        self.devices = devices
+        self.api = pynautobot.api(server.url, token="benchmark")
+        self._rows = None
+
+    def rows(self):
+        """Returns the devices as the server serializes them, fetched once."""
+        if self._rows is None:
+            self._rows, url = [], f"{self.server.base_url}/dcim/devices/"
+            while url:
+                page = self.api.http_session.get(url, headers={"Authorization": "Token benchmark"}).json()
+                self._rows.extend(page["results"])
+                url = page["next"]
+        return self._rows
+
+
+@benchmark
+def filter_serial(context):
+    """Fetches every device, one page after the other."""
+    return context.api.dcim.devices.all
+
+
+@benchmark
+def filter_threaded(context):
+    """Fetches every device, with pages fetched by a thread pool."""
+    api = pynautobot.api(context.server.url, token="benchmark", threading=True, max_workers=8)
+    return api.dcim.devices.all
+
+
+@benchmark
+def hydration(context):
+    """Makes records of every device."""
+    rows = context.rows()
+    endpoint = context.api.dcim.devices
+    return lambda: response_loader(rows, Devices, endpoint)
+
+
+@benchmark
+def diff(context):
+    """Diffs every device against its initial state, after changing one field."""
+    records = response_loader(context.rows(), Devices, context.api.dcim.devices)
+    for record in records:
+        record.serial = f"{record.serial}-new"
+    return lambda: [record._diff() for record in records]  # pylint: disable=protected-access
+
+
+@benchmark
+def save(context):
+    """Saves 100 devices after changing one field."""
+    records = context.api.dcim.devices.filter(limit=100)[:100]
+
+    def save_all():
+        for record in records:
+            record.serial = f"{record.serial}+"
+            record.save()
+
+    return save_all
+
+
+@benchmark
+def bulk_writes(context):
+    """Creates, updates and deletes a tenth of the number of devices, with one request each."""
+    endpoint = context.api.dcim.devices
+    location = context.api.dcim.locations.all()[0].id
+    count = max(context.devices // 10, 1)
+
+    def write():
+        created = endpoint.create([{"name": f"bulk-{i}", "location": location} for i in range(count)])
+        endpoint.update([{"id": record.id, "serial": "bulk"} for record in created])
+        endpoint.delete([record.id for record in created])
+
+    return write
+
+
+def measure(function, repeat):
+    """Returns the best and the median seconds of ``repeat`` runs of ``function``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def settings_key(args):
+    """Returns the key of the baselines of the settings of ``args``."""
+    server = "thread" if args.thread else "process"
+    return f"devices={args.devices} latency={args.latency} page_size={args.page_size} server={server}"
+
+
+def run(args):
+    """Runs the benchmarks selected by ``args``, and returns their best and median seconds."""
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise SystemExit(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    server = StandInServer(
+        functools.partial(dataset, devices=args.devices),
+        latency=args.latency,
+        page_size=args.page_size,
+        max_page_size=args.page_size,
+    )
+    results = {}
+    with server.start(process=not args.thread):
+        context = Context(server, args.devices)
+        for name in names:
+            results[name] = measure(BENCHMARKS[name](context), args.repeat)
+            print(f"{name:<20} best {results[name][0]:9.4f}s  median {results[name][1]:9.4f}s")
+    return results
+
+
+def check(results, baselines, tolerance):
+    """Returns the benchmarks slower than their baseline by more than ``tolerance``."""
+    return {
+        name: (best, baselines[name])
+        for name, (best, _) in results.items()
+        if name in baselines and best > baselines[name] * (1 + tolerance)
+    }
+
+
+def main(argv=None):
+    """Runs the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--devices", type=int, default=10000, help="number of devices, from 1000 to 1000000")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the server waits per request")
+    parser.add_argument("--page-size", type=int, default=1000, help="page size and max page size of the server")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark")
+    parser.add_argument("--only", default="", help=f"comma-separated benchmarks among {', '.join(BENCHMARKS)}")
+    parser.add_argument("--thread", action="store_true", help="serve from a thread, competing for the GIL")
+    parser.add_argument("--check", action="store_true", help="fail on regressions against the baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="slowdown allowed by --check")
+    parser.add_argument("--save", action="store_true", help="save the results as the baselines")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    try:
+        with open(BASELINES, encoding="utf-8") as baselines_file:
+            saved = json.load(baselines_file)
+    except FileNotFoundError:
+        saved = {}
+    key = settings_key(args)
+    baselines = saved.get(key, {}).get("results", {})
+    if args.save:
+        saved[key] = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": {**baselines, **{name: round(best, 6) for name, (best, _) in results.items()}},
+        }
+        with open(BASELINES, "w", encoding="utf-8") as baselines_file:
+            json.dump(saved, baselines_file, indent=2, sort_keys=True)
+            baselines_file.write("\n")
+    if args.check:
+        regressions = check(results, baselines, args.tolerance)
+        for name, (best, baseline) in regressions.items():
+            print(f"REGRESSION {name}: {best:.4f}s against a baseline of {baseline:.4f}s")
+        if not baselines:
+            print(f"No baselines for {key}, run with --save first.")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,552 @@
+"""Synthetic Nautobot inventories, for testing pynautobot at scale.
+
+An `Inventory` computes each of its objects from its index, so that it takes
+no memory however large it is, and is the same on every run. Its objects
+reference each other consistently: every device sits in a rack of its
+location, its interfaces are cabled to those of its neighbour and carry VLANs
+of its location, and its primary IP address belongs to the prefix of its VLAN.
+
+It is served by the `StandInServer` with `dataset()`, or written as the JSON
+pages of the REST API from the command line::
+
+    python -m tests.benchmarks.inventory --devices 100000 --output /tmp/inventory
+"""
+
+import argparse
+import ipaddress
+import json
+import math
+import os
+import sys
+import uuid
+from collections.abc import Sequence
+
+from tests.benchmarks.server import Collection, object_id
+
+CREATED = "2024-01-01T00:00:00.000000Z"
+
+# Collections of an inventory, with the number in the IDs of their objects and their object type.
+PATHS = {
+    "dcim/location-types": (1, "dcim.locationtype"),
+    "dcim/locations": (2, "dcim.location"),
+    "dcim/racks": (3, "dcim.rack"),
+    "dcim/manufacturers": (4, "dcim.manufacturer"),
+    "dcim/device-types": (5, "dcim.devicetype"),
+    "dcim/platforms": (6, "dcim.platform"),
+    "dcim/devices": (7, "dcim.device"),
+    "dcim/interfaces": (8, "dcim.interface"),
+    "dcim/cables": (9, "dcim.cable"),
+    "extras/statuses": (10, "extras.status"),
+    "extras/roles": (11, "extras.role"),
+    "extras/tags": (12, "extras.tag"),
+    "ipam/namespaces": (13, "ipam.namespace"),
+    "ipam/vlans": (14, "ipam.vlan"),
+    "ipam/prefixes": (15, "ipam.prefix"),
+    "ipam/ip-addresses": (16, "ipam.ipaddress"),
+}
+_LOW_BITS = (1 << 64) - 1
+
+# Fields of the objects of each collection left out with exclude_m2m, or only returned with include.
+M2M_FIELDS = {
+    "dcim/devices": ("tags",),
+    "dcim/interfaces": ("tags", "tagged_vlans", "ip_addresses"),
+    "ipam/prefixes": ("locations", "tags"),
+    "ipam/ip-addresses": ("interfaces", "tags"),
+}
+OPTIONAL_FIELDS = {"dcim/devices": ("config_context",)}
+CHOICES = {
+    "dcim/interfaces": {
+        "type": [{"value": "1000base-t", "display": "1000BASE-T (1GE)"}],
+        "mode": [{"value": "access", "display": "Access"}, {"value": "tagged", "display": "Tagged"}],
+    },
+    "dcim/cables": {"type": [{"value": "cat6", "display": "CAT6"}]},
+    "ipam/prefixes": {"type": [{"value": "network", "display": "Network"}]},
+}
+
+
+class Objects(Sequence):
+    """The objects of one collection of an `Inventory`, computed on access."""
+
+    def __init__(self, inventory, path):
+        """Initialize the Objects object."""
+        self.inventory = inventory
+        self.path = path
+        self._make = getattr(inventory, "_" + path.rsplit("/", 1)[1].replace("-", "_"))
+
+    def __len__(self):
+        """Return the number of objects."""
+        return self.inventory.counts[self.path]
+
+    def __getitem__(self, index):
+        """Return the object at ``index``, or a list of the objects of a slice."""
+        if isinstance(index, slice):
+            return [self._make(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._make(index)
+
+    def find(self, object_id_):
+        """Returns the position of the object with ID ``object_id_``, or None."""
+        try:
+            number = uuid.UUID(object_id_).int
+        except (TypeError, ValueError):
+            return None
+        index = number & _LOW_BITS
+        return index if number >> 64 == PATHS[self.path][0] and index < len(self) else None
+
+
+# pylint: disable=too-many-instance-attributes, too-many-public-methods
+class Inventory:
+    """A consistent Nautobot inventory of any size.
+
+    Devices fill racks of ``devices_per_rack``, in sites of
+    ``racks_per_location`` racks, grouped in regions of
+    ``locations_per_region`` sites. Sites and regions are both locations, the
+    region being the parent of the site.
+
+    Each site has ``vlans_per_location`` VLANs, each with a /24 prefix
+    allocated from 10.0.0.0 upwards. The first interface of each device
+    carries one VLAN of its site and the primary IP address of the device, in
+    the prefix of the VLAN. Interface ``n`` of devices ``2k`` and ``2k + 1``
+    are cabled together.
+
+    Args:
+        base_url (str): Base URL of the API the objects link to.
+        devices (int, optional): Number of devices.
+        interfaces_per_device (int, optional): Interfaces of each device.
+        devices_per_rack (int, optional): Devices of each rack.
+        racks_per_location (int, optional): Racks of each site.
+        locations_per_region (int, optional): Sites of each region.
+        vlans_per_location (int, optional): VLANs and prefixes of each site.
+
+    Raises:
+        ValueError: If the prefixes of a site can't hold an address for each
+            of its devices.
+
+    Examples:
+        >>> inventory = Inventory("http://localhost:8000/api", devices=1000000)
+        >>> inventory.counts["dcim/interfaces"]
+        4000000
+        >>> inventory.page("dcim/devices", offset=999000, limit=1000, depth=1)["results"][0]["rack"]["name"]
+        'site-04995-rack-00'
+    """
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        base_url,
+        devices=1000,
+        interfaces_per_device=4,
+        devices_per_rack=20,
+        racks_per_location=10,
+        locations_per_region=10,
+        vlans_per_location=4,
+    ):
+        """Initialize the Inventory object."""
+        self.base_url = base_url.rstrip("/")
+        self.devices = devices
+        self.interfaces_per_device = interfaces_per_device
+        self.devices_per_rack = devices_per_rack
+        self.racks_per_location = racks_per_location
+        self.locations_per_region = locations_per_region
+        self.devices_per_location = devices_per_rack * racks_per_location
+        self.vlans_per_location = vlans_per_location
+        if math.ceil(self.devices_per_location / vlans_per_location) > 254:
+            raise ValueError("vlans_per_location is too low for the /24 prefixes to hold the devices of a site")
+        sites = math.ceil(devices / self.devices_per_location)
+        self.regions = math.ceil(sites / locations_per_region)
+        cabled = devices - devices % 2
+        self.counts = {
+            "dcim/location-types": 2,
+            "dcim/locations": self.regions + sites,
+            "dcim/racks": math.ceil(devices / devices_per_rack),
+            "dcim/manufacturers": 1,
+            "dcim/device-types": 2,
+            "dcim/platforms": 1,
+            "dcim/devices": devices,
+            "dcim/interfaces": devices * interfaces_per_device,
+            "dcim/cables": cabled // 2 * interfaces_per_device,
+            "extras/statuses": 1,
+            "extras/roles": 2,
+            "extras/tags": 1,
+            "ipam/namespaces": 1,
+            "ipam/vlans": sites * vlans_per_location,
+            "ipam/prefixes": sites * vlans_per_location,
+            "ipam/ip-addresses": devices,
+        }
+
+    def __len__(self):
+        """Return the number of objects."""
+        return sum(self.counts.values())
+
+    def objects(self, path):
+        """Returns the objects of the collection at ``path``, such as ``"dcim/devices"``, as a sequence."""
+        return Objects(self, path)
+
+    def collections(self):
+        """Returns the collections of the inventory, for the `StandInServer`, keyed by path."""
+        return {
+            path: Collection(
+                path,
+                number,
+                self.objects(path),
+                m2m=M2M_FIELDS.get(path, ()),
+                optional=OPTIONAL_FIELDS.get(path, ()),
+                choices=CHOICES.get(path),
+            )
+            for path, (number, _) in PATHS.items()
+        }
+
+    def ref(self, path, index):
+        """Returns the brief representation of object ``index`` of ``path``."""
+        number, object_type = PATHS[path]
+        object_id_ = object_id(number, index)
+        return {"id": object_id_, "object_type": object_type, "url": f"{self.base_url}/{path}/{object_id_}/"}
+
+    def resolve(self, url):
+        """Returns the object at ``url``, or None."""
+        path, _, object_id_ = url[len(self.base_url) + 1 :].rstrip("/").rpartition("/")
+        if path not in PATHS:
+            return None
+        index = Objects(self, path).find(object_id_)
+        return None if index is None else self.objects(path)[index]
+
+    def _base(self, path, index, display, **fields):
+        ref = self.ref(path, index)
+        return {
+            **ref,
+            "display": display,
+            "natural_slug": display.lower().replace(" ", "-") + "_" + ref["id"][-4:],
+            **fields,
+            "created": CREATED,
+            "last_updated": CREATED,
+            "notes_url": f"{ref['url']}notes/",
+            "custom_fields": {},
+        }
+
+    def _location_types(self, index):
+        name = ("Region", "Site")[index]
+        return self._base(
+            "dcim/location-types",
+            index,
+            name,
+            name=name,
+            parent=self.ref("dcim/location-types", 0) if index else None,
+            nestable=False,
+        )
+
+    def _locations(self, index):
+        region = index < self.regions
+        name = f"region-{index:04d}" if region else f"site-{index - self.regions:05d}"
+        return self._base(
+            "dcim/locations",
+            index,
+            name,
+            name=name,
+            location_type=self.ref("dcim/location-types", 0 if region else 1),
+            parent=None if region else self.ref("dcim/locations", (index - self.regions) // self.locations_per_region),
+            status=self.ref("extras/statuses", 0),
+            facility="" if region else f"DC{index - self.regions}",
+            description="",
+            tenant=None,
+        )
+
+    def _site_name(self, site):
+        return f"site-{site:05d}"
+
+    def _racks(self, index):
+        site, rack = divmod(index, self.racks_per_location)
+        name = f"{self._site_name(site)}-rack-{rack:02d}"
+        return self._base(
+            "dcim/racks",
+            index,
+            name,
+            name=name,
+            location=self.ref("dcim/locations", self.regions + site),
+            status=self.ref("extras/statuses", 0),
+            u_height=42,
+            serial=f"RK{index:010d}",
+            asset_tag=None,
+        )
+
+    def _manufacturers(self, index):
+        return self._base("dcim/manufacturers", index, "Acme", name="Acme", description="")
+
+    def _device_types(self, index):
+        model = ("AS-48", "CR-8")[index]
+        return self._base(
+            "dcim/device-types",
+            index,
+            f"Acme {model}",
+            manufacturer=self.ref("dcim/manufacturers", 0),
+            model=model,
+            u_height=1,
+            is_full_depth=True,
+        )
+
+    def _platforms(self, index):
+        return self._base("dcim/platforms", index, "Acme OS", name="Acme OS", network_driver="acme_os")
+
+    def _device_name(self, index):
+        return f"device-{index:08d}"
+
+    def _devices(self, index):
+        name = self._device_name(index)
+        site = index // self.devices_per_location
+        return self._base(
+            "dcim/devices",
+            index,
+            name,
+            name=name,
+            device_type=self.ref("dcim/device-types", index % 2),
+            role=self.ref("extras/roles", index % 2),
+            platform=self.ref("dcim/platforms", 0),
+            status=self.ref("extras/statuses", 0),
+            location=self.ref("dcim/locations", self.regions + site),
+            rack=self.ref("dcim/racks", index // self.devices_per_rack),
+            position=index % self.devices_per_rack * 2 + 1,
+            face="front",
+            serial=f"SN{index:010d}",
+            asset_tag=None,
+            primary_ip4=self.ref("ipam/ip-addresses", index),
+            primary_ip6=None,
+            tags=[self.ref("extras/tags", 0)],
+            config_context={"ntp_servers": ["10.255.0.1", "10.255.0.2"], "site": self._site_name(site)},
+        )
+
+    def _vlan(self, device):
+        """Returns the index of the VLAN of ``device``."""
+        site, position = divmod(device, self.devices_per_location)
+        return site * self.vlans_per_location + position % self.vlans_per_location
+
+    def _interfaces(self, index):
+        device, port = divmod(index, self.interfaces_per_device)
+        cabled = device < self.devices - self.devices % 2
+        name = f"eth{port}"
+        return self._base(
+            "dcim/interfaces",
+            index,
+            f"{self._device_name(device)}:{name}",
+            name=name,
+            device=self.ref("dcim/devices", device),
+            type="1000base-t",
+            enabled=True,
+            mtu=1500,
+            mac_address=f"02:00:{index >> 24 & 255:02x}:{index >> 16 & 255:02x}:{index >> 8 & 255:02x}:{index & 255:02x}",
+            mode="access" if port == 0 else None,
+            untagged_vlan=self.ref("ipam/vlans", self._vlan(device)) if port == 0 else None,
+            tagged_vlans=[],
+            ip_addresses=[self.ref("ipam/ip-addresses", device)] if port == 0 else [],
+            cable=self.ref("dcim/cables", device // 2 * self.interfaces_per_device + port) if cabled else None,
+            cable_peer_type="dcim.interface" if cabled else None,
+            description="",
+            tags=[],
+        )
+
+    def _cables(self, index):
+        pair, port = divmod(index, self.interfaces_per_device)
+        a = 2 * pair * self.interfaces_per_device + port
+        b = a + self.interfaces_per_device
+        return self._base(
+            "dcim/cables",
+            index,
+            f"#{index}",
+            termination_a_type="dcim.interface",
+            termination_a_id=object_id(PATHS["dcim/interfaces"][0], a),
+            termination_a=self.ref("dcim/interfaces", a),
+            termination_b_type="dcim.interface",
+            termination_b_id=object_id(PATHS["dcim/interfaces"][0], b),
+            termination_b=self.ref("dcim/interfaces", b),
+            type="cat6",
+            status=self.ref("extras/statuses", 0),
+            label="",
+            color="",
+        )
+
+    def _statuses(self, index):
+        return self._base("extras/statuses", index, "Active", name="Active", color="4caf50")
+
+    def _roles(self, index):
+        name = ("access", "core")[index]
+        return self._base("extras/roles", index, name, name=name, color="2196f3", weight=None)
+
+    def _tags(self, index):
+        return self._base("extras/tags", index, "managed", name="managed", color="9e9e9e")
+
+    def _namespaces(self, index):
+        return self._base("ipam/namespaces", index, "Global", name="Global", description="")
+
+    def _vlans(self, index):
+        site, number = divmod(index, self.vlans_per_location)
+        vid = 100 + number
+        return self._base(
+            "ipam/vlans",
+            index,
+            f"{self._site_name(site)}-vlan{vid} ({vid})",
+            vid=vid,
+            name=f"{self._site_name(site)}-vlan{vid}",
+            location=self.ref("dcim/locations", self.regions + site),
+            vlan_group=None,
+            status=self.ref("extras/statuses", 0),
+            role=None,
+        )
+
+    def _network(self, index):
+        """Returns the /24 network of prefix ``index``."""
+        return ipaddress.IPv4Network(((10 << 24) + index * 256, 24))
+
+    def _prefixes(self, index):
+        network = str(self._network(index))
+        site = index // self.vlans_per_location
+        return self._base(
+            "ipam/prefixes",
+            index,
+            network,
+            prefix=network,
+            network=network.split("/", maxsplit=1)[0],
+            prefix_length=24,
+            type="network",
+            namespace=self.ref("ipam/namespaces", 0),
+            vlan=self.ref("ipam/vlans", index),
+            locations=[self.ref("dcim/locations", self.regions + site)],
+            status=self.ref("extras/statuses", 0),
+            tags=[],
+        )
+
+    def _ip_addresses(self, index):
+        vlan = self._vlan(index)
+        host = index % self.devices_per_location // self.vlans_per_location + 1
+        address = f"{self._network(vlan)[host]}/24"
+        return self._base(
+            "ipam/ip-addresses",
+            index,
+            address,
+            address=address,
+            host=address.split("/", maxsplit=1)[0],
+            mask_length=24,
+            type="host",
+            parent=self.ref("ipam/prefixes", vlan),
+            status=self.ref("extras/statuses", 0),
+            dns_name=f"{self._device_name(index)}.example.net",
+            interfaces=[self.ref("dcim/interfaces", index * self.interfaces_per_device)],
+            tags=[],
+        )
+
+    def serialize(self, row, depth=0, exclude_m2m=False, include=()):
+        """Returns ``row`` as the REST API serializes it with these query parameters."""
+        path = row["url"][len(self.base_url) + 1 :].rsplit("/", 2)[0]
+        serialized = {}
+        for field, value in row.items():
+            if field in OPTIONAL_FIELDS.get(path, ()) and field not in include:
+                continue
+            if exclude_m2m and field in M2M_FIELDS.get(path, ()):
+                continue
+            if depth and isinstance(value, dict) and "url" in value:
+                value = self.serialize(self.resolve(value["url"]), depth - 1)
+            elif depth and isinstance(value, list):
+                value = [self.serialize(self.resolve(item["url"]), depth - 1) for item in value]
+            serialized[field] = value
+        return serialized
+
+    def page(self, path, offset=0, limit=1000, depth=0):
+        """Returns a page of the objects of ``path``, as the REST API returns it.
+
+        Args:
+            path (str): Path of the collection, such as ``"dcim/devices"``.
+            offset (int, optional): Position of the first object of the page.
+            limit (int, optional): Number of objects per page.
+            depth (int, optional): Depth of the nested objects.
+
+        Returns:
+            (dict): The ``count``, ``next`` and ``previous`` URLs, and ``results``.
+        """
+        objects = self.objects(path)
+        depth_param = f"&depth={depth}" if depth else ""
+
+        def link(offset):
+            return f"{self.base_url}/{path}/?limit={limit}&offset={offset}{depth_param}"
+
+        return {
+            "count": len(objects),
+            "next": link(offset + limit) if offset + limit < len(objects) else None,
+            "previous": link(max(offset - limit, 0)) if offset else None,
+            "results": [self.serialize(row, depth) for row in objects[offset : offset + limit]],
+        }
+
+    def pages(self, path, limit=1000, depth=0):
+        """Yields every page of the objects of ``path``, see `page()`."""
+        for offset in range(0, max(len(self.objects(path)), 1), limit):
+            yield self.page(path, offset, limit, depth)
+
+    def write(self, directory, limit=1000, depth=0, paths=None):
+        """Writes the pages of the inventory as JSON files.
+
+        The pages of a collection are written to
+        ``<directory>/<path>/<offset>.json``, such as
+        ``/tmp/inventory/dcim/devices/000000001000.json``.
+
+        Args:
+            directory (str): Directory to write the pages to.
+            limit (int, optional): Number of objects per page.
+            depth (int, optional): Depth of the nested objects.
+            paths (list, optional): Paths of the collections to write. Defaults to all of them.
+
+        Returns:
+            (int): The number of pages written.
+        """
+        written = 0
+        for path in paths or PATHS:
+            os.makedirs(os.path.join(directory, path), exist_ok=True)
+            for offset, page in enumerate(self.pages(path, limit, depth)):
+                with open(os.path.join(directory, path, f"{offset * limit:012d}.json"), "w", encoding="utf-8") as f:
+                    json.dump(page, f, separators=(",", ":"))
+                written += 1
+        return written
+
+
+def dataset(base_url, **sizes):
+    """Returns the collections of an `Inventory` of ``sizes``, for the `StandInServer`.
+
+    Examples:
+        >>> StandInServer(functools.partial(dataset, devices=100000))
+    """
+    return Inventory(base_url, **sizes).collections()
+
+
+def main(argv=None):
+    """Writes the pages of an inventory from the command line."""
+    parser = argparse.ArgumentParser(description="Write a synthetic Nautobot inventory as JSON pages.")
+    parser.add_argument("--output", required=True, help="directory to write the pages to")
+    parser.add_argument("--base-url", default="http://localhost:8000/api", help="base URL the objects link to")
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--interfaces-per-device", type=int, default=4)
+    parser.add_argument("--devices-per-rack", type=int, default=20)
+    parser.add_argument("--racks-per-location", type=int, default=10)
+    parser.add_argument("--locations-per-region", type=int, default=10)
+    parser.add_argument("--vlans-per-location", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=0, help="depth of the nested objects")
+    parser.add_argument("--only", default="", help="comma-separated paths of the collections to write")
+    args = parser.parse_args(argv)
+
+    sizes = {
+        name: getattr(args, name)
+        for name in (
+            "devices",
+            "interfaces_per_device",
+            "devices_per_rack",
+            "racks_per_location",
+            "locations_per_region",
+            "vlans_per_location",
+        )
+    }
+    inventory = Inventory(args.base_url, **sizes)
+    written = inventory.write(args.output, args.page_size, args.depth, args.only.split(",") if args.only else None)
+    print(f"Wrote {written} pages of {len(inventory)} objects to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,528 @@
+"""A lightweight stand-in for the Nautobot REST and GraphQL APIs.
+
+`StandInServer` serves in-memory `Collection` objects over HTTP with
+Nautobot's limit/offset pagination, ``depth``, ``exclude_m2m`` and
+``include``, bulk writes, OPTIONS, a small GraphQL subset and cable traces,
+with a configurable latency. It runs in a thread or in a child process of the
+benchmarks, so that nothing but pynautobot is measured offline.
+"""
+
+import json
+import multiprocessing
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+API_VERSION = "2.4"
+BRIEF_FIELDS = ("id", "object_type", "url")
+# Query parameters that aren't filters.
+RESERVED_PARAMS = frozenset(("limit", "offset", "depth", "exclude_m2m", "include", "sort", "format", "brief"))
+
+_GRAPHQL_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\$?[A-Za-z_][A-Za-z0-9_]*|-?\d+|[{}():,\[\]!]')
+
+
+def object_id(number, index):
+    """Returns the ID of object ``index`` of collection ``number``, the same on every run."""
+    return str(uuid.UUID(int=(number << 64) | index))
+
+
+def brief(row):
+    """Returns the brief representation of ``row``, as nested in other objects with ``depth=0``."""
+    return {field: row[field] for field in BRIEF_FIELDS if field in row}
+
+
+# pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-positional-arguments
+class Collection:
+    """The objects of one endpoint.
+
+    Args:
+        path (str): Path of the endpoint below ``/api/``, such as ``"dcim/devices"``.
+        number (int): Number of the collection, unique in the dataset, used in
+            the IDs of the objects created.
+        rows (Sequence, optional): The objects, with brief nested objects. A
+            sequence computing its items on demand, such as the collections
+            of an `Inventory`, keeps large datasets out of memory until they
+            are written to. Its ``find(object_id)`` method, if any, returns
+            the position of an object without going through every object.
+        m2m (tuple, optional): List fields left out with ``exclude_m2m``.
+        optional (tuple, optional): Fields only returned with ``include``,
+            such as ``config_context``.
+        choices (dict, optional): Choices of fields, as lists of
+            ``{"value", "display"}`` dicts, for OPTIONS.
+    """
+
+    def __init__(self, path, number, rows=(), m2m=(), optional=(), choices=None):
+        """Initialize the Collection object."""
+        self.path = path
+        self.number = number
+        self.m2m = tuple(m2m)
+        self.optional = tuple(optional)
+        self.choices = dict(choices or {})
+        self._rows = rows
+        self._index = None
+        self._created = 0
+
+    def __len__(self):
+        """Return the number of objects."""
+        return len(self._rows)
+
+    def rows(self):
+        """Returns the objects, as a sequence."""
+        return self._rows
+
+    def _positions(self):
+        if self._index is None:
+            self._index = {row["id"]: position for position, row in enumerate(self._rows)}
+        return self._index
+
+    def get(self, object_id_):
+        """Returns the object with ID ``object_id_``, or None."""
+        if self._index is None and hasattr(self._rows, "find"):
+            position = self._rows.find(object_id_)
+        else:
+            position = self._positions().get(object_id_)
+        return None if position is None else self._rows[position]
+
+    def _writable(self):
+        if not isinstance(self._rows, list):
+            self._rows = list(self._rows)
+
+    def create(self, row, base_url):
+        """Stores a new object, giving it an ID and URL, and returns it."""
+        self._writable()
+        self._created += 1
+        new_id = object_id(self.number, (1 << 32) + self._created)
+        row = {"id": new_id, "url": f"{base_url}/{self.path}/{new_id}/", **row}
+        self._positions()[row["id"]] = len(self._rows)
+        self._rows.append(row)
+        return row
+
+    def update(self, object_id_, changes):
+        """Updates the object with ID ``object_id_`` and returns it, or None if it doesn't exist."""
+        self._writable()
+        position = self._positions().get(object_id_)
+        if position is None:
+            return None
+        self._rows[position] = {**self._rows[position], **changes}
+        return self._rows[position]
+
+    def delete(self, object_ids):
+        """Deletes the objects with IDs ``object_ids``, and returns whether they all existed."""
+        object_ids = set(object_ids)
+        self._writable()
+        if not object_ids <= self._positions().keys():
+            return False
+        self._rows = [row for row in self._rows if row["id"] not in object_ids]
+        self._index = None
+        return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Hands the requests over to the `StandInServer`."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which Nagle's algorithm would delay.
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        status, payload, headers = self.server.standin.handle(self.command, self.path, body)
+        data = b"" if payload is None else json.dumps(payload, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _handle
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep the benchmark output clean."""
+
+
+def _arguments(tokens, position, variables):
+    """Parses the GraphQL arguments starting at ``position``, after their ``(``."""
+    arguments = {}
+    while tokens[position] != ")":
+        if tokens[position] == ",":
+            position += 1
+            continue
+        name, value = tokens[position], tokens[position + 2]
+        position += 3
+        if value == "[":
+            value = []
+            while tokens[position] != "]":
+                if tokens[position] != ",":
+                    value.append(json.loads(tokens[position]))
+                position += 1
+            position += 1
+        elif value.startswith("$"):
+            value = variables.get(value[1:])
+        elif value[0] in '"-0123456789':
+            value = json.loads(value)
+        arguments[name] = value
+    return arguments, position + 1
+
+
+def _serve(server, queue):
+    """Serves ``server`` in a child process, sending its URL to the parent."""
+    server.bind()
+    queue.put(server.url)
+    server.serve_forever()
+
+
+# pylint: disable=too-many-instance-attributes
+class StandInServer:
+    """Serves a dataset like Nautobot does.
+
+    Args:
+        dataset (callable): Called with the base URL of the API, such as
+            ``"http://127.0.0.1:8123/api"``, to return the collections to
+            serve, keyed by their path.
+        latency (float, optional): Seconds to wait before answering each request.
+        row_latency (float, optional): Seconds to wait per object returned, to
+            model the cost of serializing them.
+        page_size (int, optional): Objects per page without a ``limit``.
+        max_page_size (int, optional): Largest page size, used for ``limit=0``.
+        api_version (str, optional): REST API version in the ``API-Version`` header.
+
+    Examples:
+        >>> with StandInServer(functools.partial(inventory.dataset, devices=1000), latency=0.005) as server:
+        ...     nb = pynautobot.api(server.url, token="abc")
+        ...     len(nb.dcim.devices.all())
+        1000
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self, dataset, latency=0.0, row_latency=0.0, page_size=50, max_page_size=1000, api_version=API_VERSION
+    ):
+        """Initialize the StandInServer object."""
+        self.dataset = dataset
+        self.latency = latency
+        self.row_latency = row_latency
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.api_version = api_version
+        self.collections = {}
+        self.url = None
+        self._httpd = None
+        self._thread = None
+        self._process = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        """Start the server in a thread."""
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """Stop the server."""
+        self.stop()
+
+    @property
+    def base_url(self):
+        """The base URL of the API."""
+        return f"{self.url}/api"
+
+    def bind(self):
+        """Opens the socket on a free local port and builds the dataset."""
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self.collections = self.dataset(self.base_url)
+
+    def serve_forever(self):
+        """Serves requests until `stop()` is called."""
+        self._httpd.serve_forever(poll_interval=0.05)
+
+    def start(self, process=False):
+        """Starts serving in a thread, or in a child process so that it doesn't compete for the GIL.
+
+        Args:
+            process (bool, optional): Serve from a child process. The dataset
+                and writes then live in that process.
+
+        Returns:
+            (StandInServer): The server, with its `url` set.
+        """
+        if process:
+            queue = multiprocessing.get_context("spawn").Queue()
+            self._process = multiprocessing.get_context("spawn").Process(target=_serve, args=(self, queue), daemon=True)
+            self._process.start()
+            self.url = queue.get(timeout=300)
+            return self
+        self.bind()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __getstate__(self):
+        """Return the picklable state of the StandInServer object, before it is bound."""
+        return {k: v for k, v in self.__dict__.items() if k not in ("_httpd", "_thread", "_process", "_lock")}
+
+    def __setstate__(self, state):
+        """Restore the StandInServer object from its pickled state."""
+        self.__dict__.update(state)
+        self._httpd = self._thread = self._process = None
+        self._lock = threading.Lock()
+
+    def handle(self, method, target, body):
+        """Answers a request.
+
+        Args:
+            method (str): HTTP method.
+            target (str): Path and query string of the request.
+            body (Any): Decoded JSON body, or None.
+
+        Returns:
+            (tuple): The status code, JSON payload and extra headers.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlsplit(target)
+        params = parse_qs(url.query, keep_blank_values=True)
+        path = url.path[len("/api/") :].strip("/") if url.path.startswith("/api/") else None
+        headers = {"API-Version": self.api_version}
+        if path == "":
+            return 200, {path: f"{self.base_url}/{path}/" for path in self.collections}, headers
+        if path == "status":
+            return 200, {"nautobot-version": f"{self.api_version}.0", "plugins": {}}, headers
+        if path == "graphql" and method == "POST":
+            return 200, self.graphql(body["query"], body.get("variables") or {}), headers
+        collection, rest = self._route(path)
+        if collection is None:
+            return 404, {"detail": "Not found."}, headers
+        with self._lock:
+            status, payload = self._dispatch(method, collection, rest, params, body)
+        if self.row_latency and isinstance(payload, dict) and "results" in payload:
+            time.sleep(self.row_latency * len(payload["results"]))
+        return status, payload, headers
+
+    def _route(self, path):
+        """Returns the collection of ``path`` and the segments after its own."""
+        parts = (path or "").split("/")
+        for size in (3, 2):
+            collection = self.collections.get("/".join(parts[:size]))
+            if collection is not None:
+                return collection, parts[size:]
+        return None, []
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments, too-many-return-statements
+    def _dispatch(self, method, collection, rest, params, body):
+        depth = int(params.get("depth", ["0"])[0] or 0)
+        options = {
+            "depth": depth,
+            "exclude_m2m": params.get("exclude_m2m", ["false"])[0].lower() == "true",
+            "include": {field for value in params.get("include", []) for field in value.split(",")},
+        }
+        if not rest:
+            if method == "GET":
+                return 200, self.list(collection, params, options)
+            if method == "OPTIONS":
+                return 200, self.options(collection)
+            if method == "POST":
+                rows = [self._create(collection, row) for row in (body if isinstance(body, list) else [body])]
+                rendered = [self.render(collection, row, options) for row in rows]
+                return 201, rendered if isinstance(body, list) else rendered[0]
+            if method in ("PATCH", "PUT"):
+                rows = [collection.update(row["id"], self._link(collection, row)) for row in body]
+                if None in rows:
+                    return 400, {"detail": "Unknown object in bulk update."}
+                return 200, [self.render(collection, row, options) for row in rows]
+            if method == "DELETE":
+                return (204, None) if collection.delete(row["id"] for row in body) else (404, None)
+            return 405, {"detail": f'Method "{method}" not allowed.'}
+        row = collection.get(rest[0])
+        if row is None:
+            return 404, {"detail": "Not found."}
+        if rest[1:] == ["trace"]:
+            return 200, self.trace(row)
+        if method == "GET":
+            return 200, self.render(collection, row, options)
+        if method in ("PATCH", "PUT"):
+            return 200, self.render(collection, collection.update(row["id"], self._link(collection, body)), options)
+        if method == "DELETE":
+            collection.delete([row["id"]])
+            return 204, None
+        return 405, {"detail": f'Method "{method}" not allowed.'}
+
+    def lookup(self, url):
+        """Returns the collection and object of ``url``, or ``(None, None)``."""
+        collection, rest = self._route(urlsplit(url).path[len("/api/") :].strip("/"))
+        if collection is None or not rest:
+            return None, None
+        return collection, collection.get(rest[0])
+
+    def render(self, collection, row, options):
+        """Returns ``row`` as Nautobot would serialize it with these options."""
+        depth = options["depth"]
+        rendered = {}
+        for field, value in row.items():
+            if field in collection.optional and field not in options["include"]:
+                continue
+            if field in collection.m2m and options["exclude_m2m"]:
+                continue
+            if depth and isinstance(value, dict) and "url" in value:
+                value = self._expand(value, {**options, "depth": depth - 1})
+            elif depth and isinstance(value, list):
+                value = [self._expand(item, {**options, "depth": depth - 1}) for item in value]
+            rendered[field] = value
+        return rendered
+
+    def _expand(self, value, options):
+        if not isinstance(value, dict) or "url" not in value:
+            return value
+        collection, row = self.lookup(value["url"])
+        return value if row is None else self.render(collection, row, {**options, "include": set()})
+
+    def _matches(self, row, field, values):
+        if field == "q":
+            return any(value.lower() in str(row.get("name", "")).lower() for value in values)
+        if field.endswith("__gte"):
+            return str(row.get(field[:-5], "")) >= values[0]
+        value = row.get(field)
+        if isinstance(value, dict):
+            if value.get("id") in values:
+                return True
+            _, related = self.lookup(value.get("url", ""))
+            return related is not None and related.get("name") in values
+        if isinstance(value, bool):
+            value = str(value).lower()
+        return str(value) in values
+
+    def list(self, collection, params, options):
+        """Returns a page of the objects of ``collection`` matching the filters of ``params``."""
+        rows = collection.rows()
+        filters = {field: values for field, values in params.items() if field not in RESERVED_PARAMS}
+        if "id" in filters:
+            rows = [row for row in map(collection.get, filters.pop("id")) if row is not None]
+        if filters:
+            rows = [row for row in rows if all(self._matches(row, f, values) for f, values in filters.items())]
+        if "sort" in params:
+            field = params["sort"][0]
+            rows = sorted(rows, key=lambda row: str(row.get(field.lstrip("-"), "")), reverse=field.startswith("-"))
+        limit = int(params["limit"][0]) if "limit" in params else self.page_size
+        limit = self.max_page_size if limit <= 0 else min(limit, self.max_page_size)
+        offset = int(params.get("offset", ["0"])[0])
+        page_url = f"{self.base_url}/{collection.path}/"
+
+        def link(offset):
+            return f"{page_url}?{urlencode({**{k: v[0] for k, v in params.items()}, 'limit': limit, 'offset': offset})}"
+
+        return {
+            "count": len(rows),
+            "next": link(offset + limit) if offset + limit < len(rows) else None,
+            "previous": link(max(offset - limit, 0)) if offset else None,
+            "results": [self.render(collection, row, options) for row in rows[offset : offset + limit]],
+        }
+
+    def _link(self, collection, data):
+        """Returns ``data`` with IDs of related objects replaced by their brief representation."""
+        sample = collection.rows()[0] if len(collection) else {}
+        linked = {}
+        for field, value in data.items():
+            reference = sample.get(field)
+            if isinstance(value, str) and isinstance(reference, dict) and "url" in reference:
+                related_collection, _ = self.lookup(reference["url"])
+                related = related_collection.get(value) if related_collection is not None else None
+                value = brief(related) if related is not None else value
+            linked[field] = value
+        return linked
+
+    def _create(self, collection, data):
+        return collection.create(self._link(collection, data), self.base_url)
+
+    def options(self, collection):
+        """Returns the OPTIONS response of ``collection``, in the format of Nautobot 2.4."""
+        sample = collection.rows()[0] if len(collection) else {}
+        fields = {}
+        for field, value in sample.items():
+            fields[field] = {"type": "list" if isinstance(value, list) else "field", "required": False}
+            if field in collection.choices:
+                fields[field] = {"type": "choice", "required": False, "choices": collection.choices[field]}
+        return {"name": collection.path, "actions": {"POST": fields}}
+
+    def trace(self, row):
+        """Returns the cable trace of the interface or port ``row``."""
+        cable_ref = row.get("cable")
+        hop = [self.lookup(row["url"])]
+        if cable_ref:
+            hop.append(self.lookup(cable_ref["url"]))
+            ends = [hop[1][1].get("termination_a"), hop[1][1].get("termination_b")]
+            peer_ref = ends[1] if ends[0] and ends[0]["id"] == row["id"] else ends[0]
+            hop.append(self.lookup(peer_ref["url"]) if peer_ref else (None, None))
+        hop += [(None, None)] * (3 - len(hop))
+        # Like Nautobot, the trace serializes the objects with a depth of 1.
+        options = {"depth": 1, "exclude_m2m": False, "include": set()}
+        return [[self.render(collection, item, options) if item else None for collection, item in hop]]
+
+    def graphql(self, query, variables):
+        """Answers a GraphQL query selecting fields of collections, such as ``{ devices(name: "sw1") { name } }``.
+
+        Arguments filter on fields like query parameters do, and ``$variables``
+        are substituted. Fragments, aliases and mutations aren't supported.
+        """
+        tokens = _GRAPHQL_TOKEN.findall(query)
+        position = tokens.index("{")
+        selection, _ = self._selection(tokens, position + 1, variables)
+        by_name = {
+            path.rsplit("/", 1)[-1].replace("-", "_"): collection for path, collection in self.collections.items()
+        }
+        data = {}
+        for field, (arguments, fields) in selection.items():
+            collection = by_name.get(field)
+            if collection is None:
+                return {"data": None, "errors": [{"message": f"Cannot query field {field!r} on type 'Query'."}]}
+            params = {name: value if isinstance(value, list) else [value] for name, value in arguments.items()}
+            rows = [
+                row
+                for row in collection.rows()
+                if all(self._matches(row, name, [str(v) for v in values]) for name, values in params.items())
+            ]
+            data[field] = [self._select(row, fields) for row in rows]
+        return {"data": data}
+
+    def _selection(self, tokens, position, variables):
+        """Parses the selection set starting at ``position``, after its ``{``."""
+        selection = {}
+        while tokens[position] != "}":
+            field = tokens[position]
+            position += 1
+            arguments, fields = {}, None
+            if tokens[position] == "(":
+                arguments, position = _arguments(tokens, position + 1, variables)
+            if tokens[position] == "{":
+                fields, position = self._selection(tokens, position + 1, variables)
+            selection[field] = (arguments, fields)
+            while tokens[position] == ",":
+                position += 1
+        return selection, position + 1
+
+    def _select(self, row, fields):
+        selected = {}
+        for field, (_, subfields) in fields.items():
+            value = row.get(field)
+            if subfields is not None and isinstance(value, dict) and "url" in value:
+                _, related = self.lookup(value["url"])
+                value = self._select(related, subfields) if related is not None else None
+            elif subfields is not None and isinstance(value, list):
+                value = [self._select(self.lookup(item["url"])[1] or item, subfields) for item in value]
+            selected[field] = value
+        return selected
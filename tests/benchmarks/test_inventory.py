@@ -0,0 +1,99 @@
+"""Synthetic inventory tests."""
+
+import ipaddress
+import json
+import os
+import tempfile
+import unittest
+
+from tests.benchmarks.inventory import PATHS, Inventory
+
+BASE_URL = "http://localhost:8000/api"
+
+
+def references(value):
+    """Yields the nested objects of ``value``."""
+    if isinstance(value, dict) and "url" in value:
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from references(item)
+
+
+class InventoryTestCase(unittest.TestCase):
+    """Synthetic inventory test cases."""
+
+    def setUp(self):
+        self.inventory = Inventory(BASE_URL, devices=501, devices_per_rack=10, racks_per_location=5)
+
+    def test_counts(self):
+        counts = self.inventory.counts
+        self.assertEqual(counts["dcim/racks"], 51)
+        # 11 sites, in 2 regions.
+        self.assertEqual(counts["dcim/locations"], 13)
+        self.assertEqual(counts["dcim/interfaces"], 2004)
+        # The last device has no neighbour to be cabled to.
+        self.assertEqual(counts["dcim/cables"], 1000)
+        self.assertEqual(counts["ipam/prefixes"], 44)
+        self.assertEqual(len(self.inventory), sum(counts.values()))
+
+    def test_references(self):
+        for path in PATHS:
+            for row in self.inventory.objects(path):
+                self.assertEqual(self.inventory.resolve(row["url"]), row)
+                for field, value in row.items():
+                    for reference in references(value):
+                        target = self.inventory.resolve(reference["url"])
+                        self.assertIsNotNone(target, f"{path} {field}")
+                        self.assertEqual(target["object_type"], reference["object_type"])
+
+    def test_consistency(self):
+        inventory = self.inventory
+        for device in inventory.objects("dcim/devices"):
+            rack = inventory.resolve(device["rack"]["url"])
+            self.assertEqual(rack["location"], device["location"])
+            ip_address = inventory.resolve(device["primary_ip4"]["url"])
+            prefix = inventory.resolve(ip_address["parent"]["url"])
+            self.assertIn(ipaddress.ip_interface(ip_address["address"]), ipaddress.ip_network(prefix["prefix"]))
+            self.assertEqual(prefix["locations"], [device["location"]])
+            interface = inventory.resolve(ip_address["interfaces"][0]["url"])
+            self.assertEqual(interface["device"]["id"], device["id"])
+            self.assertEqual(interface["untagged_vlan"], prefix["vlan"])
+        addresses = [row["address"] for row in inventory.objects("ipam/ip-addresses")]
+        self.assertEqual(len(set(addresses)), len(addresses))
+        for cable in inventory.objects("dcim/cables"):
+            for end in ("termination_a", "termination_b"):
+                self.assertEqual(inventory.resolve(cable[end]["url"])["cable"]["id"], cable["id"])
+
+    def test_pages(self):
+        pages = list(self.inventory.pages("dcim/devices", limit=200, depth=1))
+        self.assertEqual([len(page["results"]) for page in pages], [200, 200, 101])
+        self.assertEqual(pages[0]["next"], f"{BASE_URL}/dcim/devices/?limit=200&offset=200&depth=1")
+        self.assertIsNone(pages[-1]["next"])
+        self.assertEqual(pages[-1]["results"][-1]["location"]["name"], "site-00010")
+        self.assertNotIn("config_context", pages[0]["results"][0])
+        self.assertEqual(pages[0]["results"][0]["tags"][0]["name"], "managed")
+
+    def test_find(self):
+        devices = self.inventory.objects("dcim/devices")
+        self.assertEqual(devices.find(devices[-1]["id"]), 500)
+        self.assertIsNone(devices.find(self.inventory.objects("dcim/racks")[0]["id"]))
+        self.assertIsNone(devices.find("device-0"))
+        with self.assertRaises(IndexError):
+            devices[501]  # pylint: disable=pointless-statement
+
+    def test_large(self):
+        inventory = Inventory(BASE_URL, devices=10000000)
+        page = inventory.page("dcim/interfaces", offset=39999000, limit=1000)
+        self.assertEqual(page["count"], 40000000)
+        self.assertEqual(page["results"][-1]["display"], "device-09999999:eth3")
+
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(self.inventory.write(directory, limit=250, paths=["dcim/racks", "ipam/vlans"]), 2)
+            with open(os.path.join(directory, "dcim", "racks", "000000000000.json"), encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["count"], 51)
+
+    def test_too_many_devices_per_vlan(self):
+        with self.assertRaises(ValueError):
+            Inventory(BASE_URL, devices_per_rack=40, racks_per_location=50, vlans_per_location=4)
@@ -0,0 +1,73 @@
+"""Stand-in server tests."""
+
+import functools
+import unittest
+
+import pynautobot
+from tests.benchmarks import bench
+from tests.benchmarks.inventory import dataset
+from tests.benchmarks.server import StandInServer
+
+
+class StandInServerTestCase(unittest.TestCase):
+    """Stand-in server test cases."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer(functools.partial(dataset, devices=30), page_size=10, max_page_size=20)
+        cls.server.start()
+        cls.api = pynautobot.api(cls.server.url, token="abc")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_pagination(self):
+        self.assertEqual(self.api.version, "2.4")
+        self.assertEqual(len(self.api.dcim.devices.all()), 30)
+        threaded = pynautobot.api(self.server.url, token="abc", threading=True)
+        self.assertEqual(len(threaded.dcim.interfaces.all()), 120)
+        page = self.server.handle("GET", "/api/dcim/devices/?limit=0&offset=20", None)[1]
+        self.assertEqual((page["count"], len(page["results"]), page["next"]), (30, 10, None))
+
+    def test_filters_and_depth(self):
+        devices = self.api.dcim.devices.filter(location="site-00000", depth=1, exclude_m2m=True)
+        self.assertEqual(len(devices), 30)
+        self.assertEqual(devices[0].location.name, "site-00000")
+        self.assertNotIn("tags", devices[0].__dict__)
+        self.assertNotIn("config_context", devices[0].__dict__)
+        device = self.api.dcim.devices.get(name="device-00000003", include="config_context")
+        self.assertEqual(device.config_context["ntp_servers"][0], "10.255.0.1")
+
+    def test_writes(self):
+        location = self.api.dcim.locations.all()[0].id
+        created = self.api.dcim.devices.create([{"name": "new-0", "location": location}, {"name": "new-1"}])
+        self.assertEqual(created[0].location.id, location)
+        updated = self.api.dcim.devices.update([{"id": record.id, "serial": "new"} for record in created])
+        self.assertEqual({record.serial for record in updated}, {"new"})
+        updated[0].serial = "newer"
+        self.assertTrue(updated[0].save())
+        self.assertEqual(self.api.dcim.devices.get(created[0].id).serial, "newer")
+        self.assertTrue(self.api.dcim.devices.delete([record.id for record in created]))
+        self.assertEqual(self.api.dcim.devices.count(), 30)
+
+    def test_options_graphql_and_trace(self):
+        self.assertEqual(self.api.dcim.interfaces.choices()["type"][0]["value"], "1000base-t")
+        query = "query ($name: [String]) { devices(name: $name) { name location { name } } }"
+        response = self.api.graphql.query(query, variables={"name": ["device-00000001"]})
+        self.assertEqual(
+            response.json["data"]["devices"], [{"name": "device-00000001", "location": {"name": "site-00000"}}]
+        )
+        interface = self.api.dcim.interfaces.get(name="eth1", device="device-00000000")
+        ((near, cable, far),) = interface.trace()
+        self.assertEqual((str(near), str(far)), ("device-00000000:eth1", "device-00000001:eth1"))
+        self.assertEqual(str(cable), "device-00000000:eth1 <> device-00000001:eth1")
+
+
+class BenchTestCase(unittest.TestCase):
+    """Benchmark runner test cases."""
+
+    def test_check(self):
+        results = {"hydration": (1.3, 1.4), "diff": (1.0, 1.0), "save": (5.0, 5.0)}
+        regressions = bench.check(results, {"hydration": 1.0, "diff": 1.0}, tolerance=0.25)
+        self.assertEqual(regressions, {"hydration": (1.3, 1.0)})
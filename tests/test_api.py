@@ -138,5 +138,6 @@ class ApiRetryTestCase(unittest.TestCase):
                 retries=2,
             )
             # Assert that the retries are set on the session
-            self.assertEqual(api.http_session.adapters["http://"].max_retries.total, 2)
-            self.assertEqual(api.http_session.adapters["https://"].max_retries.total, 2)
+            self.assertEqual(api.http_session.retry.retries, 2)
+            self.assertIs(api.http_session.retry, api.retry)
+            self.assertFalse(api.retry.allows("POST"))
@@ -0,0 +1,103 @@
+"""Cassette tests."""
+
+import gzip
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+import requests_mock
+
+import pynautobot
+from pynautobot.core.cassette import Cassette, CassetteError, request_key
+
+URL = "http://localhost:8000/api/dcim/devices/"
+
+
+def pages(request, _):
+    """Answers like a server with a page size of 2 and 3 devices."""
+    offset = int(request.qs.get("offset", ["0"])[0])
+    rows = [{"id": f"device-{i}", "name": f"sw{i}", "url": f"{URL}device-{i}/"} for i in range(3)]
+    return {
+        "count": 3,
+        "next": f"{URL}?limit=2&offset={offset + 2}" if offset + 2 < 3 else None,
+        "results": rows[offset : offset + 2],
+    }
+
+
+class CassetteTestCase(unittest.TestCase):
+    """Cassette test cases."""
+
+    def setUp(self):
+        self.adapter = requests_mock.Adapter()
+        self.adapter.register_uri("GET", URL, json=pages, headers={"API-Version": "2.4", "Set-Cookie": "session=1"})
+        self.adapter.register_uri("PATCH", f"{URL}device-0/", json={"id": "device-0", "name": "sw0-new"})
+        self.api = pynautobot.api("http://localhost:8000", token="secret")
+        self.api.http_session.mount("http://", self.adapter)
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "script.cassette")
+
+    def script(self, api):
+        """Reads the devices and renames the first one."""
+        devices = api.dcim.devices.all()
+        devices[0].name = "sw0-new"
+        devices[0].save()
+        return [device.name for device in devices]
+
+    def test_record_and_replay(self):
+        with self.api.record(self.path) as cassette:
+            names = self.script(self.api)
+        self.assertEqual(
+            [(i["method"], i["url"]) for i in cassette.interactions][-1], ("PATCH", "/api/dcim/devices/device-0/")
+        )
+        self.assertEqual(len(cassette), 3)
+        with gzip.open(self.path, "rb") as cassette_file:
+            saved = cassette_file.read()
+        self.assertNotIn(b"secret", saved)
+        self.assertNotIn(b"session=1", saved)
+        # Recording leaves the mounted adapters as they were.
+        self.assertIs(self.api.http_session.get_adapter(URL), self.adapter)
+
+        api = pynautobot.api("https://nautobot.example.com", token="other")
+        with api.replay(self.path, latency=0) as replayed:
+            self.assertEqual(self.script(api), names)
+            self.assertEqual(api.dcim.devices.all()[2].name, "sw2")
+            with self.assertRaises(CassetteError):
+                api.dcim.racks.all()
+        self.assertEqual(replayed.interactions[0]["headers"]["API-Version"], "2.4")
+        self.assertEqual(self.adapter.call_count, 3)
+
+    def test_latency(self):
+        cassette = Cassette()
+        with self.api.record(cassette=cassette):
+            self.api.dcim.devices.all()
+        cassette.interactions[0]["elapsed"] = 0.2
+        for latency, expected in ((1, 0.2), (0, 0.0)):
+            start = time.monotonic()
+            with self.api.replay(cassette, latency=latency):
+                self.api.dcim.devices.all()
+            self.assertAlmostEqual(time.monotonic() - start, expected, delta=0.1)
+
+    def test_errors(self):
+        self.adapter.register_uri("GET", f"{URL}?name=sw9", exc=requests.exceptions.ConnectTimeout)
+        with self.api.record(self.path):
+            with self.assertRaises(requests.exceptions.ConnectTimeout):
+                self.api.dcim.devices.get(name="sw9")
+        with self.api.replay(self.path, latency=0):
+            with self.assertRaises(requests.exceptions.ConnectTimeout):
+                self.api.dcim.devices.get(name="sw9")
+
+    def test_request_key(self):
+        self.assertEqual(
+            request_key("get", "https://a/api/dcim/devices/?b=2&a=1", None),
+            request_key("GET", "http://b:8000/api/dcim/devices/?a=1&b=2", b""),
+        )
+        self.assertNotEqual(request_key("POST", URL, '{"name": "sw1"}'), request_key("POST", URL, '{"name": "sw2"}'))
+
+    def test_load_rejects_other_files(self):
+        with gzip.open(self.path, "wt") as cassette_file:
+            cassette_file.write('{"format": 99}\n')
+        with self.assertRaises(ValueError):
+            Cassette.load(self.path)
@@ -0,0 +1,108 @@
+"""Adaptive concurrency tests."""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+import requests_mock
+
+import pynautobot
+from pynautobot.core.concurrency import AdaptiveLimiter, parse_retry_after
+
+
+class AdaptiveLimiterTestCase(unittest.TestCase):
+    """AdaptiveLimiter test cases."""
+
+    def run_requests(self, limiter, count, **outcome):
+        """Sends ``count`` requests through ``limiter``, all with the same outcome."""
+        for _ in range(count):
+            limiter.acquire()
+            limiter.release(**outcome)
+
+    def test_additive_increase(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=4)
+        self.run_requests(limiter, 50, latency=0.1, status_code=200)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.stats()["increases"], 2)
+        self.assertEqual([entry[1] for entry in limiter.history], [3, 4])
+
+    def test_multiplicative_decrease_on_overload(self):
+        limiter = AdaptiveLimiter(initial=8, max_limit=8)
+        self.run_requests(limiter, 1, status_code=503)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.history[-1][2], "status 503")
+
+    def test_decrease_on_error(self):
+        limiter = AdaptiveLimiter(initial=8, max_limit=8, min_limit=3)
+        self.run_requests(limiter, 1, error=True)
+        self.run_requests(limiter, 1, error=True)
+        self.assertEqual(limiter.limit, 3)
+
+    def test_decrease_on_rising_latency(self):
+        limiter = AdaptiveLimiter(initial=8, max_limit=8)
+        self.run_requests(limiter, 5, latency=0.001, status_code=200)
+        self.run_requests(limiter, 20, latency=0.01, status_code=200)
+        self.assertLess(limiter.limit, 8)
+        self.assertIn("latency", [entry[2] for entry in limiter.history])
+
+    def test_retry_after_pauses(self):
+        limiter = AdaptiveLimiter()
+        self.run_requests(limiter, 1, status_code=429, retry_after=0.2)
+        self.assertGreater(limiter.stats()["paused_for"], 0)
+        start = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_acquire_blocks_at_limit(self):
+        limiter = AdaptiveLimiter(initial=1, max_limit=1)
+        limiter.acquire()
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(latency=0.01, status_code=200)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(initial=10, max_limit=4)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after(None), 0.0)
+        self.assertEqual(parse_retry_after("garbage"), 0.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+
+class SessionLimiterTestCase(unittest.TestCase):
+    """Adaptive limiter wired into the Api session."""
+
+    @patch("pynautobot.api.version", "2.0")
+    def test_api_limiter(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123", max_workers=8, adaptive_concurrency=True)
+        self.assertIs(api.http_session.limiter, api.concurrency)
+        self.assertEqual(api.concurrency.limit, 8)
+        self.assertEqual(api.concurrency.max_limit, 32)
+        self.assertEqual(api.pool_size, 32)
+        self.assertEqual(api.dcim.devices._filter_request().max_workers, 32)  # pylint: disable=protected-access
+        with requests_mock.Mocker() as mock:
+            mock.get("http://localhost:8000/api/dcim/devices/", json={"count": 0, "next": None, "results": []})
+            api.dcim.devices.all()
+            mock.get("http://localhost:8000/api/dcim/devices/", status_code=503, headers={"Retry-After": "0"}, json={})
+            with self.assertRaises(pynautobot.RequestError):
+                api.dcim.devices.all()
+            mock.get("http://localhost:8000/api/dcim/devices/", exc=requests.exceptions.ConnectionError)
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                api.dcim.devices.all()
+        stats = api.concurrency.stats()
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertGreaterEqual(stats["decreases"], 1)
+
+    @patch("pynautobot.api.version", "2.0")
+    def test_api_no_limiter(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123")
+        self.assertIsNone(api.concurrency)
+        self.assertEqual(api.pool_size, api.max_workers)
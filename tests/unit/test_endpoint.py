@@ -4,6 +4,7 @@ import unittest
 from unittest.mock import Mock, patch
 
 from pynautobot.core.endpoint import Endpoint, GraphqlEndpoint, JobsEndpoint
+from pynautobot.core.query import MultipleResultsError, Request
 from pynautobot.core.response import Record
 
 
@@ -48,6 +49,63 @@ class EndPointTestCase(unittest.TestCase):
             with self.assertRaises(ValueError) as _:
                 self.test_obj.filter(test="test", limit=0, offset=1)
 
+    def test_get_kwargs_limits_page(self):
+        with patch("pynautobot.core.query.Request._make_call", return_value=Mock()) as mock:
+            mock.return_value = {"count": 5000, "next": "http://next", "results": [{"id": 123}, {"id": 321}]}
+            with self.assertRaises(MultipleResultsError):
+                self.test_obj.get(name="test")
+            mock.assert_called_once_with(add_params={"limit": 2, "offset": 0})
+
+    def test_get_or_none(self):
+        with patch("pynautobot.core.query.Request._make_call", return_value=Mock()) as mock:
+            mock.return_value = {"count": 2, "next": None, "results": [{"id": 123}, {"id": 321}]}
+            self.assertIsNone(self.test_obj.get_or_none(name="test"))
+            mock.return_value = {"count": 1, "next": None, "results": [{"id": 123}]}
+            self.assertEqual(self.test_obj.get_or_none(name="test").id, 123)
+            with self.assertRaises(ValueError):
+                self.test_obj.get_or_none(name="test", pagination="sideways")
+
+    def test_get_ignores_limit_and_offset(self):
+        with patch("pynautobot.core.query.Request._make_call", return_value=Mock()) as mock:
+            mock.return_value = {"count": 1, "next": None, "results": [{"id": 123}]}
+            self.assertEqual(self.test_obj.get(name="test", limit=5, offset=10).id, 123)
+            mock.assert_called_once_with(add_params={"limit": 2, "offset": 0})
+
+    def test_first(self):
+        with patch("pynautobot.core.query.Request._make_call", return_value=Mock()) as mock:
+            mock.return_value = {"count": 5000, "next": "http://next", "results": [{"id": 123}]}
+            self.assertEqual(self.test_obj.first(name="test").id, 123)
+            mock.assert_called_once_with(add_params={"limit": 1, "offset": 0})
+            mock.return_value = {"count": 0, "next": None, "results": []}
+            self.assertIsNone(self.test_obj.first(name="test"))
+
+    def test_keyset_field(self):
+        app = Mock()
+        app.name = "ipam"
+        self.api.keyset_fields = {"ipam.ip_addresses": "host"}
+        endpoint = Endpoint(self.api, app, "ip_addresses")
+        self.assertEqual(endpoint._filter_request().keyset_field, "host")  # pylint: disable=protected-access
+        self.assertEqual(self.test_obj._filter_request().keyset_field, "created")  # pylint: disable=protected-access
+
+    def test_deadline(self):
+        with patch("pynautobot.core.query.Request._make_call", return_value=Mock()) as mock:
+            mock.return_value = {"count": 1, "next": None, "results": [{"id": 123}]}
+            with patch("pynautobot.core.query.Request.__init__", autospec=True, side_effect=Request.__init__) as init:
+                self.test_obj.filter(name="test", deadline=5)
+                self.test_obj.get(name="test", deadline=5)
+                self.test_obj.count(name="test", deadline=5)
+            for call in init.call_args_list:
+                self.assertIsNotNone(call.kwargs["deadline"])
+                self.assertNotIn("deadline", call.kwargs["filters"])
+
+    def test_exists(self):
+        with patch("pynautobot.core.query.Request._make_call", return_value=Mock()) as mock:
+            mock.return_value = {"count": 0, "next": None, "results": []}
+            self.assertFalse(self.test_obj.exists(name="test"))
+            mock.return_value = {"count": 3, "next": None, "results": [{"id": 123}]}
+            self.assertTrue(self.test_obj.exists(name="test"))
+            mock.assert_called_with(add_params={"limit": 1})
+
     def test_choices(self):
         with patch("pynautobot.core.query.Request.options", return_value=Mock()) as mock:
             mock.return_value = {
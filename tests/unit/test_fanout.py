@@ -0,0 +1,58 @@
+"""fetch_many tests."""
+
+import unittest
+from unittest.mock import Mock, patch
+
+import pynautobot
+from pynautobot.models.dcim import Devices
+
+from ..util import Response
+
+
+def fake_get(url, **_):
+    """Answers every list request with two records named after the endpoint."""
+    name = url.rstrip("/").rsplit("/", 1)[-1]
+    return Response(content={"count": 2, "next": None, "results": [{"id": f"{name}-1"}, {"id": f"{name}-2"}]})
+
+
+class FetchManyTestCase(unittest.TestCase):
+    """fetch_many test cases."""
+
+    @patch("pynautobot.api.version", "2.0")
+    def setUp(self):
+        self.api = pynautobot.api("http://localhost:8000", token="abc123", max_workers=4)
+
+    @patch("requests.sessions.Session.get", side_effect=fake_get)
+    def test_fetch_many(self, mock):
+        results = self.api.fetch_many(
+            {
+                "devices": "dcim.devices",
+                "vlans": ("ipam.vlans", {"vid": 10}),
+                "prefixes": self.api.ipam.prefixes,
+            }
+        )
+        self.assertEqual(list(results), ["devices", "vlans", "prefixes"])
+        self.assertIsInstance(results["devices"].records[0], Devices)
+        self.assertEqual(results["vlans"].records[1].id, "vlans-2")
+        self.assertGreaterEqual(results["prefixes"].elapsed, 0)
+        mock.assert_any_call(
+            "http://localhost:8000/api/ipam/vlans/",
+            params={"vid": 10},
+            json=None,
+            headers={"accept": "application/json;", "authorization": "Token abc123"},
+        )
+
+    @patch("requests.sessions.Session.get", side_effect=fake_get)
+    def test_fetch_many_stream(self, _):
+        results = list(self.api.fetch_many({"devices": "dcim.devices", "vlans": "ipam.vlans"}, stream=True))
+        self.assertEqual(sorted(r.name for r in results), ["devices", "vlans"])
+
+    def test_per_query_pagination_threads(self):
+        with patch("requests.sessions.Session.get", side_effect=fake_get) as mock:
+            self.api.fetch_many({"devices": "dcim.devices"})
+            self.assertEqual(mock.call_args.kwargs["params"], {"limit": 0})
+
+    @patch("requests.sessions.Session.get", return_value=Mock(ok=False, status_code=500, reason="Server Error"))
+    def test_fetch_many_error(self, _):
+        with self.assertRaises(pynautobot.RequestError):
+            self.api.fetch_many({"devices": "dcim.devices"})
@@ -0,0 +1,99 @@
+"""Federation tests."""
+
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+import requests_mock
+
+import pynautobot
+from pynautobot.core.federation import Federation
+from pynautobot.core.query import DeadlineExceeded
+
+
+def page(*names):
+    """Returns a page of devices named ``names``."""
+    return {"count": len(names), "next": None, "results": [{"id": name, "name": name} for name in names]}
+
+
+@patch("pynautobot.api.version", "2.0")
+class FederationTestCase(unittest.TestCase):
+    """Federation test cases."""
+
+    def make_federation(self, **kwargs):
+        """Returns a `Federation` of three instances."""
+        apis = {name: pynautobot.api(f"http://{name}", token="abc123") for name in ("us", "eu", "apac")}
+        return Federation(apis, **kwargs)
+
+    def test_filter(self, *_):
+        federation = self.make_federation()
+        with requests_mock.Mocker() as mock:
+            mock.get("http://us/api/dcim/devices/", json=page("us-1", "us-2"))
+            mock.get("http://eu/api/dcim/devices/", json=page("eu-1"))
+            mock.get("http://apac/api/dcim/devices/", exc=requests.exceptions.ConnectionError)
+            records = list(federation.filter("dcim.devices", platform="ios"))
+            self.assertEqual(mock.request_history[0].qs["platform"], ["ios"])
+        self.assertEqual(
+            sorted((source, record.name) for source, record in records),
+            [("eu", "eu-1"), ("us", "us-1"), ("us", "us-2")],
+        )
+        self.assertIsInstance(federation.errors["apac"], requests.exceptions.ConnectionError)
+
+    def test_count(self, *_):
+        federation = self.make_federation()
+        with requests_mock.Mocker() as mock:
+            mock.get("http://us/api/dcim/devices/", json={"count": 12})
+            mock.get("http://eu/api/dcim/devices/", json={"count": 3})
+            mock.get("http://apac/api/dcim/devices/", status_code=500, json={})
+            self.assertEqual(federation.count("dcim.devices"), {"us": 12, "eu": 3})
+        self.assertEqual(list(federation.errors), ["apac"])
+
+    def test_graphql(self, *_):
+        federation = self.make_federation()
+        with requests_mock.Mocker() as mock:
+            for name in ("us", "eu", "apac"):
+                mock.post(f"http://{name}/api/graphql/", json={"data": {"name": name}})
+            results = federation.graphql("query { name }")
+        self.assertEqual(
+            {source: record.json["data"]["name"] for source, record in results.items()},
+            {
+                "us": "us",
+                "eu": "eu",
+                "apac": "apac",
+            },
+        )
+
+    def test_graphql_deadline(self, *_):
+        federation = self.make_federation(deadline=5)
+        with requests_mock.Mocker() as mock:
+            for name in ("us", "eu", "apac"):
+                mock.post(f"http://{name}/api/graphql/", json={"data": {"name": name}})
+            federation.graphql("query { name }")
+            self.assertLessEqual(mock.last_request.timeout, 5)
+
+    def test_deadline_starts_with_query(self, *_):
+        def devices(**_):
+            time.sleep(0.06)
+            return ["device"]
+
+        apis = {name: Mock(**{"dcim.devices.filter.side_effect": devices}) for name in ("us", "eu")}
+        federation = Federation(apis, deadline=0.1, max_workers=1)
+        self.assertEqual(len(list(federation.filter("dcim.devices"))), 2)
+        self.assertEqual(federation.errors, {})
+
+    def test_deadline(self, *_):
+        def make_api(delay):
+            def devices(**_):
+                time.sleep(delay)
+                return ["device"]
+
+            return Mock(**{"dcim.devices.filter.side_effect": devices})
+
+        federation = Federation({"us": make_api(0), "eu": make_api(0), "apac": make_api(1)}, deadline=0.1)
+        start = time.monotonic()
+        sources = sorted(source for source, _ in federation.filter("dcim.devices"))
+        self.assertLess(time.monotonic() - start, 0.8)
+        self.assertEqual(sources, ["eu", "us"])
+        self.assertIsInstance(federation.errors["apac"], DeadlineExceeded)
+        federation.apis["us"].dcim.devices.filter.assert_called_with(deadline=0.1)
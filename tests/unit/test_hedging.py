@@ -0,0 +1,110 @@
+"""Hedged request tests."""
+
+import itertools
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import requests_mock
+
+import pynautobot
+from pynautobot.core.hedging import HedgingPolicy
+
+
+def make_send(delays, error_on=()):
+    """Returns a send function whose n-th call sleeps ``delays[n]`` seconds."""
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def send(*_, **__):
+        with lock:
+            call = next(counter)
+        time.sleep(delays[call])
+        if call in error_on:
+            raise ConnectionError("reset")
+        return Mock(call=call)
+
+    return send
+
+
+class HedgingPolicyTestCase(unittest.TestCase):
+    """HedgingPolicy test cases."""
+
+    def warm(self, policy, latency=0.01):
+        """Feeds ``min_samples`` latencies to ``policy`` so that it starts hedging."""
+        for _ in range(policy.min_samples):
+            policy.observe(latency)
+
+    def test_no_hedge_without_samples(self):
+        policy = HedgingPolicy(max_extra=1)
+        self.assertEqual(policy.send(make_send([0.05, 0])).call, 0)
+        self.assertEqual(policy.stats()["hedged"], 0)
+        self.assertIsNone(policy._pool)  # pylint: disable=protected-access
+
+    def test_queued_request_not_hedged(self):
+        policy = HedgingPolicy(max_extra=1, max_workers=1)
+        self.warm(policy, latency=0.02)
+        self.assertEqual(policy.send(make_send([0.01])).call, 0)
+        busy = policy._pool.submit(time.sleep, 0.1)  # pylint: disable=protected-access
+        self.assertEqual(policy.send(make_send([0.01, 0])).call, 0)
+        busy.result()
+        self.assertEqual(policy.stats()["hedged"], 0)
+
+    def test_hedge_wins(self):
+        policy = HedgingPolicy(max_extra=1)
+        self.warm(policy)
+        self.assertEqual(policy.send(make_send([0.3, 0])).call, 1)
+        stats = policy.stats()
+        self.assertEqual((stats["requests"], stats["hedged"], stats["hedge_wins"]), (1, 1, 1))
+
+    def test_primary_wins(self):
+        policy = HedgingPolicy(max_extra=1)
+        self.warm(policy)
+        self.assertEqual(policy.send(make_send([0.05, 0.3])).call, 0)
+        self.assertEqual(policy.stats()["hedge_wins"], 0)
+
+    def test_fast_request_not_hedged(self):
+        policy = HedgingPolicy(max_extra=1)
+        self.warm(policy, latency=0.2)
+        policy.send(make_send([0, 0]))
+        self.assertEqual(policy.stats()["hedged"], 0)
+
+    def test_budget(self):
+        policy = HedgingPolicy(max_extra=0.5)
+        self.warm(policy)
+        for _ in range(4):
+            policy.send(make_send([0.03, 0.03]))
+        self.assertEqual(policy.stats()["hedged"], 2)
+
+    def test_failed_primary(self):
+        policy = HedgingPolicy(max_extra=1)
+        self.warm(policy)
+        self.assertEqual(policy.send(make_send([0.05, 0.1], error_on=(0,))).call, 1)
+        with self.assertRaises(ConnectionError):
+            policy.send(make_send([0.05, 0.1], error_on=(0, 1)))
+
+    def test_invalid_quantile(self):
+        with self.assertRaises(ValueError):
+            HedgingPolicy(quantile=95)
+
+
+class SessionHedgingTestCase(unittest.TestCase):
+    """Hedging wired into the Api session."""
+
+    @patch("pynautobot.api.version", "2.0")
+    def test_api_hedging(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123", hedging=True)
+        self.assertIs(api.http_session.hedging, api.hedging)
+        with requests_mock.Mocker() as mock:
+            mock.get("http://localhost:8000/api/dcim/devices/", json={"count": 0, "next": None, "results": []})
+            mock.post("http://localhost:8000/api/dcim/devices/", json={"id": 1})
+            api.dcim.devices.all()
+            api.dcim.devices.create(name="test")
+        self.assertEqual(api.hedging.stats()["requests"], 1)
+        self.assertEqual(len(api.hedging._latencies), 1)  # pylint: disable=protected-access
+
+    @patch("pynautobot.api.version", "2.0")
+    def test_api_no_hedging(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123")
+        self.assertIsNone(api.hedging)
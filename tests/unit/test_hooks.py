@@ -0,0 +1,167 @@
+"""Hooks and metrics tests."""
+
+import unittest
+from unittest.mock import patch
+
+import requests
+import requests_mock
+
+import pynautobot
+from pynautobot.core.hooks import Hooks, MetricsCollector, RequestEvent, endpoint_name, url_template
+
+URL = "http://localhost:8000/api/dcim/devices/"
+DEVICE_ID = "5b39ba88-e5ab-4be2-89f5-5a016473b53c"
+
+
+def pages(request, _):
+    """Answers like a server with two pages of one device."""
+    offset = int(request.qs.get("offset", ["0"])[0])
+    return {
+        "count": 2,
+        "next": f"{URL}?limit=1&offset=1" if offset == 0 else None,
+        "results": [{"id": f"device-{offset}", "name": f"sw{offset}"}],
+    }
+
+
+class UrlTestCase(unittest.TestCase):
+    """URL naming test cases."""
+
+    def test_url_template(self):
+        self.assertEqual(url_template(f"{URL}{DEVICE_ID}/?depth=1"), "/api/dcim/devices/{id}/")
+        self.assertEqual(url_template("http://localhost:8000/api/users/users/12/"), "/api/users/users/{id}/")
+        self.assertEqual(url_template(URL), "/api/dcim/devices/")
+
+    def test_endpoint_name(self):
+        self.assertEqual(endpoint_name(f"{URL}{DEVICE_ID}/"), "dcim.devices")
+        self.assertEqual(endpoint_name(f"{URL}{DEVICE_ID}/napalm/"), "dcim.devices")
+        self.assertEqual(endpoint_name("http://localhost:8000/api/ipam/ip-addresses/"), "ipam.ip_addresses")
+        self.assertEqual(
+            endpoint_name("http://localhost:8000/api/plugins/golden-config/configs/"), "plugins.golden_config.configs"
+        )
+
+
+class HooksTestCase(unittest.TestCase):
+    """Hooks test cases."""
+
+    def setUp(self):
+        self.api = pynautobot.api("http://localhost:8000", token="abc")
+        self.events = []
+        self.mock = requests_mock.Mocker()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.mock.get(URL, json=pages)
+        self.mock.get(f"{URL}{DEVICE_ID}/", json={"id": DEVICE_ID, "name": "sw1"})
+
+    def record(self, event):
+        """Keeps a copy of the name and attributes of ``event``."""
+        self.events.append((event.event, dict(vars(event))))
+
+    def register_all(self):
+        """Records every event."""
+        for event in ("before_request", "after_response", "on_retry", "on_page"):
+            self.api.hooks.register(event, self.record)
+
+    def test_no_handlers(self):
+        self.assertFalse(self.api.hooks)
+        with patch("pynautobot.core.session.RequestEvent") as request_event:
+            self.api.dcim.devices.get(DEVICE_ID)
+        request_event.assert_not_called()
+
+    def test_request_events(self):
+        self.register_all()
+        self.assertTrue(self.api.hooks)
+        self.api.dcim.devices.get(DEVICE_ID)
+        self.assertEqual([name for name, _ in self.events], ["before_request", "after_response"])
+        before, after = (attrs for _, attrs in self.events)
+        self.assertEqual(before["method"], "GET")
+        self.assertEqual(before["url_template"], "/api/dcim/devices/{id}/")
+        self.assertEqual(before["endpoint"], "dcim.devices")
+        self.assertIsNone(before["status"])
+        self.assertEqual(after["status"], 200)
+        self.assertEqual(after["bytes_in"], len(b'{"id": "%s", "name": "sw1"}' % DEVICE_ID.encode()))
+        self.assertGreaterEqual(after["latency"], 0)
+
+    def test_bytes_out(self):
+        self.register_all()
+        self.mock.post(URL, json={"id": DEVICE_ID, "name": "sw1"}, status_code=201)
+        self.api.dcim.devices.create(name="sw1")
+        self.assertEqual(self.events[0][1]["bytes_out"], len(b'{"name": "sw1"}'))
+
+    def test_pages(self):
+        self.register_all()
+        self.api.dcim.devices.all()
+        page_events = [attrs for name, attrs in self.events if name == "on_page"]
+        self.assertEqual([event["page"] for event in page_events], [0, 1])
+        self.assertEqual(page_events[0]["endpoint"], "dcim.devices")
+
+    def test_retry(self):
+        self.api = pynautobot.api("http://localhost:8000", token="abc", retries=1)
+        self.register_all()
+        self.mock.get(f"{URL}{DEVICE_ID}/", [{"status_code": 503}, {"json": {"id": DEVICE_ID, "name": "sw1"}}])
+        with patch("pynautobot.core.session.time.sleep"):
+            self.api.dcim.devices.get(DEVICE_ID)
+        names = [name for name, _ in self.events]
+        self.assertEqual(names, ["before_request", "after_response", "on_retry", "before_request", "after_response"])
+        self.assertEqual(self.events[2][1]["attempt"], 0)
+        self.assertGreater(self.events[2][1]["delay"], 0)
+
+    def test_error(self):
+        self.register_all()
+        self.mock.get(f"{URL}{DEVICE_ID}/", exc=requests.exceptions.ConnectionError)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.api.dcim.devices.get(DEVICE_ID)
+        self.assertIsInstance(self.events[-1][1]["error"], requests.exceptions.ConnectionError)
+
+    def test_failing_handler(self):
+        def fail(_):
+            raise RuntimeError("bug in a hook")
+
+        self.api.hooks.register("before_request", fail)
+        with self.assertLogs("pynautobot.core.hooks", "ERROR"):
+            self.assertEqual(self.api.dcim.devices.get(DEVICE_ID).name, "sw1")
+
+    def test_unregister(self):
+        self.api.hooks.register("before_request", self.record)
+        self.api.hooks.unregister("before_request", self.record)
+        self.assertFalse(self.api.hooks)
+        with self.assertRaises(ValueError):
+            self.api.hooks.register("on_something", self.record)
+
+
+class MetricsCollectorTestCase(unittest.TestCase):
+    """Metrics collector test cases."""
+
+    def test_stats(self):
+        api = pynautobot.api("http://localhost:8000", token="abc")
+        metrics = api.hooks.attach(MetricsCollector(buckets=(0.1, 1.0)))
+        with requests_mock.Mocker() as mock:
+            mock.get(URL, json=pages)
+            mock.get(f"{URL}{DEVICE_ID}/", status_code=404, json={"detail": "Not found."})
+            api.dcim.devices.all()
+            api.dcim.devices.get(DEVICE_ID)
+        stats = metrics.stats()["GET dcim.devices"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["pages"], 2)
+        self.assertEqual(stats["retries"], 0)
+        self.assertGreater(stats["bytes_in"], 0)
+        self.assertEqual(stats["latency"]["count"], 3)
+        self.assertEqual(list(stats["latency"]["buckets"]), [0.1, 1.0, "+Inf"])
+        self.assertEqual(sum(stats["latency"]["buckets"].values()), 3)
+
+        api.hooks.detach(metrics)
+        self.assertFalse(api.hooks)
+        metrics.reset()
+        self.assertEqual(metrics.stats(), {})
+
+    def test_histogram_buckets(self):
+        metrics = MetricsCollector(buckets=(0.1, 1.0))
+        hooks = Hooks()
+        hooks.attach(metrics)
+        for latency in (0.05, 0.1, 0.5, 3.0):
+            event = RequestEvent("GET", URL)
+            event.status, event.bytes_in, event.latency = 200, 10, latency
+            hooks.emit("after_response", event)
+        stats = metrics.stats()["GET dcim.devices"]["latency"]
+        self.assertEqual(stats["buckets"], {0.1: 2, 1.0: 1, "+Inf": 1})
+        self.assertAlmostEqual(stats["sum"], 3.65)
@@ -0,0 +1,146 @@
+"""Lazy-load policy tests."""
+
+import pickle
+import unittest
+
+import requests_mock
+
+import pynautobot
+from pynautobot.core.lazyload import LazyLoadError, LazyLoadPolicy
+
+BASE = "http://localhost:8000/api"
+INTERFACES = f"{BASE}/dcim/interfaces/"
+DEVICES = f"{BASE}/dcim/devices/"
+
+
+def device(index):
+    """Returns the full details of device ``index``."""
+    return {"id": f"device-{index}", "name": f"sw{index}", "url": f"{DEVICES}device-{index}/", "serial": f"S{index}"}
+
+
+def interfaces(request, _):
+    """Answers with one interface on each of 4 devices, with brief nested devices."""
+    rows = [
+        {
+            "id": f"interface-{i}",
+            "name": "eth0",
+            "url": f"{INTERFACES}interface-{i}/",
+            "device": {"id": f"device-{i}", "url": f"{DEVICES}device-{i}/"},
+        }
+        for i in range(4)
+    ]
+    if "id" in request.qs:
+        rows = [row for row in rows if row["id"] in request.qs["id"]]
+    return {"count": len(rows), "next": None, "results": rows}
+
+
+def devices(request, _):
+    """Answers with the devices whose ID is filtered on."""
+    rows = [device(i) for i in range(4) if f"device-{i}" in request.qs.get("id", [])]
+    return {"count": len(rows), "next": None, "results": rows}
+
+
+class LazyLoadTestCase(unittest.TestCase):
+    """Lazy-load policy test cases."""
+
+    def setUp(self):
+        self.mock = requests_mock.Mocker()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.mock.get(INTERFACES, json=interfaces)
+        self.mock.get(DEVICES, json=devices)
+        for i in range(4):
+            self.mock.get(f"{DEVICES}device-{i}/", json=device(i))
+
+    def device_requests(self):
+        """Returns the number of requests sent to the devices endpoint."""
+        return sum(1 for request in self.mock.request_history if request.path.startswith("/api/dcim/devices/"))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            pynautobot.api("http://localhost:8000", token="abc", lazy_loads="never")
+
+    def test_allow(self):
+        api = pynautobot.api("http://localhost:8000", token="abc")
+        self.assertEqual(api.lazy_loads.mode, "allow")
+        with api.lazy_loads.track() as stats:
+            serials = [interface.device.serial for interface in api.dcim.interfaces.all()]
+        self.assertEqual(serials, ["S0", "S1", "S2", "S3"])
+        self.assertEqual(self.device_requests(), 4)
+        self.assertEqual(stats.requests, 4)
+        self.assertEqual(stats.loads, {"dcim.devices.serial": 4})
+        # Reading attributes the records already have isn't counted.
+        with api.lazy_loads.track() as stats:
+            self.assertEqual(api.dcim.interfaces.all()[0].name, "eth0")
+        self.assertEqual(stats.requests, 0)
+        self.assertEqual(api.lazy_loads.stats.requests, 4)
+
+    def test_nested_tracking(self):
+        api = pynautobot.api("http://localhost:8000", token="abc")
+        records = api.dcim.interfaces.all()
+        with api.lazy_loads.track() as outer:
+            _ = records[0].device.serial
+            with api.lazy_loads.track() as inner:
+                _ = records[1].device.serial
+        self.assertEqual((outer.requests, inner.requests), (2, 1))
+
+    def test_warn(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", lazy_loads=LazyLoadPolicy("warn", threshold=2))
+        records = api.dcim.interfaces.all()
+        _ = records[0].device.serial
+        with self.assertLogs("pynautobot.core.lazyload", "WARNING") as logs:
+            for record in records[1:]:
+                _ = record.device.serial
+        # Logged once per query, endpoint and attribute.
+        (message,) = logs.output
+        self.assertIn("'serial' of dcim.devices", message)
+        self.assertIn("test_lazyload.py", message)
+        self.assertEqual(self.device_requests(), 4)
+
+    def test_warn_below_threshold(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", lazy_loads="warn")
+        with self.assertNoLogs("pynautobot.core.lazyload"):
+            for record in api.dcim.interfaces.all():
+                _ = record.device.serial
+
+    def test_raise(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", lazy_loads="raise")
+        record = api.dcim.interfaces.all()[0]
+        with self.assertRaises(LazyLoadError):
+            _ = record.device.serial
+        self.assertFalse(hasattr(record.device, "serial"))
+        self.assertEqual(self.device_requests(), 0)
+        # Explicit loads are still allowed.
+        self.assertTrue(record.device.full_details())
+        self.assertEqual(record.device.serial, "S0")
+
+    def test_batch(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", lazy_loads="batch")
+        with api.lazy_loads.track() as stats:
+            serials = [interface.device.serial for interface in api.dcim.interfaces.all()]
+        self.assertEqual(serials, ["S0", "S1", "S2", "S3"])
+        self.assertEqual(self.device_requests(), 1)
+        request = self.mock.request_history[-1]
+        self.assertEqual(request.qs["id"], [f"device-{i}" for i in range(4)])
+        self.assertEqual((stats.requests, stats.batched), (1, 4))
+
+    def test_batch_separate_queries(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", lazy_loads="batch")
+        first = api.dcim.interfaces.filter(id=["interface-0", "interface-1"])
+        second = api.dcim.interfaces.filter(id=["interface-2", "interface-3"])
+        self.assertEqual(first[0].device.serial, "S0")
+        self.assertEqual(self.mock.request_history[-1].qs["id"], ["device-0", "device-1"])
+        self.assertEqual(second[1].device.serial, "S3")
+        self.assertEqual(self.device_requests(), 2)
+
+    def test_batch_falls_back_to_full_details(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", lazy_loads="batch")
+        self.mock.get(DEVICES, json={"count": 0, "next": None, "results": []})
+        record = api.dcim.interfaces.all()[0]
+        self.assertEqual(record.device.serial, "S0")
+        self.assertEqual(self.mock.request_history[-1].path, "/api/dcim/devices/device-0/")
+
+    def test_pickle(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", lazy_loads="batch")
+        record = api.dcim.interfaces.all()[0]
+        self.assertNotIn("_query", pickle.loads(pickle.dumps(record)).__dict__)
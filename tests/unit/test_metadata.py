@@ -0,0 +1,120 @@
+"""Metadata cache tests."""
+
+import os
+import pickle
+import tempfile
+import unittest
+
+import requests_mock
+
+import pynautobot
+from pynautobot.core.metadata import MetadataCache
+
+URL = "http://localhost:8000"
+OPTIONS = {"actions": {"POST": {"status": {"type": "choice", "choices": [{"value": "active", "display": "Active"}]}}}}
+
+
+class MetadataCacheTestCase(unittest.TestCase):
+    """Metadata cache test cases."""
+
+    def setUp(self):
+        self.mock = requests_mock.Mocker()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.mock.get(f"{URL}/api/", json={}, headers={"API-Version": "2.4"})
+        self.mock.options(f"{URL}/api/dcim/devices/", json=OPTIONS)
+        self.mock.get(f"{URL}/api/dcim/", json={"devices": f"{URL}/api/dcim/devices/"})
+        self.mock.get(f"{URL}/api/users/config/", json={"tables": {}})
+        self.mock.get(f"{URL}/api/docs/?format=openapi", json={"openapi": "3.0.3"})
+        self.mock.get(
+            f"{URL}/api/extras/custom-fields/",
+            json=lambda request, _: {"count": 1, "next": None, "results": [{"name": str(request.qs)}]},
+        )
+
+    def calls(self, method, path):
+        """Returns the number of ``method`` requests sent to ``path``."""
+        return sum(1 for req in self.mock.request_history if req.method == method and req.path == path)
+
+    def test_no_cache(self):
+        api = pynautobot.api(URL, token="abc")
+        self.assertIsNone(api.metadata)
+        api.dcim.devices.choices()
+        api.dcim.devices.choices()
+        self.assertEqual(self.calls("OPTIONS", "/api/dcim/devices/"), 2)
+        self.assertEqual(self.calls("GET", "/api/"), 0)
+
+    def test_shared_by_new_objects(self):
+        api = pynautobot.api(URL, token="abc", metadata_cache=True)
+        for _ in range(3):
+            self.assertEqual(api.dcim.devices.choices(), {"status": [{"value": "active", "display": "Active"}]})
+            self.assertIn("devices", dir(api.dcim))
+            self.assertEqual(api.users.config(), {"tables": {}})
+            self.assertEqual(api.openapi(), {"openapi": "3.0.3"})
+        self.assertEqual(self.calls("OPTIONS", "/api/dcim/devices/"), 1)
+        self.assertEqual(self.calls("GET", "/api/dcim/"), 1)
+        # The config of a user isn't metadata of the server.
+        self.assertEqual(self.calls("GET", "/api/users/config/"), 3)
+        self.assertEqual(self.calls("GET", "/api/docs/"), 1)
+        # The version is requested once for every entry.
+        self.assertEqual(self.calls("GET", "/api/"), 1)
+
+    def test_keyed_by_filters(self):
+        api = pynautobot.api(URL, token="abc", metadata_cache=True)
+        first = api.extras.get_custom_fields(filters={"content_types": "dcim.device"})
+        self.assertEqual(api.extras.get_custom_fields(filters={"content_types": "dcim.device"}), first)
+        self.assertNotEqual(api.extras.get_custom_fields(), first)
+        self.assertEqual(self.calls("GET", "/api/extras/custom-fields/"), 2)
+
+    def test_shared_by_apis(self):
+        cache = MetadataCache()
+        pynautobot.api(URL, token="abc", metadata_cache=cache).dcim.devices.choices()
+        pynautobot.api(URL, token="abc", metadata_cache=cache).dcim.devices.choices()
+        pynautobot.api("http://other", token="abc", metadata_cache=cache)
+        self.assertEqual(self.calls("OPTIONS", "/api/dcim/devices/"), 1)
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as path:
+            pynautobot.api(URL, token="abc", metadata_cache=path).dcim.devices.choices()
+            choices = pynautobot.api(URL, token="abc", metadata_cache=path).dcim.devices.choices()
+            self.assertEqual(choices, {"status": [{"value": "active", "display": "Active"}]})
+            self.assertEqual(self.calls("OPTIONS", "/api/dcim/devices/"), 1)
+
+    def test_version_change(self):
+        with tempfile.TemporaryDirectory() as path:
+            pynautobot.api(URL, token="abc", metadata_cache=path).dcim.devices.choices()
+            self.mock.get(f"{URL}/api/", json={}, headers={"API-Version": "2.5"})
+            pynautobot.api(URL, token="abc", metadata_cache=path).dcim.devices.choices()
+            self.assertEqual(self.calls("OPTIONS", "/api/dcim/devices/"), 2)
+
+    def test_refresh(self):
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "other"), "w", encoding="utf-8") as other:
+                other.write("kept")
+            api = pynautobot.api(URL, token="abc", metadata_cache=path)
+            api.dcim.devices.choices()
+            api.metadata.refresh(api)
+            api.dcim.devices.choices()
+            self.assertEqual(self.calls("OPTIONS", "/api/dcim/devices/"), 2)
+            self.assertEqual(self.calls("GET", "/api/"), 2)
+
+            api.metadata.refresh()
+            pynautobot.api(URL, token="abc", metadata_cache=path).dcim.devices.choices()
+            self.assertEqual(self.calls("OPTIONS", "/api/dcim/devices/"), 3)
+            self.assertEqual(os.listdir(path).count("other"), 1)
+
+    def test_unreadable_entry(self):
+        with tempfile.TemporaryDirectory() as path:
+            api = pynautobot.api(URL, token="abc", metadata_cache=path)
+            api.dcim.devices.choices()
+            for root, _, files in os.walk(path):
+                for name in files:
+                    with open(os.path.join(root, name), "w", encoding="utf-8") as entry:
+                        entry.write("{")
+            pynautobot.api(URL, token="abc", metadata_cache=path).dcim.devices.choices()
+            self.assertEqual(self.calls("OPTIONS", "/api/dcim/devices/"), 2)
+
+    def test_pickle(self):
+        api = pynautobot.api(URL, token="abc", metadata_cache=True)
+        api.dcim.devices.choices()
+        cache = pickle.loads(pickle.dumps(api.metadata))
+        self.assertEqual(cache.get(api, f"choices {URL}/api/dcim/devices None", dict), api.dcim.devices.choices())
@@ -0,0 +1,108 @@
+"""Import pipeline tests."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from pynautobot.core.pipeline import ImportPipeline, ref
+from pynautobot.core.resolver import Lookup
+
+
+def fake_create(calls, name):
+    """Returns a bulk ``create()`` that records its calls in ``calls``."""
+
+    def create(payloads):
+        calls.append((name, payloads))
+        return [Mock(id=f"{name}-{payload['name']}") for payload in payloads]
+
+    return create
+
+
+class ImportPipelineTestCase(unittest.TestCase):
+    """Import pipeline test cases."""
+
+    def setUp(self):
+        self.calls = []
+        self.api = Mock(max_workers=2)
+        self.api.dcim.location_types.create.side_effect = fake_create(self.calls, "location_types")
+        self.api.dcim.locations.create.side_effect = fake_create(self.calls, "locations")
+        self.dataset = {
+            "dcim.locations": [
+                {"_ref": "hq", "name": "HQ", "location_type": ref("region"), "status": "Active"},
+                {"_ref": "hq-b1", "name": "B1", "location_type": ref("building"), "parent": ref("hq")},
+            ],
+            "dcim.location_types": [
+                {"_ref": "region", "name": "Region"},
+                {"_ref": "building", "name": "Building", "parent": ref("region")},
+            ],
+        }
+
+    def test_plan(self):
+        plan = ImportPipeline(self.api, self.dataset).plan()
+        self.assertEqual(
+            plan,
+            [
+                {"dcim.location_types": ["region"]},
+                {"dcim.locations": ["hq"], "dcim.location_types": ["building"]},
+                {"dcim.locations": ["hq-b1"]},
+            ],
+        )
+
+    def test_run_resolves_references(self):
+        refs = ImportPipeline(self.api, self.dataset).run()
+        self.assertEqual(refs["hq-b1"], "locations-B1")
+        self.assertIn(
+            ("locations", [{"name": "B1", "location_type": "location_types-Building", "parent": "locations-HQ"}]),
+            self.calls,
+        )
+        self.assertEqual(self.calls[0], ("location_types", [{"name": "Region"}]))
+
+    def test_run_chunks(self):
+        dataset = {"dcim.location_types": [{"name": f"lt{i}"} for i in range(5)]}
+        refs = ImportPipeline(self.api, dataset, chunk_size=2).run()
+        self.assertEqual(sorted(len(payloads) for _, payloads in self.calls), [1, 2, 2])
+        self.assertEqual(refs["dcim.location_types#4"], "location_types-lt4")
+
+    def test_seed_refs(self):
+        dataset = {"dcim.locations": [{"name": "HQ", "location_type": ref("region")}]}
+        ImportPipeline(self.api, dataset, refs={"region": "1234"}).run()
+        self.assertEqual(self.calls, [("locations", [{"name": "HQ", "location_type": "1234"}])])
+
+    def test_unknown_reference(self):
+        dataset = {"dcim.locations": [{"name": "HQ", "location_type": ref("missing")}]}
+        with self.assertRaises(ValueError):
+            ImportPipeline(self.api, dataset).plan()
+
+    def test_circular_reference(self):
+        dataset = {
+            "dcim.locations": [
+                {"_ref": "a", "name": "A", "parent": ref("b")},
+                {"_ref": "b", "name": "B", "parent": ref("a")},
+            ]
+        }
+        with self.assertRaises(ValueError):
+            ImportPipeline(self.api, dataset).plan()
+
+    def test_checkpoint_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, "import.json")
+            self.api.dcim.locations.create.side_effect = RuntimeError("boom")
+            with self.assertRaises(RuntimeError):
+                ImportPipeline(self.api, self.dataset, checkpoint=checkpoint).run()
+            with open(checkpoint, encoding="utf-8") as f:
+                saved = json.load(f)
+            self.assertEqual(saved["region"], "location_types-Region")
+
+            self.calls.clear()
+            self.api.dcim.locations.create.side_effect = fake_create(self.calls, "locations")
+            refs = ImportPipeline(self.api, self.dataset, checkpoint=checkpoint).run()
+            self.assertNotIn(("location_types", [{"name": "Region"}]), self.calls)
+            self.assertEqual(refs["hq-b1"], "locations-B1")
+
+    def test_lookups(self):
+        self.api.resolver.resolve_many.return_value = {Lookup("extras.statuses", name="Active"): "status-id"}
+        dataset = {"dcim.location_types": [{"name": "Site", "status": Lookup("extras.statuses", name="Active")}]}
+        ImportPipeline(self.api, dataset).run()
+        self.assertEqual(self.calls, [("location_types", [{"name": "Site", "status": "status-id"}])])
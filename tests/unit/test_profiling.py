@@ -0,0 +1,112 @@
+"""Payload profiler tests."""
+
+import json
+import pickle
+import unittest
+
+import requests_mock
+
+import pynautobot
+from pynautobot.core.hooks import RequestEvent
+from pynautobot.core.profiling import PayloadProfiler
+from pynautobot.models.dcim import Devices
+
+URL = "http://localhost:8000/api/dcim/devices/"
+LOCATIONS = "http://localhost:8000/api/dcim/locations/"
+
+
+def location(index, depth):
+    """Returns location ``index`` serialized with ``depth``."""
+    brief = {"id": f"location-{index}", "object_type": "dcim.location", "url": f"{LOCATIONS}location-{index}/"}
+    return {**brief, "name": f"HQ{index}", "description": "x" * 50} if depth else brief
+
+
+def device(index, depth=1):
+    """Returns device ``index`` serialized with ``depth``, its tags and config context."""
+    return {
+        "id": f"device-{index}",
+        "url": f"{URL}device-{index}/",
+        "name": f"sw{index}",
+        "serial": f"S{index}",
+        "location": location(index, depth),
+        "tags": [{"id": "tag-1", "object_type": "extras.tag", "url": "http://localhost:8000/api/extras/tags/tag-1/"}],
+        "config_context": {"ntp": ["10.0.0.1"]},
+    }
+
+
+class PayloadProfilerTestCase(unittest.TestCase):
+    """Payload profiler test cases."""
+
+    def setUp(self):
+        self.api = pynautobot.api("http://localhost:8000", token="abc")
+        self.mock = requests_mock.Mocker()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.mock.get(URL, json={"count": 3, "next": None, "results": [device(i) for i in range(3)]})
+
+    def recommended(self, profiler):
+        """Returns the recommended value of each parameter."""
+        return {item["parameter"]: item["value"] for item in profiler.recommendations()}
+
+    def test_reads(self):
+        with self.api.profile() as profiler:
+            self.assertIs(self.api.profiler, profiler)
+            devices = self.api.dcim.devices.all()
+        self.assertIsNone(self.api.profiler)
+        self.assertFalse(self.api.hooks)
+        self.assertIsInstance(devices[0], Devices)
+        self.assertEqual(type(devices[0]).__name__, "Devices")
+        # Reads after the block are still counted.
+        names = [(record.name, record.location.name) for record in devices]
+        self.assertEqual(names[0], ("sw0", "HQ0"))
+        report = profiler.report()["dcim.devices"]
+        self.assertEqual((report["responses"], report["records"], report["depth"]), (1, 3, 1))
+        self.assertEqual(report["reads"], {"name": 3, "location": 3, "location.name": 3})
+        self.assertEqual(report["fields"]["name"]["reads"], 3)
+        self.assertEqual(report["fields"]["serial"]["reads"], 0)
+        expected = sum(len(json.dumps({"name": f"sw{i}"}, separators=(",", ":"))) - 1 for i in range(3))
+        self.assertEqual(report["fields"]["name"]["bytes"], expected)
+        self.assertEqual(report["bytes"], sum(field["bytes"] for field in report["fields"].values()))
+        self.assertEqual(report["requests"], 1)
+
+    def test_recommendations(self):
+        with self.api.profile() as profiler:
+            devices = self.api.dcim.devices.all()
+        for record in devices:
+            _ = record.name, record.location.name
+        self.assertEqual(self.recommended(profiler), {"exclude_m2m": True, "include": None})
+
+        with self.api.profile() as profiler:
+            devices = self.api.dcim.devices.all()
+        for record in devices:
+            _ = record.name, record.location.id, record.tags, record.config_context
+        (recommendation,) = profiler.recommendations()
+        self.assertEqual(recommendation["parameter"], "depth")
+        self.assertEqual(recommendation["value"], 0)
+        saved = sum(
+            len(json.dumps(device(i), separators=(",", ":"))) - len(json.dumps(device(i, 0), separators=(",", ":")))
+            for i in range(3)
+        )
+        self.assertEqual(recommendation["bytes_saved"], saved)
+
+    def test_seconds_saved(self):
+        profiler = PayloadProfiler()
+        profiler.observe(
+            self.api.dcim.devices, [device(0)], self.api.dcim.devices.return_obj(device(0), self.api, None)
+        )
+        event = RequestEvent("GET", URL)
+        event.bytes_in, event.latency = 1000, 0.5
+        profiler.after_response(event)
+        for recommendation in profiler.recommendations():
+            self.assertAlmostEqual(recommendation["seconds_saved"], recommendation["bytes_saved"] * 0.0005)
+        self.assertEqual(len(profiler.recommendations()), 3)
+        profiler.reset()
+        self.assertEqual(profiler.report(), {})
+
+    def test_pickle(self):
+        with self.api.profile():
+            record = self.api.dcim.devices.all()[0]
+        restored = pickle.loads(pickle.dumps(record))
+        self.assertIs(type(restored), Devices)
+        self.assertNotIn("_profile", restored.__dict__)
+        self.assertEqual(restored.location.name, "HQ0")
@@ -0,0 +1,136 @@
+"""Learned projection tests."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import requests_mock
+
+import pynautobot
+from pynautobot.core.projection import ProjectionStore
+
+URL = "http://localhost:8000/api/dcim/devices/"
+LOCATIONS = "http://localhost:8000/api/dcim/locations/"
+
+
+def device(index, depth=1, exclude_m2m=False, include=()):
+    """Returns device ``index`` serialized like Nautobot would with these parameters."""
+    location = {"id": f"location-{index}", "object_type": "dcim.location", "url": f"{LOCATIONS}location-{index}/"}
+    row = {
+        "id": f"device-{index}",
+        "url": f"{URL}device-{index}/",
+        "name": f"sw{index}",
+        "location": {**location, "name": f"HQ{index}"} if depth else location,
+    }
+    if not exclude_m2m:
+        row["tags"] = [
+            {"id": "tag-1", "object_type": "extras.tag", "url": "http://localhost:8000/api/extras/tags/tag-1/"}
+        ]
+    if "config_context" in include:
+        row["config_context"] = {"ntp": ["10.0.0.1"]}
+    return row
+
+
+def devices(request, _):
+    """Answers the device list, honoring depth, exclude_m2m and include."""
+    params = {
+        "depth": int(request.qs.get("depth", ["0"])[0]),
+        "exclude_m2m": request.qs.get("exclude_m2m", ["false"])[0] == "true",
+        "include": request.qs.get("include", [""])[0].split(","),
+    }
+    return {"count": 2, "next": None, "results": [device(i, **params) for i in range(2)]}
+
+
+def query(api):
+    """Queries devices from a single call site, reading their name and location ID."""
+    records = api.dcim.devices.filter(role="access", depth=1, include="config_context")
+    return [(record.name, record.location.id) for record in records]
+
+
+class ProjectionTestCase(unittest.TestCase):
+    """Learned projection test cases."""
+
+    def setUp(self):
+        self.mock = requests_mock.Mocker()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.mock.get(URL, json=devices)
+        self.mock.get(f"{URL}device-0/", json=device(0, include=("config_context",)))
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "projections", "devices.json")
+
+    def last_query(self):
+        """Returns the query string of the last request."""
+        return self.mock.request_history[-1].qs
+
+    def test_learn_and_project(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", projection=self.path)
+        self.assertIsInstance(api.projection, ProjectionStore)
+        self.assertEqual(query(api), [("sw0", "location-0"), ("sw1", "location-1")])
+        self.assertEqual(self.last_query()["depth"], ["1"])
+        api.projection.save()
+        with open(self.path, encoding="utf-8") as projection_file:
+            (site,) = json.load(projection_file)["sites"].items()
+        self.assertTrue(site[0].startswith("dcim.devices "))
+        self.assertIn("test_projection.py:", site[0])
+        self.assertEqual(site[1], {"reads": ["location", "location.id", "name"], "lists": ["tags"]})
+
+        # A later run requests a leaner representation, with the same results.
+        api = pynautobot.api("http://localhost:8000", token="abc", projection=self.path)
+        self.assertEqual(query(api), [("sw0", "location-0"), ("sw1", "location-1")])
+        self.assertEqual(len(self.mock.request_history), 2)
+        self.assertEqual(self.last_query(), {"role": ["access"], "depth": ["0"], "exclude_m2m": ["true"]})
+
+    def test_fallback(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", projection=True)
+        _ = [record.name for record in query_and_keep(api)]
+        api.projection.save()
+        records = query_and_keep(api)
+        self.assertEqual(self.last_query()["exclude_m2m"], ["true"])
+        self.assertNotIn("tags", records[0].__dict__)
+        # A field left out is loaded with the full details of the record, and learned.
+        self.assertEqual(len(records[0].tags), 1)
+        self.assertEqual(self.mock.request_history[-1].path, "/api/dcim/devices/device-0/")
+        api.projection.save()
+        query_and_keep(api)
+        self.assertNotIn("exclude_m2m", self.last_query())
+
+    def test_nothing_learned(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", projection=True)
+        query(api)
+        query(api)
+        # Projections only change when saved.
+        self.assertEqual(self.last_query()["depth"], ["1"])
+        self.assertEqual(api.projection.learned(), {})
+
+    def test_get(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", projection=True)
+        for _ in range(2):
+            record = api.dcim.devices.get("device-0", include="config_context")
+            _ = record.name
+            api.projection.save()
+        self.assertEqual(self.last_query(), {"exclude_m2m": ["true"]})
+
+    def test_clear(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", projection=self.path)
+        query(api)
+        api.projection.save()
+        self.assertTrue(os.path.exists(self.path))
+        api.projection.clear()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(api.projection.learned(), {})
+        query(api)
+        self.assertEqual(self.last_query()["depth"], ["1"])
+
+    def test_unreadable_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as projection_file:
+            projection_file.write("{not json")
+        self.assertEqual(ProjectionStore(self.path).learned(), {})
+
+
+def query_and_keep(api):
+    """Queries devices from a single call site, keeping the records to read more of them later."""
+    return api.dcim.devices.filter(role="access", depth=1, include="config_context")
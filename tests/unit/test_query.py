@@ -1,9 +1,26 @@
 """Request tests."""
 
+import math
+import random
+import time
 import unittest
+import uuid
+from threading import Lock
 from unittest.mock import Mock, call
+from urllib.parse import urlencode
 
-from pynautobot.core.query import Request
+import requests
+import requests_mock
+
+from pynautobot.core.query import (
+    DeadlineExceeded,
+    Request,
+    calc_pages,
+    dedupe_results,
+    make_deadline,
+    split_filters,
+)
+from pynautobot.core.session import Session
 
 
 class RequestTestCase(unittest.TestCase):
@@ -56,3 +73,413 @@ class RequestTestCase(unittest.TestCase):
             headers={"accept": "application/json;"},
             json=None,
         )
+
+
+class SplitFiltersTestCase(unittest.TestCase):
+    """split_filters test cases."""
+
+    url = "http://localhost:8001/api/dcim/devices/"
+
+    def test_no_split(self):
+        filters = {"name": ["a", "b"], "status": "active"}
+        self.assertEqual(split_filters(self.url, filters), [filters])
+
+    def test_split(self):
+        ids = [str(uuid.UUID(int=i)) for i in range(500)]
+        chunks = split_filters(self.url, {"id": ids, "status": "active"}, max_length=2000)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual([i for chunk in chunks for i in chunk["id"]], ids)
+        for chunk in chunks:
+            self.assertEqual(chunk["status"], "active")
+            self.assertLessEqual(len(self.url) + len(urlencode(chunk, doseq=True)), 2000)
+
+    def test_split_multiple_filters(self):
+        filters = {"id": [f"id-{i}" for i in range(50)], "name": [f"name-{i}" for i in range(50)]}
+        chunks = split_filters(self.url, filters, max_length=300)
+        combos = {(i, n) for chunk in chunks for i in chunk["id"] for n in chunk["name"]}
+        self.assertEqual(len(combos), 2500)
+
+    def test_negated_lookup_not_split(self):
+        filters = {"location__n": [f"location-{i}" for i in range(500)]}
+        self.assertEqual(split_filters(self.url, filters), [filters])
+
+    def test_conjoined_filter_not_split(self):
+        filters = {"tag": [f"tag-{i}" for i in range(500)]}
+        self.assertEqual(split_filters(self.url, filters), [filters])
+
+    def test_single_value_too_long(self):
+        filters = {"q": "x" * 5000}
+        self.assertEqual(split_filters(self.url, filters), [filters])
+
+    def test_dedupe_results(self):
+        self.assertEqual(
+            dedupe_results([[{"id": 1}, {"id": 2}], [{"id": 2}, {"id": 3}, {"name": "no-id"}]]),
+            [{"id": 1}, {"id": 2}, {"id": 3}, {"name": "no-id"}],
+        )
+
+
+class ChunkedRequestTestCase(unittest.TestCase):
+    """Requests with filters split over several URLs."""
+
+    def make_request(self, threading=False):
+        """Returns a `Request` filtering on 300 IDs, which has to be split."""
+        test_obj = Request(
+            http_session=Mock(),
+            base="http://localhost:8001/api/dcim/devices",
+            filters={"id": [str(uuid.UUID(int=i)) for i in range(300)]},
+            threading=threading,
+        )
+        test_obj.max_url_length = 2000
+
+        def get(_, params=None, **__):
+            ids = params["id"]
+            response = Mock(ok=True, status_code=200)
+            response.json.return_value = {
+                "count": len(ids),
+                "next": None,
+                "results": [{"id": ids[0]}] + [{"id": i} for i in ids],
+            }
+            return response
+
+        test_obj.http_session.get.side_effect = get
+        return test_obj
+
+    def test_get(self):
+        for threading in (False, True):
+            test_obj = self.make_request(threading=threading)
+            ret = test_obj.get()
+            self.assertGreater(test_obj.http_session.get.call_count, 1)
+            self.assertEqual(len(ret), 300)
+
+    def test_threaded_chunks_paginate_serially(self):
+        test_obj = self.make_request(threading=True)
+        chunks = split_filters(test_obj.url, test_obj.filters, test_obj.max_url_length)
+        threading = test_obj._map_filter_chunks(lambda req: req.threading, chunks)  # pylint: disable=protected-access
+        self.assertEqual(set(threading), {False})
+
+    def test_get_count(self):
+        test_obj = self.make_request()
+        self.assertEqual(test_obj.get_count(), 300)
+        self.assertGreater(test_obj.http_session.get.call_count, 1)
+
+
+class DeadlineTestCase(unittest.TestCase):
+    """Requests with a deadline."""
+
+    def make_request(self, deadline=None, threading=False):
+        """Returns a `Request` with ``deadline`` whose session answers with an empty page."""
+        test_obj = Request(
+            http_session=Mock(timeout=None),
+            base="http://localhost:8001/api/dcim/devices",
+            threading=threading,
+            max_workers=2,
+            deadline=deadline,
+        )
+        test_obj.http_session.get.return_value.json.return_value = {"count": 0, "next": None, "results": []}
+        return test_obj
+
+    def test_no_deadline(self):
+        test_obj = self.make_request()
+        test_obj.get()
+        self.assertNotIn("timeout", test_obj.http_session.get.call_args.kwargs)
+
+    def test_timeout_capped_by_deadline(self):
+        test_obj = self.make_request(deadline=make_deadline(10))
+        test_obj.http_session.timeout = (3, 30)
+        test_obj.get()
+        connect, read = test_obj.http_session.get.call_args.kwargs["timeout"]
+        self.assertEqual(connect, 3)
+        self.assertLessEqual(read, 10)
+        test_obj.http_session.timeout = None
+        test_obj.get()
+        self.assertLessEqual(test_obj.http_session.get.call_args.kwargs["timeout"], 10)
+
+    def test_deadline_passed(self):
+        test_obj = self.make_request(deadline=time.monotonic() - 1)
+        with self.assertRaises(DeadlineExceeded):
+            test_obj.get()
+        test_obj.http_session.get.assert_not_called()
+
+    def test_timeout_at_deadline(self):
+        test_obj = self.make_request(deadline=make_deadline(0.01))
+
+        def get(*_, **__):
+            time.sleep(0.02)
+            raise requests.exceptions.ReadTimeout()
+
+        test_obj.http_session.get.side_effect = get
+        with self.assertRaises(DeadlineExceeded):
+            test_obj.get()
+
+    def test_timeout_before_deadline(self):
+        test_obj = self.make_request(deadline=make_deadline(10))
+        test_obj.http_session.get.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            test_obj.get()
+
+    def test_threaded_pages_cancelled(self):
+        test_obj = self.make_request(deadline=make_deadline(0.1), threading=True)
+
+        def get(_, params=None, **__):
+            if params["limit"]:
+                time.sleep(0.05)
+            response = Mock(ok=True, status_code=200)
+            response.json.return_value = {"count": 1000, "next": "http://next", "results": [{"id": 1}] * 10}
+            return response
+
+        test_obj.http_session.get.side_effect = get
+        with self.assertRaises(DeadlineExceeded):
+            test_obj.get()
+        self.assertLess(test_obj.http_session.get.call_count, 20)
+
+    def test_session_default_timeout(self):
+        session = Session()
+        session.timeout = 7
+        with requests_mock.Mocker(session=session) as mock:
+            mock.get("http://localhost:8001/api/", json={})
+            session.get("http://localhost:8001/api/")
+            self.assertEqual(mock.last_request.timeout, 7)
+            session.get("http://localhost:8001/api/", timeout=2)
+            self.assertEqual(mock.last_request.timeout, 2)
+
+
+class KeysetPaginationTestCase(unittest.TestCase):
+    """Keyset pagination and de-duplication of offset pages."""
+
+    def make_request(self, rows, pagination="keyset", limit=None):
+        """Returns a `Request` whose session pages through ``rows`` like Nautobot."""
+        test_obj = Request(
+            http_session=Mock(timeout=None),
+            base="http://localhost:8001/api/dcim/devices",
+            pagination=pagination,
+            limit=limit,
+        )
+
+        def get(_, params=None, **__):
+            params = params or {}
+            matches = [row for row in rows if row["created"] >= params.get("created__gte", "")]
+            if params.get("sort") == "created":
+                matches.sort(key=lambda row: row["created"])
+            offset = params.get("offset", 0)
+            page_size = params.get("limit") or 100
+            response = Mock(ok=True, status_code=200)
+            response.json.return_value = {
+                "count": len(matches),
+                "next": "http://next" if offset + page_size < len(matches) else None,
+                "results": matches[offset : offset + page_size],
+            }
+            return response
+
+        test_obj.http_session.get.side_effect = get
+        return test_obj
+
+    def test_keyset(self):
+        # Every third row shares its timestamp with the next one.
+        rows = [{"id": i, "created": f"2024-01-01T00:{i - i % 3 // 2:04d}"} for i in range(250)]
+        test_obj = self.make_request(rows)
+        ret = test_obj.get()
+        self.assertEqual(sorted(row["id"] for row in ret), list(range(250)))
+        calls = test_obj.http_session.get.call_args_list
+        self.assertEqual(calls[0].kwargs["params"], {"sort": "created", "limit": 0})
+        self.assertEqual(calls[1].kwargs["params"]["created__gte"], ret[99]["created"])
+
+    def test_keyset_sort_conflict(self):
+        test_obj = self.make_request([])
+        test_obj.filters = {"sort": "name"}
+        with self.assertRaises(ValueError):
+            test_obj.get()
+
+    def test_keyset_page_of_ties(self):
+        test_obj = self.make_request([{"id": i, "created": "2024-01-01"} for i in range(150)])
+        with self.assertRaises(ValueError):
+            test_obj.get()
+
+    def test_auto(self):
+        rows = [{"id": i, "created": f"2024-01-01T{i:05d}"} for i in range(250)]
+        test_obj = self.make_request(rows, pagination="auto")
+        test_obj.keyset_threshold = 200
+        self.assertEqual(len(test_obj.get()), 250)
+        calls = test_obj.http_session.get.call_args_list
+        # The count of the unsorted first page picks keyset pagination, which requests it again sorted.
+        self.assertEqual(calls[0].kwargs["params"], {})
+        self.assertEqual(calls[1].kwargs["params"], {"sort": "created", "limit": 0})
+        self.assertEqual(calls[2].kwargs["params"]["created__gte"], rows[99]["created"])
+        self.assertEqual(len(calls), 4)
+
+        # A first page already sorted by the keyset field is kept.
+        test_obj = self.make_request(rows, pagination="auto")
+        test_obj.keyset_threshold = 200
+        test_obj.filters = {"sort": "created"}
+        self.assertEqual(len(test_obj.get()), 250)
+        calls = test_obj.http_session.get.call_args_list
+        self.assertEqual(calls[1].kwargs["params"]["created__gte"], rows[99]["created"])
+        self.assertEqual(len(calls), 3)
+
+        # Queries below the threshold keep offset pagination and their order.
+        test_obj = self.make_request(rows[:150], pagination="auto")
+        test_obj.keyset_threshold = 200
+        self.assertEqual(len(test_obj.get()), 150)
+        self.assertEqual(test_obj.http_session.get.call_args.kwargs["params"], {"limit": 150, "offset": 100})
+
+    def test_keyset_field(self):
+        rows = [{"id": i, "created": "2024-01-01", "name": f"device{i:03d}"} for i in range(150)]
+        test_obj = Request(
+            http_session=Mock(timeout=None),
+            base="http://localhost:8001/api/dcim/devices",
+            pagination="keyset",
+            keyset_field="name",
+        )
+        test_obj.http_session.get.return_value.json.return_value = {"count": 150, "next": None, "results": rows}
+        self.assertEqual(len(test_obj.get()), 150)
+        self.assertEqual(test_obj.http_session.get.call_args.kwargs["params"], {"sort": "name", "limit": 0})
+
+    def test_offset_pages_deduplicated(self):
+        test_obj = Request(http_session=Mock(), base="http://localhost:8001/api/dcim/devices")
+        first, second = Mock(ok=True, status_code=200), Mock(ok=True, status_code=200)
+        first.json.return_value = {"count": 3, "next": "http://next", "results": [{"id": 1}, {"id": 2}]}
+        # A row created mid-walk shifts id 2 onto the second page.
+        second.json.return_value = {"count": 4, "next": None, "results": [{"id": 2}, {"id": 3}]}
+        test_obj.http_session.get.side_effect = [first, second]
+        self.assertEqual(test_obj.get(), [{"id": 1}, {"id": 2}, {"id": 3}])
+
+
+class PageSizeCacheTestCase(unittest.TestCase):
+    """Discovery and caching of the server page size."""
+
+    def setUp(self):
+        self.session = Session()
+        self.session.get = Mock(side_effect=self.get)
+        self.rows = [{"id": i} for i in range(250)]
+
+    def get(self, url, params=None, **_):
+        """Answers like a server with a page size of 100, following ``next`` links."""
+        if url.startswith("http://next/"):
+            params = dict(zip(("offset", "limit"), map(int, url.split("/")[-2:])))
+        params = params or {}
+        offset = params.get("offset", 0)
+        # The server clamps the limit to its page size of 100.
+        page_size = min(params.get("limit") or 100, 100)
+        response = Mock(ok=True, status_code=200)
+        response.json.return_value = {
+            "count": len(self.rows),
+            "next": f"http://next/{offset + page_size}/{page_size}" if offset + page_size < len(self.rows) else None,
+            "results": self.rows[offset : offset + page_size],
+        }
+        return response
+
+    def make_request(self, limit=None, threading=True):
+        """Returns a `Request` for the devices endpoint on the test session."""
+        return Request(
+            http_session=self.session,
+            base="http://localhost:8001/api/dcim/devices",
+            limit=limit,
+            threading=threading,
+        )
+
+    def params(self):
+        """Returns the params of every GET sent so far."""
+        return [call.kwargs["params"] for call in self.session.get.call_args_list]
+
+    def test_discovered_once(self):
+        test_obj = self.make_request()
+        self.assertEqual(len(test_obj.get()), 250)
+        self.assertEqual(self.params()[0], {"limit": 0})
+        self.assertEqual(test_obj.page_plan, {"count": 250, "page_size": 100, "pages": 3})
+        self.assertCountEqual(self.params()[1:], [{"offset": 100, "limit": 100}, {"offset": 200, "limit": 100}])
+        self.assertEqual(self.session.max_page_size, 100)
+
+        self.session.get.reset_mock()
+        test_obj = self.make_request()
+        self.assertEqual(sorted(row["id"] for row in test_obj.get()), list(range(250)))
+        self.assertEqual(test_obj.page_plan, {"count": 250, "page_size": 100, "pages": 3})
+        params = self.params()
+        self.assertEqual(params[0], {"limit": 1})
+        self.assertCountEqual(params[1:], [{"offset": offset, "limit": 100} for offset in (0, 100, 200)])
+
+    def test_limit_capped_to_page_size(self):
+        self.session.max_page_size = 100
+        test_obj = self.make_request(limit=500)
+        self.assertEqual(len(test_obj.get()), 250)
+        self.assertEqual(test_obj.page_plan["page_size"], 100)
+
+        test_obj = self.make_request(limit=50)
+        self.assertEqual(len(test_obj.get()), 250)
+        self.assertEqual(test_obj.page_plan, {"count": 250, "page_size": 50, "pages": 5})
+
+    def test_single_result(self):
+        self.session.max_page_size = 100
+        self.rows = self.rows[:1]
+        self.assertEqual(self.make_request().get(), [{"id": 0}])
+        self.assertEqual(self.params(), [{"limit": 1}])
+
+    def test_not_threaded(self):
+        self.session.max_page_size = 100
+        self.assertEqual(len(self.make_request(threading=False).get()), 250)
+        self.assertEqual(self.params()[1], {"limit": 100, "offset": 100})
+
+
+class PaginationPropertyTestCase(unittest.TestCase):
+    """Walks randomly sized results sets, checking that no row is lost or duplicated."""
+
+    runs = 200
+
+    def setUp(self):
+        self.lock = Lock()
+        self.rows = []
+        self.inserts = 0
+        self.page_size = 100
+        self.random = random.Random(0)
+
+    def get(self, url, params=None, **_):
+        """Answers like a server with a page size of ``self.page_size``, creating rows while walked."""
+        with self.lock:
+            if url.startswith("http://next/"):
+                params = dict(zip(("offset", "limit"), map(int, url.split("/")[-2:])))
+            params = params or {}
+            offset = params.get("offset", 0)
+            page_size = min(params.get("limit") or self.page_size, self.page_size)
+            response = Mock(ok=True, status_code=200)
+            response.json.return_value = {
+                "count": len(self.rows),
+                "next": f"http://next/{offset + page_size}/{page_size}"
+                if offset + page_size < len(self.rows)
+                else None,
+                "results": self.rows[offset : offset + page_size],
+            }
+            if self.inserts:
+                self.inserts -= 1
+                position = self.random.randint(0, len(self.rows))
+                self.rows.insert(position, {"id": f"new-{self.inserts}-{position}"})
+            return response
+
+    def walk(self, max_page_size=None, threading=True):
+        """Returns the ids of the rows fetched by a ``get()`` of the devices endpoint."""
+        session = Session()
+        session.max_page_size = max_page_size
+        session.get = Mock(side_effect=self.get)
+        test_obj = Request(http_session=session, base="http://localhost:8001/api/dcim/devices", threading=threading)
+        return [row["id"] for row in test_obj.get()]
+
+    def check(self, inserts=0):
+        """Walks random results sets with every strategy, creating ``inserts`` rows during each walk."""
+        for _ in range(self.runs):
+            count = self.random.randint(0, 400)
+            self.page_size = self.random.randint(1, 120)
+            for kwargs in ({}, {"max_page_size": self.page_size}, {"threading": False}):
+                self.rows = [{"id": i} for i in range(count)]
+                self.inserts = inserts
+                with self.subTest(count=count, page_size=self.page_size, **kwargs):
+                    ids = self.walk(**kwargs)
+                    self.assertEqual(len(ids), len(set(ids)))
+                    self.assertTrue(set(range(count)) <= set(ids))
+
+    def test_calc_pages(self):
+        for limit in range(1, 60):
+            for count in range(0, 500):
+                self.assertEqual(calc_pages(limit, count), math.ceil(count / limit))
+
+    def test_static_results(self):
+        self.check()
+
+    def test_created_during_walk(self):
+        self.check(inserts=3)
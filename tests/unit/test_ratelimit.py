@@ -0,0 +1,86 @@
+"""Rate limiter tests."""
+
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests_mock
+
+import pynautobot
+from pynautobot.core.ratelimit import SQLiteTokenBucket, TokenBucket
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    """TokenBucket test cases."""
+
+    @patch("pynautobot.core.ratelimit.time.sleep")
+    def test_burst_then_rate(self, sleep):
+        bucket = TokenBucket(10, burst=3)
+        waits = [bucket.acquire() for _ in range(5)]
+        self.assertEqual(waits[:3], [0, 0, 0])
+        self.assertAlmostEqual(waits[3], 0.1, places=2)
+        self.assertAlmostEqual(waits[4], 0.2, places=2)
+        self.assertEqual(sleep.call_count, 2)
+
+    @patch("pynautobot.core.ratelimit.time.sleep")
+    def test_default_burst(self, _):
+        self.assertEqual(TokenBucket(0.5).burst, 1)
+        self.assertEqual(TokenBucket(20).burst, 20)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    def test_pickle(self):
+        bucket = pickle.loads(pickle.dumps(TokenBucket(5)))
+        self.assertEqual(bucket.acquire(), 0)
+
+
+class SQLiteTokenBucketTestCase(unittest.TestCase):
+    """SQLiteTokenBucket test cases."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    @patch("pynautobot.core.ratelimit.time.time", return_value=1000.0)
+    @patch("pynautobot.core.ratelimit.time.sleep")
+    def test_shared_between_instances(self, *_):
+        first = SQLiteTokenBucket(self.path, 10, burst=2)
+        second = pickle.loads(pickle.dumps(first))
+        waits = [first.acquire(), second.acquire(), first.acquire(), second.acquire()]
+        self.assertEqual(waits[:2], [0, 0])
+        self.assertAlmostEqual(waits[2], 0.1, places=2)
+        self.assertAlmostEqual(waits[3], 0.2, places=2)
+
+    @patch("pynautobot.core.ratelimit.time.sleep")
+    def test_named_buckets(self, _):
+        SQLiteTokenBucket(self.path, 10, burst=1, name="a").acquire()
+        self.assertEqual(SQLiteTokenBucket(self.path, 10, burst=1, name="b").acquire(), 0)
+
+
+class SessionRateLimiterTestCase(unittest.TestCase):
+    """Rate limiter wired into the Api session."""
+
+    @patch("pynautobot.api.version", "2.0")
+    @patch("pynautobot.core.ratelimit.time.sleep")
+    def test_api_rate_limit(self, sleep, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123", rate_limit=5)
+        self.assertIsInstance(api.rate_limiter, TokenBucket)
+        self.assertIs(api.http_session.rate_limiter, api.rate_limiter)
+        with requests_mock.Mocker() as mock:
+            mock.get("http://localhost:8000/api/dcim/devices/", json={"count": 0, "next": None, "results": []})
+            for _ in range(6):
+                api.dcim.devices.all()
+        self.assertEqual(sleep.call_count, 1)
+
+    @patch("pynautobot.api.version", "2.0")
+    def test_api_no_rate_limit(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123")
+        self.assertIsNone(api.rate_limiter)
+        self.assertIsNone(api.http_session.rate_limiter)
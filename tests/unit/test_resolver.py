@@ -0,0 +1,150 @@
+"""Resolver tests."""
+
+import pickle
+import unittest
+from unittest.mock import Mock, patch
+
+import requests_mock
+
+import pynautobot
+from pynautobot.core.resolver import Lookup, Resolver, find_lookups
+from pynautobot.core.response import Record
+
+
+def fake_endpoint(url, rows):
+    """Returns an endpoint whose ``filter()`` answers like Nautobot from ``rows``.
+
+    Related objects in ``rows`` are dicts, filtered on by name and returned as
+    bare references unless ``depth=1`` is passed.
+    """
+    endpoint = Mock(url=url)
+
+    def value(row, field):
+        return row[field]["name"] if isinstance(row[field], dict) else row[field]
+
+    def filter_(depth=0, **filters):
+        matches = [
+            row
+            for row in rows
+            if all(str(value(row, k)) in (v if isinstance(v, list) else [str(v)]) for k, v in filters.items())
+        ]
+        if not depth:
+            matches = [
+                {k: {"id": v["id"], "object_type": "dcim.device"} if isinstance(v, dict) else v for k, v in row.items()}
+                for row in matches
+            ]
+        return [Record(row, Mock(), endpoint) for row in matches]
+
+    endpoint.filter.side_effect = filter_
+    return endpoint
+
+
+class ResolverTestCase(unittest.TestCase):
+    """Resolver test cases."""
+
+    def setUp(self):
+        self.api = Mock()
+        self.api.dcim.locations = fake_endpoint(
+            "http://localhost:8000/api/dcim/locations",
+            [{"id": f"loc-{i}", "name": f"site{i}"} for i in range(5)],
+        )
+        self.api.dcim.interfaces = fake_endpoint(
+            "http://localhost:8000/api/dcim/interfaces",
+            [
+                {"id": f"{device}-{name}", "device": {"id": f"{device}-id", "name": device}, "name": name}
+                for device in ("sw1", "sw2", "sw3")
+                for name in ("eth0", "eth1")
+            ],
+        )
+        self.resolver = Resolver(self.api)
+
+    def test_resolve(self):
+        self.assertEqual(self.resolver.resolve("dcim.locations", name="site3"), "loc-3")
+
+    def test_resolve_many_batches(self):
+        lookups = [Lookup("dcim.locations", name=f"site{i}") for i in range(5)]
+        ids = self.resolver.resolve_many(lookups)
+        self.assertEqual(ids[lookups[4]], "loc-4")
+        self.api.dcim.locations.filter.assert_called_once_with(name=[f"site{i}" for i in range(5)])
+
+    def test_resolve_many_batch_size(self):
+        self.resolver.batch_size = 2
+        self.resolver.resolve_many([Lookup("dcim.locations", name=f"site{i}") for i in range(5)])
+        self.assertEqual(self.api.dcim.locations.filter.call_count, 3)
+
+    def test_multi_field_key(self):
+        lookups = [Lookup("dcim.interfaces", device=d, name=n) for d in ("sw1", "sw2") for n in ("eth0", "eth1")]
+        ids = self.resolver.resolve_many(lookups)
+        self.assertEqual(ids[Lookup("dcim.interfaces", device="sw2", name="eth1")], "sw2-eth1")
+        # Learning that device is a related object costs one extra request.
+        self.assertEqual(self.api.dcim.interfaces.filter.call_count, 3)
+
+        self.resolver.clear()
+        self.api.dcim.interfaces.filter.reset_mock()
+        self.resolver.resolve_many(lookups)
+        self.assertEqual(self.api.dcim.interfaces.filter.call_count, 2)
+        self.api.dcim.interfaces.filter.assert_any_call(device="sw1", name=["eth0", "eth1"])
+
+    def test_related_batch_field(self):
+        lookups = [Lookup("dcim.interfaces", device=d, name="eth0") for d in ("sw1", "sw2", "sw3")]
+        ids = self.resolver.resolve_many(lookups)
+        self.assertEqual(ids[lookups[2]], "sw3-eth0")
+        # The device names only come back with depth=1.
+        self.api.dcim.interfaces.filter.assert_called_with(name="eth0", device=["sw1", "sw2", "sw3"], depth=1)
+        self.assertEqual(self.api.dcim.interfaces.filter.call_count, 2)
+
+        self.resolver.clear()
+        self.api.dcim.interfaces.filter.reset_mock()
+        self.assertEqual(self.resolver.resolve("dcim.interfaces", device="sw1", name="eth1"), "sw1-eth1")
+        self.api.dcim.interfaces.filter.assert_called_once_with(device="sw1", name=["eth1"])
+
+    def test_cache(self):
+        self.resolver.resolve("dcim.locations", name="site1")
+        self.resolver.resolve("dcim.locations", name="site1")
+        self.assertEqual(self.api.dcim.locations.filter.call_count, 1)
+
+    def test_cache_ttl(self):
+        self.resolver.ttl = 0
+        self.resolver.resolve("dcim.locations", name="site1")
+        self.resolver.resolve("dcim.locations", name="site1")
+        self.assertEqual(self.api.dcim.locations.filter.call_count, 2)
+
+    def test_missing(self):
+        with self.assertRaises(ValueError):
+            self.resolver.resolve("dcim.locations", name="nowhere")
+
+    def test_prepare(self):
+        payload = [
+            {"name": "dev1", "location": Lookup("dcim.locations", name="site1"), "tags": [{"name": "x"}]},
+            {"name": "dev2", "location": Lookup("dcim.locations", name="site2")},
+        ]
+        self.assertEqual(len(find_lookups(payload)), 2)
+        self.assertEqual(
+            self.resolver.prepare(payload),
+            [{"name": "dev1", "location": "loc-1", "tags": [{"name": "x"}]}, {"name": "dev2", "location": "loc-2"}],
+        )
+        self.api.dcim.locations.filter.assert_called_once()
+
+    def test_pickle(self):
+        resolver = pickle.loads(pickle.dumps(Resolver(None)))
+        self.assertEqual(resolver.ttl, 300)
+
+
+@patch("pynautobot.api.version", "2.0")
+class ResolverApiTestCase(unittest.TestCase):
+    """Resolver against responses shaped like Nautobot's."""
+
+    def test_resolve_interface(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123")
+        device = {"id": "dev-1", "object_type": "dcim.device", "url": "http://localhost:8000/api/dcim/devices/dev-1/"}
+        interface = {"id": "int-1", "url": "http://localhost:8000/api/dcim/interfaces/int-1/", "name": "Gi1/0/1"}
+        with requests_mock.Mocker() as mock:
+
+            def interfaces(request, _):
+                nested = {**device, "name": "hq-access-01"} if request.qs.get("depth") == ["1"] else device
+                return {"count": 1, "next": None, "results": [{**interface, "device": nested}]}
+
+            mock.get("http://localhost:8000/api/dcim/interfaces/", json=interfaces)
+            self.assertEqual(api.resolver.resolve("dcim.interfaces", device="hq-access-01", name="Gi1/0/1"), "int-1")
+            self.assertEqual(mock.last_request.qs["device"], ["hq-access-01"])
+            self.assertEqual(mock.last_request.qs["depth"], ["1"])
@@ -0,0 +1,133 @@
+"""Retry policy and circuit breaker tests."""
+
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+import requests_mock
+
+import pynautobot
+from pynautobot.core.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+URL = "http://localhost:8000/api/dcim/devices/"
+PAGE = {"count": 0, "next": None, "results": []}
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    """RetryPolicy test cases."""
+
+    def test_allows(self):
+        policy = RetryPolicy()
+        for method in ("GET", "put", "DELETE", "OPTIONS"):
+            self.assertTrue(policy.allows(method))
+        self.assertFalse(policy.allows("POST"))
+        self.assertFalse(policy.allows("PATCH"))
+        self.assertTrue(RetryPolicy(retry_non_idempotent=True).allows("POST"))
+        graphql = "http://localhost:8000/api/graphql/"
+        self.assertTrue(policy.allows("POST", graphql, {"query": "{ devices { name } }"}))
+        self.assertFalse(policy.allows("POST", graphql, {"query": "mutation { deleteDevice }"}))
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+        for attempt in range(6):
+            self.assertLessEqual(policy.backoff(attempt), min(5, 2**attempt))
+        self.assertEqual(policy.backoff(0, retry_after=10), 10)
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+    """CircuitBreaker test cases."""
+
+    def test_open_and_reset(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record(URL, success=False)
+        breaker.before(URL)
+        breaker.record(URL, success=False)
+        self.assertEqual(breaker.state("localhost:8000"), "open")
+        with self.assertRaises(CircuitOpenError):
+            breaker.before(URL)
+        self.assertEqual(breaker.state("other:8000"), "closed")
+        time.sleep(0.06)
+        breaker.before(URL)
+        with self.assertRaises(CircuitOpenError):
+            # Only one trial request at a time.
+            breaker.before(URL)
+        breaker.record(URL, success=False)
+        self.assertEqual(breaker.state("localhost:8000"), "open")
+        time.sleep(0.06)
+        breaker.before(URL)
+        breaker.record(URL, success=True)
+        self.assertEqual(breaker.state("localhost:8000"), "closed")
+
+
+@patch("pynautobot.api.version", "2.0")
+@patch("pynautobot.core.session.time.sleep")
+class SessionRetryTestCase(unittest.TestCase):
+    """Retries and circuit breaker wired into the Api session."""
+
+    def test_retry_connection_error(self, sleep, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123", retries=2)
+        with requests_mock.Mocker() as mock:
+            mock.get(
+                URL, [{"exc": requests.exceptions.ConnectionError}, {"status_code": 503, "json": {}}, {"json": PAGE}]
+            )
+            self.assertEqual(api.dcim.devices.all(), [])
+            self.assertEqual(mock.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_retries_exhausted(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123", retries=1)
+        with requests_mock.Mocker() as mock:
+            mock.get(URL, status_code=503, json={})
+            with self.assertRaises(pynautobot.RequestError):
+                api.dcim.devices.all()
+            self.assertEqual(mock.call_count, 2)
+
+    def test_post_not_retried(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123", retries=2)
+        with requests_mock.Mocker() as mock:
+            mock.post(URL, status_code=503, json={})
+            with self.assertRaises(pynautobot.RequestError):
+                api.dcim.devices.create(name="test")
+            self.assertEqual(mock.call_count, 1)
+
+    def test_post_retried_when_allowed(self, *_):
+        api = pynautobot.api(
+            "http://localhost:8000", token="abc123", retries=RetryPolicy(retries=2, retry_non_idempotent=True)
+        )
+        with requests_mock.Mocker() as mock:
+            mock.post(URL, [{"status_code": 503, "json": {}}, {"status_code": 201, "json": {"id": 1}}])
+            self.assertEqual(api.dcim.devices.create(name="test").id, 1)
+
+    def test_graphql_query_retried(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123", retries=2)
+        with requests_mock.Mocker() as mock:
+            mock.post(
+                "http://localhost:8000/api/graphql/",
+                [{"status_code": 503, "json": {}}, {"json": {"data": {"devices": []}}}],
+            )
+            self.assertEqual(api.graphql.query("{ devices { name } }").json, {"data": {"devices": []}})
+            self.assertEqual(mock.call_count, 2)
+
+    @patch("pynautobot.core.retry.random.uniform", return_value=5)
+    def test_retry_stops_at_deadline(self, *_):
+        api = pynautobot.api("http://localhost:8000", token="abc123", retries=5)
+        with requests_mock.Mocker() as mock:
+            mock.get(URL, exc=requests.exceptions.ConnectionError)
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                api.dcim.devices.all(deadline=1)
+            self.assertEqual(mock.call_count, 1)
+            self.assertLessEqual(mock.last_request.timeout, 1)
+
+    def test_circuit_breaker(self, *_):
+        api = pynautobot.api(
+            "http://localhost:8000", token="abc123", circuit_breaker=CircuitBreaker(failure_threshold=2)
+        )
+        with requests_mock.Mocker() as mock:
+            mock.get(URL, exc=requests.exceptions.ConnectionError)
+            for _ in range(2):
+                with self.assertRaises(requests.exceptions.ConnectionError):
+                    api.dcim.devices.all()
+            with self.assertRaises(CircuitOpenError):
+                api.dcim.devices.all()
+            self.assertEqual(mock.call_count, 2)
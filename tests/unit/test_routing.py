@@ -0,0 +1,106 @@
+"""Read replica routing tests."""
+
+import unittest
+from unittest.mock import patch
+
+import requests
+import requests_mock
+
+import pynautobot
+from pynautobot.core.routing import ReplicaRouter, is_read
+
+PAGE = {"count": 0, "next": None, "results": []}
+
+
+class IsReadTestCase(unittest.TestCase):
+    """is_read test cases."""
+
+    def test_is_read(self):
+        self.assertTrue(is_read("get", "http://nautobot/api/dcim/devices/"))
+        self.assertTrue(is_read("OPTIONS", "http://nautobot/api/dcim/devices/"))
+        self.assertFalse(is_read("POST", "http://nautobot/api/dcim/devices/", {"name": "test"}))
+        self.assertTrue(is_read("POST", "http://nautobot/api/graphql/", {"query": "query { devices { name } }"}))
+        self.assertFalse(is_read("POST", "http://nautobot/api/graphql/", {"query": " mutation { x }"}))
+
+
+class ReplicaRouterTestCase(unittest.TestCase):
+    """ReplicaRouter test cases."""
+
+    def setUp(self):
+        self.router = ReplicaRouter("http://primary/api", ["http://r1/api", "http://r2/api/"], read_your_writes=60)
+
+    def test_round_robin(self):
+        first = self.router.targets("GET", "http://primary/api/dcim/devices/")
+        second = self.router.targets("GET", "http://primary/api/dcim/devices/")
+        self.assertEqual(
+            first, ["http://r1/api/dcim/devices/", "http://r2/api/dcim/devices/", "http://primary/api/dcim/devices/"]
+        )
+        self.assertEqual(second[0], "http://r2/api/dcim/devices/")
+
+    def test_writes_and_pin(self):
+        self.assertEqual(
+            self.router.targets("PATCH", "http://r1/api/dcim/devices/1/"), ["http://primary/api/dcim/devices/1/"]
+        )
+        self.router.record_write()
+        self.assertEqual(
+            self.router.targets("GET", "http://r1/api/dcim/devices/"), ["http://primary/api/dcim/devices/"]
+        )
+
+    def test_mark_down(self):
+        self.router.mark_down("http://r1/api/dcim/devices/")
+        for _ in range(3):
+            self.assertEqual(self.router.targets("GET", "http://primary/api/")[0], "http://r2/api/")
+        self.assertEqual(self.router.failovers, 1)
+
+    def test_foreign_url(self):
+        self.assertEqual(self.router.targets("GET", "http://other/api/"), ["http://other/api/"])
+
+
+class SessionRoutingTestCase(unittest.TestCase):
+    """Replica routing wired into the Api session."""
+
+    @patch("pynautobot.api.version", "2.0")
+    def test_api_routing(self, *_):
+        api = pynautobot.api(
+            "http://primary", token="abc123", read_urls=["http://r1", "http://r2"], read_your_writes=60
+        )
+        with requests_mock.Mocker() as mock:
+            r1 = mock.get("http://r1/api/dcim/devices/", exc=requests.exceptions.ConnectionError)
+            r2 = mock.get("http://r2/api/dcim/devices/", json=PAGE)
+            primary_get = mock.get("http://primary/api/dcim/devices/", json=PAGE)
+            primary_post = mock.post("http://primary/api/dcim/devices/", json={"id": 1})
+            api.dcim.devices.all()
+            api.dcim.devices.all()
+            self.assertEqual((r1.call_count, r2.call_count, primary_get.call_count), (1, 2, 0))
+            api.dcim.devices.create(name="test")
+            api.dcim.devices.all()
+            self.assertEqual((primary_post.call_count, primary_get.call_count), (1, 1))
+        self.assertEqual(api.router.reads["http://r2/api"], 2)
+        self.assertEqual(api.router.failovers, 1)
+
+    @patch("pynautobot.api.version", "2.0")
+    def test_failover_to_primary(self, *_):
+        api = pynautobot.api("http://primary", token="abc123", read_urls=["http://r1"])
+        with requests_mock.Mocker() as mock:
+            mock.get("http://r1/api/dcim/devices/", status_code=503, json={})
+            primary = mock.get("http://primary/api/dcim/devices/", json=PAGE)
+            api.dcim.devices.all()
+            self.assertEqual(primary.call_count, 1)
+
+    @patch("pynautobot.api.version", "2.0")
+    def test_failover_on_timeout(self, *_):
+        api = pynautobot.api("http://primary", token="abc123", read_urls=["http://r1"])
+        with requests_mock.Mocker() as mock:
+            mock.get("http://r1/api/dcim/devices/", exc=requests.exceptions.ReadTimeout)
+            primary = mock.get("http://primary/api/dcim/devices/", json=PAGE)
+            api.dcim.devices.all()
+            self.assertEqual(primary.call_count, 1)
+        self.assertEqual(api.router.failovers, 1)
+        self.assertEqual(
+            api.router.targets("GET", "http://primary/api/dcim/devices/"), ["http://primary/api/dcim/devices/"]
+        )
+
+    @patch("pynautobot.api.version", "2.0")
+    def test_api_no_routing(self, *_):
+        api = pynautobot.api("http://primary", token="abc123")
+        self.assertIsNone(api.router)
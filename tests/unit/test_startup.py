@@ -0,0 +1,81 @@
+"""Startup cost tests."""
+
+import json
+import subprocess
+import sys
+import timeit
+import unittest
+
+import pynautobot
+from pynautobot.core.app import App
+from pynautobot.models.dcim import Devices
+
+# Regression budgets: modules `import pynautobot` and `pynautobot.api()` must not
+# load, and the time one `pynautobot.api()` call may take.
+DEFERRED_MODULES = (
+    "pynautobot.core.cassette",
+    "pynautobot.core.fanout",
+    "pynautobot.core.federation",
+    "pynautobot.core.graphql",
+    "pynautobot.core.pipeline",
+    "pynautobot.core.profiling",
+    "pynautobot.core.projection",
+    "pynautobot.core.resolver",
+    "pynautobot.models.circuits",
+    "pynautobot.models.cloud",
+    "pynautobot.models.dcim",
+    "pynautobot.models.extras",
+    "pynautobot.models.ipam",
+    "pynautobot.models.users",
+    "pynautobot.models.virtualization",
+    "gzip",
+    "sqlite3",
+)
+API_SECONDS = 0.001
+
+
+def startup(code=""):
+    """Runs ``code`` in a new interpreter after creating an Api, returning the loaded modules."""
+    script = (
+        "import json, sys\n"
+        "import pynautobot\n"
+        "nb = pynautobot.api('http://localhost:8000', token='abc')\n"
+        f"{code}\n"
+        "print(json.dumps(sorted(sys.modules)))"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, check=True, text=True).stdout
+    return set(json.loads(output))
+
+
+class StartupTestCase(unittest.TestCase):
+    """Startup cost test cases."""
+
+    def test_deferred_modules(self):
+        modules = startup()
+        for module in DEFERRED_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, modules)
+
+    def test_model_imported_on_use(self):
+        modules = startup("nb.dcim.devices")
+        self.assertIn("pynautobot.models.dcim", modules)
+        self.assertNotIn("pynautobot.models.ipam", modules)
+
+    def test_api_budget(self):
+        seconds = min(timeit.repeat(lambda: pynautobot.api("http://localhost:8000", token="abc"), number=100, repeat=5))
+        self.assertLess(seconds / 100, API_SECONDS)
+
+    def test_apps_created_on_access(self):
+        api = pynautobot.api("http://localhost:8000", token="abc")
+        self.assertNotIn("dcim", vars(api))
+        self.assertIs(api.dcim, api.dcim)
+        self.assertIsInstance(vars(api)["dcim"], App)
+        self.assertEqual(api.load_balancers.name, "load-balancers")
+        self.assertEqual(api.plugins.api, api)
+        self.assertIs(api.resolver.api, api)
+        self.assertIs(api.graphql.api, api)
+
+    def test_model(self):
+        api = pynautobot.api("http://localhost:8000", token="abc")
+        self.assertEqual(api.dcim.devices.return_obj, Devices)
+        self.assertIsNone(api.tenancy.model)
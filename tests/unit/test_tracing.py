@@ -0,0 +1,140 @@
+"""Tracing tests."""
+
+import concurrent.futures as cf
+import contextlib
+import contextvars
+import threading
+import unittest
+from unittest.mock import patch
+
+import requests_mock
+
+import pynautobot
+from pynautobot.core import tracing
+
+URL = "http://localhost:8000/api/dcim/devices/"
+CURRENT_SPAN = contextvars.ContextVar("current_span", default=None)
+
+
+# pylint: disable=too-few-public-methods
+class FakeSpan:
+    """A span recording its name, attributes and parent."""
+
+    def __init__(self, name, attributes, parent):
+        """Initialize the FakeSpan object."""
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+
+    def set_attribute(self, key, value):
+        """Records an attribute."""
+        self.attributes[key] = value
+
+
+class FakeTracer:
+    """Keeps the current span in a context variable, like OpenTelemetry does."""
+
+    def __init__(self):
+        """Initialize the FakeTracer object."""
+        self.spans = []
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        """Runs the block in a new span, child of the current one."""
+        span = FakeSpan(name, dict(attributes or {}), CURRENT_SPAN.get())
+        with self.lock:
+            self.spans.append(span)
+        token = CURRENT_SPAN.set(span)
+        try:
+            yield span
+        finally:
+            CURRENT_SPAN.reset(token)
+
+    def named(self, name):
+        """Returns the spans called ``name``."""
+        return [span for span in self.spans if span.name == name]
+
+
+def pages(request, _):
+    """Answers like a server with a page size of 2 and 5 devices."""
+    offset = int(request.qs.get("offset", ["0"])[0])
+    limit = min(int(request.qs.get("limit", ["2"])[0]) or 2, 2)
+    rows = [{"id": f"device-{i}", "name": f"sw{i}", "url": f"{URL}device-{i}/"} for i in range(5)]
+    return {
+        "count": 5,
+        "next": f"{URL}?limit={limit}&offset={offset + limit}" if offset + limit < 5 else None,
+        "results": rows[offset : offset + limit],
+    }
+
+
+class NoopTestCase(unittest.TestCase):
+    """Tracing without OpenTelemetry test cases."""
+
+    def test_span(self):
+        with patch.object(tracing, "_tracer", None):
+            with tracing.span("pynautobot.request", url=URL, method="GET") as span:
+                span.set_attribute("pynautobot.results", 1)
+            # No span is allocated.
+            self.assertIs(tracing.span("pynautobot.parse"), span)
+
+    def test_propagate(self):
+        var = contextvars.ContextVar("var", default=None)
+        var.set("caller")
+        with cf.ThreadPoolExecutor(max_workers=1) as pool:
+            self.assertIsNone(pool.submit(var.get).result())
+            self.assertEqual(pool.submit(tracing.propagate(var.get)).result(), "caller")
+
+
+class TracingTestCase(unittest.TestCase):
+    """Tracing test cases."""
+
+    def setUp(self):
+        self.tracer = FakeTracer()
+        patcher = patch.object(tracing, "_tracer", self.tracer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock = requests_mock.Mocker()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.mock.get(URL, json=pages)
+
+    def test_threaded_filter(self):
+        api = pynautobot.api("http://localhost:8000", token="abc", threading=True)
+        self.assertEqual(len(api.dcim.devices.filter(status="active")), 5)
+        (query,) = self.tracer.named("pynautobot.filter")
+        self.assertIsNone(query.parent)
+        self.assertEqual(query.attributes["pynautobot.endpoint"], "dcim.devices")
+        requests = self.tracer.named("pynautobot.request")
+        self.assertEqual(len(requests), 3)
+        # Pages fetched by the thread pool keep the query as their parent.
+        self.assertEqual({span.parent for span in requests}, {query})
+        self.assertEqual(sum(span.attributes["pynautobot.results"] for span in requests), 5)
+        self.assertEqual(requests[0].attributes["url.template"], "/api/dcim/devices/")
+        self.assertEqual({span.parent for span in self.tracer.named("pynautobot.parse")}, set(requests))
+        (hydrate,) = self.tracer.named("pynautobot.hydrate")
+        self.assertEqual(hydrate.parent, query)
+        self.assertEqual(hydrate.attributes["pynautobot.records"], 5)
+
+    def test_get_and_full_details(self):
+        device = {"id": "device-0", "name": "sw0", "url": f"{URL}device-0/"}
+        self.mock.get(f"{URL}?name=sw0", json={"count": 1, "next": None, "results": [device]})
+        self.mock.get(f"{URL}device-0/", json={**device, "serial": "1234"})
+        api = pynautobot.api("http://localhost:8000", token="abc")
+        device = api.dcim.devices.get(name="sw0")
+        (get,) = self.tracer.named("pynautobot.get")
+        self.assertEqual(self.tracer.named("pynautobot.filter")[0].parent, get)
+
+        self.assertEqual(device.serial, "1234")
+        (details,) = self.tracer.named("pynautobot.full_details")
+        self.assertEqual(details.attributes["url.template"], "/api/dcim/devices/device-0/")
+        self.assertEqual(self.tracer.named("pynautobot.request")[-1].parent, details)
+
+    def test_create(self):
+        self.mock.post(URL, json={"id": "device-9", "name": "sw9"}, status_code=201)
+        api = pynautobot.api("http://localhost:8000", token="abc")
+        api.dcim.devices.create(name="sw9")
+        (create,) = self.tracer.named("pynautobot.create")
+        (request,) = self.tracer.named("pynautobot.request")
+        self.assertEqual(request.parent, create)
+        self.assertEqual(request.attributes["pynautobot.method"], "POST")